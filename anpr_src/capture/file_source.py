@@ -0,0 +1,126 @@
+import os
+import cv2
+import time
+import logging
+import threading
+from typing import Optional, Tuple
+import numpy as np
+from .frame_grabber import FrameMeta, LatestFrameBuffer
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class _FrameReader:
+    """동영상 파일 또는 이미지 폴더를 순서대로 읽는 reader"""
+
+    def __init__(self, path: str, default_fps: float = 15.0):
+        self.path = path
+        self._capture = None
+        self._images = None
+        self._index = 0
+        if os.path.isdir(path):
+            self._images = sorted(os.path.join(path, name) for name in os.listdir(path)
+                                  if name.lower().endswith(IMAGE_EXTENSIONS))
+            self.fps = default_fps
+        else:
+            self._capture = cv2.VideoCapture(path)
+            if not self._capture.isOpened():
+                raise ValueError(f"동영상 파일을 열 수 없습니다: {path}")
+            self.fps = self._capture.get(cv2.CAP_PROP_FPS) or default_fps
+
+    def read(self) -> Optional[np.ndarray]:
+        if self._images is not None:
+            while self._index < len(self._images):
+                frame = cv2.imread(self._images[self._index])
+                self._index += 1
+                if frame is not None:
+                    return frame
+                logger.warning("이미지를 읽을 수 없습니다: %s", self._images[self._index - 1])
+            return None
+        ret, frame = self._capture.read()
+        return frame if ret else None
+
+    def release(self):
+        if self._capture is not None:
+            self._capture.release()
+
+
+class FileFrameSource:
+    """FrameGrabber와 같은 인터페이스로 녹화 영상/이미지 폴더를 공급하는 소스
+
+    - realtime=False: 소비자가 read()할 때마다 다음 프레임을 동기적으로 읽음
+      (프레임 손실 없이 최대 속도로 처리)
+    - realtime=True : 수신 스레드가 원본 FPS로 프레임을 LatestFrameBuffer에 넣음
+      (RTSP와 동일하게 처리가 느리면 프레임이 dropped 됨)
+    """
+
+    def __init__(self, path: str, realtime: bool = False, fps: Optional[float] = None, buffer_size: int = 2):
+        self.path = path
+        self.realtime = realtime
+        self._reader = _FrameReader(path)
+        self.fps = fps or self._reader.fps
+        self.buffer = LatestFrameBuffer(buffer_size)
+        self._frame_id = 0
+        self._finished = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> 'FileFrameSource':
+        if self.realtime:
+            self._thread = threading.Thread(target=self._run, name=f"file-source-{self.path}", daemon=True)
+            self._thread.start()
+        return self
+
+    def _next(self) -> Tuple[Optional[np.ndarray], Optional[FrameMeta]]:
+        frame = self._reader.read()
+        if frame is None:
+            self._finished.set()
+            return None, None
+        self._frame_id += 1
+        return frame, FrameMeta(self._frame_id, self._frame_id / self.fps)
+
+    def _run(self):
+        start = time.monotonic()
+        while not self._stop_event.is_set():
+            frame, meta = self._next()
+            if frame is None:
+                break
+            # 원본 FPS 속도에 맞춰 공급
+            delay = start + meta.grabbed_at - time.monotonic()
+            if delay > 0 and self._stop_event.wait(delay):
+                break
+            self.buffer.push(frame, meta)
+
+    def read(self, timeout: Optional[float] = None) -> Tuple[Optional[np.ndarray], Optional[FrameMeta]]:
+        if not self.realtime:
+            if self._finished.is_set():
+                return None, None
+            frame, meta = self._next()
+            if frame is not None:
+                self.buffer.pushed += 1
+                self.buffer.consumed += 1
+            return frame, meta
+        return self.buffer.get_latest(timeout)
+
+    @property
+    def exhausted(self) -> bool:
+        """모든 프레임을 공급했고 버퍼도 비었는지 여부"""
+        if not self._finished.is_set():
+            return False
+        return not self.realtime or self.buffer.pushed == self.buffer.consumed + self.buffer.dropped
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._reader.release()
+
+    def stats(self) -> dict:
+        return {
+            'grabbed': self.buffer.pushed,
+            'consumed': self.buffer.consumed,
+            'dropped': self.buffer.dropped,
+            'fps': self.fps,
+        }
@@ -0,0 +1,127 @@
+import cv2
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FrameMeta:
+    """수신 프레임 메타 정보"""
+    frame_id: int           # 스트림 시작 이후 프레임 번호
+    grabbed_at: float       # 수신 시각 (time.monotonic)
+
+
+class LatestFrameBuffer:
+    """최근 n개 프레임만 유지하는 overwrite-oldest 링 버퍼
+
+    소비자는 항상 가장 최신 프레임을 가져가고, 읽히지 못하고 밀려난
+    (또는 최신 프레임에 가려진) 프레임은 dropped로 집계한다.
+    """
+
+    def __init__(self, size: int = 2):
+        self._frames = deque(maxlen=max(1, size))
+        self._cond = threading.Condition()
+        self.pushed = 0
+        self.consumed = 0
+        self.dropped = 0
+
+    def push(self, frame: np.ndarray, meta: FrameMeta):
+        with self._cond:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1   # 가장 오래된 미소비 프레임 덮어씀
+            self._frames.append((frame, meta))
+            self.pushed += 1
+            self._cond.notify()
+
+    def get_latest(self, timeout: Optional[float] = None) -> Tuple[Optional[np.ndarray], Optional[FrameMeta]]:
+        """가장 최신 프레임 반환 (없으면 timeout까지 대기, 시간 초과 시 (None, None))"""
+        with self._cond:
+            if not self._frames and not self._cond.wait_for(lambda: len(self._frames) > 0, timeout):
+                return None, None
+            frame, meta = self._frames.pop()
+            self.dropped += len(self._frames)   # 최신 프레임에 가려진 이전 프레임
+            self._frames.clear()
+            self.consumed += 1
+            return frame, meta
+
+
+def open_rtsp_capture(rtsp_url: str) -> cv2.VideoCapture:
+    """RTSP 캡처 생성 (cc_anpr 기존 설정과 동일)"""
+    capture = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG)
+    capture.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    return capture
+
+
+class FrameGrabber:
+    """카메라별 전용 수신 스레드
+
+    인식 단계가 느려도 디코더가 멈추지 않도록 스트림을 계속 읽어
+    LatestFrameBuffer에 넣고, 스트림이 끊기면 스스로 재연결한다.
+    """
+
+    def __init__(self, rtsp_url: str, buffer_size: int = 2, reconnect_delay: float = 5.0,
+                 capture_factory: Callable[[str], cv2.VideoCapture] = open_rtsp_capture):
+        self.rtsp_url = rtsp_url
+        self.reconnect_delay = reconnect_delay
+        self.capture_factory = capture_factory
+        self.buffer = LatestFrameBuffer(buffer_size)
+        self.reconnects = 0
+        self._frame_id = 0
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"grabber-{rtsp_url}", daemon=True)
+
+    def start(self) -> 'FrameGrabber':
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    @property
+    def exhausted(self) -> bool:
+        """RTSP 스트림은 끝나지 않음 (stop() 호출 시에만 종료)"""
+        return self._stop_event.is_set()
+
+    def read(self, timeout: Optional[float] = None) -> Tuple[Optional[np.ndarray], Optional[FrameMeta]]:
+        """가장 최신 프레임 반환"""
+        return self.buffer.get_latest(timeout)
+
+    def stats(self) -> dict:
+        return {
+            'grabbed': self.buffer.pushed,
+            'consumed': self.buffer.consumed,
+            'dropped': self.buffer.dropped,
+            'reconnects': self.reconnects,
+        }
+
+    def _run(self):
+        capture = self.capture_factory(self.rtsp_url)
+        try:
+            while not self._stop_event.is_set():
+                ret, frame = capture.read()
+
+                # RTSP 스트림이 끊어졌을 경우 재연결
+                if not ret:
+                    logger.warning("Stream disconnected. Reconnecting... (%s)", self.rtsp_url)
+                    capture.release()
+                    if self._stop_event.wait(self.reconnect_delay):
+                        break
+                    capture = self.capture_factory(self.rtsp_url)
+                    self.reconnects += 1
+                    continue
+
+                self._frame_id += 1
+                self.buffer.push(frame, FrameMeta(self._frame_id, time.monotonic()))
+        finally:
+            capture.release()
@@ -0,0 +1,111 @@
+import cv2
+import time
+import logging
+from typing import Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MotionGate:
+    """anpr_read_pixels 호출 전 단계의 움직임/변화 감지 게이트
+
+    ROI를 작은 흑백 이미지로 축소한 뒤 running-average 배경과 비교해
+    변화한 픽셀 비율이 threshold 이상일 때만 인식을 수행한다.
+    움직임이 끝난 뒤에도 hold_open_seconds 동안은 계속 인식해
+    정차 직전/직후 프레임을 놓치지 않는다.
+    """
+
+    def __init__(self, threshold: float = 0.02, pixel_threshold: int = 25,
+                 hold_open_seconds: float = 2.0, downscale_width: int = 160,
+                 alpha: float = 0.05):
+        """
+        Args:
+            threshold (float): 인식을 수행할 변화 픽셀 비율 (0~1)
+            pixel_threshold (int): 배경 대비 변화로 간주할 밝기 차이 (0~255)
+            hold_open_seconds (float): 움직임 종료 후 인식을 유지할 시간 (초)
+            downscale_width (int): 비교용 축소 이미지 너비 (px)
+            alpha (float): 배경 갱신 가중치 (cv2.accumulateWeighted)
+        """
+        self.threshold = threshold
+        self.pixel_threshold = pixel_threshold
+        self.hold_open_seconds = hold_open_seconds
+        self.downscale_width = downscale_width
+        self.alpha = alpha
+        self._background: Optional[np.ndarray] = None
+        self._small: Optional[np.ndarray] = None
+        self._hold_until = 0.0
+        self.last_change_ratio = 0.0
+        self.total = 0
+        self.processed = 0
+
+    def _to_small_gray(self, image: np.ndarray) -> np.ndarray:
+        height, width = image.shape[:2]
+        scale = min(1.0, self.downscale_width / float(width))
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        small = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+
+    def should_process(self, image: np.ndarray, now: Optional[float] = None) -> bool:
+        """이번 프레임을 ANPR 엔진에 넘길지 여부 반환"""
+        now = time.monotonic() if now is None else now
+        self.total += 1
+        small = self._to_small_gray(image)
+
+        if self._background is None or self._background.shape != small.shape:
+            # 첫 프레임(또는 ROI 크기 변경): 배경 초기화 후 인식 수행
+            self._background = small.astype(np.float32)
+            self._small = np.empty_like(self._background)
+            self._hold_until = now + self.hold_open_seconds
+            self.processed += 1
+            return True
+
+        np.copyto(self._small, small, casting='unsafe')
+        diff = cv2.absdiff(self._small, self._background)
+        self.last_change_ratio = cv2.countNonZero(
+            cv2.threshold(diff, self.pixel_threshold, 1, cv2.THRESH_BINARY)[1]) / float(diff.size)
+        cv2.accumulateWeighted(self._small, self._background, self.alpha)
+
+        if self.last_change_ratio >= self.threshold:
+            self._hold_until = now + self.hold_open_seconds
+
+        if now <= self._hold_until:
+            self.processed += 1
+            return True
+        return False
+
+    @property
+    def skip_ratio(self) -> float:
+        return (self.total - self.processed) / self.total if self.total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            'total': self.total,
+            'processed': self.processed,
+            'skipped': self.total - self.processed,
+            'skip_ratio': round(self.skip_ratio, 4),
+            'last_change_ratio': round(self.last_change_ratio, 4),
+        }
+
+
+def create_motion_gate(config: dict, rtsp_url: str) -> Optional[MotionGate]:
+    """cc_anpr config의 'motion_gate' 항목으로 카메라별 게이트 생성 (비활성 시 None)
+
+    예시:
+        "motion_gate": {
+            "enabled": true, "threshold": 0.02, "hold_open_seconds": 2.0,
+            "thresholds": {"rtsp://...": 0.05}
+        }
+    """
+    gate_config = config.get('motion_gate', {})
+    if not gate_config.get('enabled', False):
+        return None
+    return MotionGate(
+        threshold=gate_config.get('thresholds', {}).get(rtsp_url, gate_config.get('threshold', 0.02)),
+        pixel_threshold=gate_config.get('pixel_threshold', 25),
+        hold_open_seconds=gate_config.get('hold_open_seconds', 2.0),
+        downscale_width=gate_config.get('downscale_width', 160),
+        alpha=gate_config.get('alpha', 0.05),
+    )
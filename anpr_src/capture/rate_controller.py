@@ -0,0 +1,148 @@
+import time
+from typing import Optional
+
+
+class AdaptiveRateController:
+    """인식 지연 시간과 차량 존재 여부에 따라 카메라별 인식 빈도를 조절
+
+    - 차로가 비어 있으면 idle_fps로 드문드문 인식
+    - 번호판 후보가 보이면 active_hold_seconds 동안 active_fps로 인식하되, 인식기가 처리할 수 있는
+      빈도(utilization / 인식 지연 EWMA)를 넘지 않게 제한 (idle_fps 아래로는 내리지 않음)
+    - 프레임 지연(수신 후 인식 시작까지)이 max_lag_ms를 넘은 프레임은 버림 (idle_fps 간격이 지나면 예외)
+    """
+
+    def __init__(self, idle_fps: float = 2.0, active_fps: Optional[float] = None,
+                 active_hold_seconds: float = 3.0, max_lag_ms: float = 150.0,
+                 utilization: float = 1.0, ewma_alpha: float = 0.2):
+        """
+        Args:
+            idle_fps (float): 빈 차로일 때 인식 빈도 (차량이 있을 때의 최저 빈도)
+            active_fps (float): 차량이 있을 때 인식 빈도 (None이면 인식기 처리량까지)
+            active_hold_seconds (float): 마지막 번호판 후보 이후 active 상태 유지 시간 (초)
+            max_lag_ms (float): 인식을 시작할 프레임의 최대 지연 (ms, 0이면 제한 없음)
+            utilization (float): 인식기 처리량 중 사용할 비율 (1.0이면 1/지연까지)
+            ewma_alpha (float): 지연 시간 지수 이동 평균 가중치
+        """
+        self.idle_fps = idle_fps
+        self.active_fps = active_fps
+        self.active_hold_seconds = active_hold_seconds
+        self.max_lag = max_lag_ms / 1000.0
+        self.utilization = utilization
+        self.ewma_alpha = ewma_alpha
+        self.ewma_latency = 0.0
+        self._active_until = float('-inf')
+        self._last_processed = float('-inf')
+        self._last_now = 0.0
+        self.processed = 0
+        self.skipped = 0
+        self.stale = 0              # 지연 예산을 넘어 버린 프레임 수
+        self.gated = 0              # admit 후 motion gate 등에서 인식 없이 버린 프레임 수
+        self.backlog = 0            # 마지막 인식 이후 건너뛴 프레임 수
+        self.lag = 0.0              # 마지막 인식 시작 시점의 프레임 지연 (초)
+
+    def is_active(self, now: float) -> bool:
+        return now <= self._active_until
+
+    def current_fps(self, now: Optional[float] = None) -> Optional[float]:
+        """현재 목표 인식 빈도 (None이면 제한 없음)"""
+        now = self._last_now if now is None else now
+        if not self.is_active(now):
+            return self.idle_fps
+        target = self.active_fps
+        if self.ewma_latency > 0.0:
+            # 인식기 처리량 이상으로 프레임을 넘겨도 대기만 늘어나므로 처리량으로 제한
+            throughput = self.utilization / self.ewma_latency
+            target = throughput if target is None else min(target, throughput)
+        return None if target is None else max(target, self.idle_fps)
+
+    def admit(self, frame_time: float, now: Optional[float] = None) -> bool:
+        """이번 프레임을 인식 단계로 넘길지 여부 (처리 기록은 하지 않음)
+
+        admit된 프레임이 실제로 인식기에 들어가면 mark_processed(), 뒤 단계(motion gate 등)에서
+        버려지면 record_gated()를 호출해야 빈도/backlog 집계가 인식기 기준으로 유지된다.
+
+        Args:
+            frame_time (float): 프레임 수신 시각 (FrameMeta.grabbed_at 기준 시계)
+            now (float): 현재 시각 (기본값 frame_time, 실시간 스트림 지연 계산용)
+        """
+        now = frame_time if now is None else now
+        self._last_now = frame_time
+        fps = self.current_fps(frame_time)
+        since_last = frame_time - self._last_processed
+        if fps is not None and fps > 0 and since_last < 1.0 / fps:
+            self.skipped += 1
+            self.backlog += 1
+            return False
+        # 지연 예산을 넘은 프레임은 버리고 다음(더 최신) 프레임을 기다림 (idle_fps 간격이 지나면 그대로 인식)
+        if (self.max_lag > 0 and now - frame_time > self.max_lag
+                and not (self.idle_fps > 0 and since_last >= 1.0 / self.idle_fps)):
+            self.stale += 1
+            self.backlog += 1
+            return False
+        return True
+
+    def mark_processed(self, frame_time: float, now: Optional[float] = None):
+        """admit된 프레임이 인식기에 들어갈 때 호출 (다음 인식 간격의 기준)"""
+        now = frame_time if now is None else now
+        self._last_processed = frame_time
+        self.processed += 1
+        self.backlog = 0
+        self.lag = max(0.0, now - frame_time)
+
+    def record_gated(self):
+        """admit된 프레임을 뒤 단계에서 인식 없이 버린 경우 (인식 간격 기준은 그대로)"""
+        self.gated += 1
+        self.backlog += 1
+
+    def should_process(self, frame_time: float, now: Optional[float] = None) -> bool:
+        """admit 후 바로 인식하는 경우 (뒤 단계 게이트 없음): admit + mark_processed"""
+        if not self.admit(frame_time, now):
+            return False
+        self.mark_processed(frame_time, now)
+        return True
+
+    def record_recognition(self, latency: float, plate_seen: bool, frame_time: float):
+        """인식 결과 반영 (지연 시간 EWMA 갱신, 번호판 후보가 있으면 active 유지)"""
+        if self.ewma_latency == 0.0:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += self.ewma_alpha * (latency - self.ewma_latency)
+        if plate_seen:
+            self._active_until = frame_time + self.active_hold_seconds
+
+    def stats(self) -> dict:
+        fps = self.current_fps()
+        return {
+            'state': 'active' if self.is_active(self._last_now) else 'idle',
+            'current_fps': round(fps, 2) if fps is not None else None,
+            'ewma_latency_ms': round(self.ewma_latency * 1000.0, 2),
+            'processed': self.processed,
+            'skipped': self.skipped,
+            'stale': self.stale,
+            'gated': self.gated,
+            'backlog': self.backlog,
+            'lag_ms': round(self.lag * 1000.0, 1),
+        }
+
+
+def create_rate_controller(config: dict, rtsp_url: str) -> Optional[AdaptiveRateController]:
+    """cc_anpr config의 'rate_controller' 항목으로 카메라별 컨트롤러 생성 (비활성 시 None)
+
+    예시:
+        "rate_controller": {
+            "enabled": true, "idle_fps": 2, "active_fps": null,
+            "active_hold_seconds": 3, "max_lag_ms": 150, "utilization": 1.0,
+            "cameras": {"rtsp://...": {"idle_fps": 1}}
+        }
+    """
+    rate_config = config.get('rate_controller', {})
+    if not rate_config.get('enabled', False):
+        return None
+    rate_config = dict(rate_config, **rate_config.get('cameras', {}).get(rtsp_url, {}))
+    return AdaptiveRateController(
+        idle_fps=rate_config.get('idle_fps', 2.0),
+        active_fps=rate_config.get('active_fps'),
+        active_hold_seconds=rate_config.get('active_hold_seconds', 3.0),
+        max_lag_ms=rate_config.get('max_lag_ms', 150.0),
+        utilization=rate_config.get('utilization', 1.0),
+    )
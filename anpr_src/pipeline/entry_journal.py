@@ -0,0 +1,139 @@
+import os
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+ENTRY_TIME_FORMAT = '%Y%m%d_%H%M%S'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entry_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    plate_text TEXT NOT NULL,
+    powertrain TEXT NOT NULL,
+    entry_time TEXT NOT NULL,
+    image_filename TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS consumer_offsets (
+    consumer TEXT PRIMARY KEY,
+    last_event_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS consumer_pending (
+    consumer TEXT NOT NULL,
+    event_id INTEGER NOT NULL,
+    PRIMARY KEY (consumer, event_id)
+);
+"""
+
+
+@dataclass
+class EntryEvent:
+    """cc_anpr 입차 확정 이벤트 (TEMP 폴더 차량 이미지 1장에 대응)"""
+    plate_text: str
+    powertrain: str             # 'ev' / 'ice'
+    entry_time: datetime
+    image_filename: str         # temp_car_image_save_path 기준 파일명
+    event_id: Optional[int] = None
+
+
+class EntryJournal:
+    """cc_anpr → verify_entry 입차 이벤트 append-only 저널 (SQLite WAL)
+
+    여러 카메라 프로세스가 동시에 append하고, 소비자(verify_entry)는 저장된 offset 이후의
+    새 이벤트와 아직 결론이 나지 않은(pending) 이벤트만 읽는다. TEMP 폴더 크기와 무관하게
+    실행당 비용이 새 이벤트 수 + 대기 중인 차량 수에 비례한다.
+    """
+
+    def __init__(self, path: str, timeout: float = 10.0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        # persistence writer 스레드에서도 append하므로 연결은 lock으로 보호
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+
+    def append(self, event: EntryEvent) -> int:
+        """이벤트 기록, event_id 반환"""
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT INTO entry_events (plate_text, powertrain, entry_time, image_filename) VALUES (?, ?, ?, ?)',
+                (event.plate_text, event.powertrain, event.entry_time.strftime(ENTRY_TIME_FORMAT),
+                 event.image_filename))
+            event.event_id = cursor.lastrowid
+            return event.event_id
+
+    def image_filenames(self) -> Set[str]:
+        """기록된 모든 이미지 파일명 (기존 TEMP 파일 최초 등록 시 중복 방지용)"""
+        with self._lock:
+            return {row[0] for row in self._conn.execute('SELECT image_filename FROM entry_events')}
+
+    def has_consumer(self, consumer: str) -> bool:
+        with self._lock:
+            row = self._conn.execute('SELECT 1 FROM consumer_offsets WHERE consumer = ?', (consumer,)).fetchone()
+            return row is not None
+
+    def fetch(self, consumer: str, limit: Optional[int] = None) -> Tuple[List[EntryEvent], int]:
+        """소비자가 처리할 이벤트 (pending + offset 이후 새 이벤트)와 새 offset 반환"""
+        with self._lock:
+            row = self._conn.execute('SELECT last_event_id FROM consumer_offsets WHERE consumer = ?',
+                                     (consumer,)).fetchone()
+            offset = row[0] if row else 0
+            pending = self._conn.execute(
+                'SELECT e.id, e.plate_text, e.powertrain, e.entry_time, e.image_filename '
+                'FROM consumer_pending p JOIN entry_events e ON e.id = p.event_id '
+                'WHERE p.consumer = ? ORDER BY e.id', (consumer,)).fetchall()
+            query = ('SELECT id, plate_text, powertrain, entry_time, image_filename '
+                     'FROM entry_events WHERE id > ? ORDER BY id')
+            params: tuple = (offset,)
+            if limit is not None:
+                query += ' LIMIT ?'
+                params = (offset, limit)
+            new = self._conn.execute(query, params).fetchall()
+
+        events = [EntryEvent(plate_text, powertrain, datetime.strptime(entry_time, ENTRY_TIME_FORMAT),
+                             image_filename, event_id)
+                  for event_id, plate_text, powertrain, entry_time, image_filename in pending + new]
+        return events, (new[-1][0] if new else offset)
+
+    def commit(self, consumer: str, offset: int, pending_ids: Iterable[int]):
+        """소비 결과 저장: offset 갱신, 다음 실행에서 다시 볼 이벤트(pending) 교체 (한 트랜잭션)"""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute('INSERT OR REPLACE INTO consumer_offsets (consumer, last_event_id) VALUES (?, ?)',
+                                   (consumer, offset))
+                self._conn.execute('DELETE FROM consumer_pending WHERE consumer = ?', (consumer,))
+                self._conn.executemany('INSERT INTO consumer_pending (consumer, event_id) VALUES (?, ?)',
+                                       [(consumer, event_id) for event_id in pending_ids])
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_entry_journal(config: dict) -> Optional[EntryJournal]:
+    """config의 'entry_journal' 항목으로 저널 열기 (비활성 시 None)
+
+    cc_anpr와 verify_entry가 같은 config.json을 읽으므로 양쪽이 같은 경로를 사용한다.
+    """
+    journal_config = config.get('entry_journal', {})
+    if not journal_config.get('enabled', False):
+        return None
+    path = journal_config.get('path') or os.path.join(config['temp_car_image_save_path'], 'entry_journal.db')
+    try:
+        return EntryJournal(path, timeout=journal_config.get('timeout', 10.0))
+    except sqlite3.Error as e:
+        logger.error("Entry journal open failed (%s): %s", path, e)
+        return None
@@ -0,0 +1,147 @@
+import os
+import cv2
+import json
+import queue
+import logging
+import threading
+from typing import Any, Callable, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+JOB_IMAGE = 'image'
+JOB_JSON = 'json'
+
+
+class PersistenceQueue:
+    """확정 번호판 결과물(차량 이미지, 결과 JSON)의 write-behind 저장 단계
+
+    인식 루프는 작업을 큐에 넣기만 하고 JPEG 인코딩, 디렉토리 생성,
+    JSON 직렬화/쓰기는 전용 writer 스레드가 처리한다. 큐가 가득 차면
+    인식 루프를 막지 않고 작업을 버리고 dropped로 집계한다.
+    """
+
+    def __init__(self, max_queue_size: int = 64, num_writers: int = 2, jpeg_quality: int = 95):
+        """
+        Args:
+            max_queue_size (int): 대기 가능한 최대 저장 작업 수
+            num_writers (int): writer 스레드 수
+            jpeg_quality (int): JPEG 품질 (cv2.IMWRITE_JPEG_QUALITY, 기본값은 cv2 기본값과 동일)
+        """
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)]
+        self._created_dirs = set()
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.bytes_written = 0
+        self.max_depth = 0
+        self._writers = [threading.Thread(target=self._run, name=f"persistence-{i}", daemon=True)
+                         for i in range(max(1, num_writers))]
+        for writer in self._writers:
+            writer.start()
+
+    def save_image(self, frame: np.ndarray, save_path: str,
+                   on_written: Optional[Callable[[str], None]] = None) -> bool:
+        """프레임 JPEG 저장 요청 (frame은 이후 수정되지 않는 배열이어야 함)
+
+        on_written: 파일 기록이 끝난 뒤 writer 스레드에서 save_path로 호출 (예: 입차 이벤트 기록)
+        """
+        return self._submit(JOB_IMAGE, frame, save_path, on_written)
+
+    def save_json(self, obj: Any, save_path: str) -> bool:
+        """JSON 저장 요청"""
+        return self._submit(JOB_JSON, obj, save_path)
+
+    def _submit(self, kind: str, data: Any, save_path: str,
+                on_written: Optional[Callable[[str], None]] = None) -> bool:
+        try:
+            self._queue.put_nowait((kind, data, save_path, on_written))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            logger.warning("Persistence queue full, dropped %s: %s", kind, save_path)
+            return False
+        with self._lock:
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    def _ensure_dir(self, save_path: str):
+        directory = os.path.dirname(save_path)
+        if directory and directory not in self._created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._created_dirs.add(directory)
+
+    def _write(self, kind: str, data: Any, save_path: str) -> int:
+        if kind == JOB_IMAGE:
+            ret, buffer = cv2.imencode('.jpg', data, self._encode_params)
+            if not ret:
+                raise ValueError("JPEG encoding failed")
+            payload = buffer.tobytes()
+        else:
+            payload = json.dumps(data, ensure_ascii=False, indent=4).encode('utf-8')
+
+        self._ensure_dir(save_path)
+        with open(save_path, 'wb') as f:
+            f.write(payload)
+        return len(payload)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                kind, data, save_path, on_written = job
+                size = self._write(kind, data, save_path)
+                with self._lock:
+                    self.written += 1
+                    self.bytes_written += size
+                if on_written is not None:
+                    on_written(save_path)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                logger.error("Persistence write failed (%s): %s", job[2], e)
+            finally:
+                self._queue.task_done()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def saturated(self) -> bool:
+        return self._queue.full()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'depth': self._queue.qsize(),
+                'max_depth': self.max_depth,
+                'submitted': self.submitted,
+                'written': self.written,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'bytes_written': self.bytes_written,
+            }
+
+    def close(self, timeout: Optional[float] = None):
+        """대기 중인 작업을 모두 기록한 뒤 writer 종료"""
+        for _ in self._writers:
+            self._queue.put(None)
+        for writer in self._writers:
+            writer.join(timeout)
+
+
+def create_persistence(config: dict) -> PersistenceQueue:
+    """cc_anpr config의 'persistence' 항목으로 저장 단계 생성"""
+    persistence_config = config.get('persistence', {})
+    return PersistenceQueue(
+        max_queue_size=persistence_config.get('max_queue_size', 64),
+        num_writers=persistence_config.get('writers', 2),
+        jpeg_quality=persistence_config.get('jpeg_quality', 95),
+    )
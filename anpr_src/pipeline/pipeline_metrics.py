@@ -0,0 +1,47 @@
+import time
+from array import array
+from typing import Optional
+import numpy as np
+
+
+class PipelineMetrics:
+    """카메라 1대 처리 루프의 처리량/지연 측정 (replay 벤치마크용)"""
+
+    def __init__(self, camera: str):
+        self.camera = camera
+        self.started_at = time.perf_counter()
+        self.frames = 0
+        self.confirmations = 0
+        self.recognition_latencies = array('d')    # 초 단위
+
+    def record_frame(self):
+        self.frames += 1
+
+    def record_recognition(self, seconds: float):
+        self.recognition_latencies.append(seconds)
+
+    def record_confirmation(self):
+        self.confirmations += 1
+
+    def summary(self, source_fps: Optional[float] = None, bytes_written: int = 0) -> dict:
+        elapsed = time.perf_counter() - self.started_at
+        latencies_ms = np.frombuffer(self.recognition_latencies, dtype=np.float64) * 1000.0
+        percentiles = {}
+        if latencies_ms.size:
+            p50, p90, p95, p99 = np.percentile(latencies_ms, [50, 90, 95, 99])
+            percentiles = {'p50': round(p50, 3), 'p90': round(p90, 3), 'p95': round(p95, 3),
+                           'p99': round(p99, 3), 'max': round(float(latencies_ms.max()), 3)}
+
+        footage_minutes = self.frames / source_fps / 60.0 if source_fps else None
+        return {
+            'camera': self.camera,
+            'frames': self.frames,
+            'recognition_calls': int(latencies_ms.size),
+            'elapsed_sec': round(elapsed, 3),
+            'frames_per_sec': round(self.frames / elapsed, 2) if elapsed > 0 else 0.0,
+            'recognition_latency_ms': percentiles,
+            'confirmations': self.confirmations,
+            'confirmations_per_min_wall': round(self.confirmations / (elapsed / 60.0), 2) if elapsed > 0 else 0.0,
+            'confirmations_per_min_footage': round(self.confirmations / footage_minutes, 2) if footage_minutes else None,
+            'bytes_written': bytes_written,
+        }
@@ -0,0 +1,83 @@
+import gc
+import os
+import sys
+import time
+import logging
+import resource
+import multiprocessing
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def worker_context(config: dict):
+    """카메라/워커 프로세스 생성용 multiprocessing context
+
+    Linux에서는 fork를 사용해 부모가 미리 로드한 모델/라이브러리 페이지를 자식과 공유한다
+    (config['preload']['start_method']로 변경 가능, 그 외 OS는 기본값).
+    """
+    start_method = config.get('preload', {}).get('start_method')
+    if start_method is None and sys.platform.startswith('linux'):
+        start_method = 'fork'
+    return multiprocessing.get_context(start_method)
+
+
+def preload_shared_state(config: dict, ev_config_path: str) -> Dict:
+    """fork 전에 부모 프로세스에서 EV 모델을 한 번만 로드하고 GC 대상에서 제외
+
+    더미 추론(warmup)은 하지 않는다. 부모에서 OpenMP 스레드 풀이 만들어진 뒤 fork하면
+    자식의 첫 추론이 멈출 수 있으므로 warmup은 각 자식(process_camera)에서 한 번 수행한다.
+    gc.freeze()는 로드된 객체를 영구 세대로 옮겨, 자식의 GC가 refcount/GC 헤더를 건드려
+    공유 페이지가 copy-on-write로 복제되는 것을 줄인다.
+    """
+    preload_config = config.get('preload', {})
+    if not preload_config.get('enabled', True):
+        return {'preloaded': False}
+
+    start = time.perf_counter()
+    try:
+        # 지연 import: 모델 스택(sklearn/xgboost/lightgbm)도 부모에서 한 번만 import
+        from ev_src.detector.detector_registry import get_registry
+        get_registry(ev_config_path).get()
+        preloaded = True
+    except Exception as e:
+        logger.error("EV model preload failed, workers will load their own copy: %s", e)
+        preloaded = False
+
+    if preload_config.get('gc_freeze', True) and hasattr(gc, 'freeze'):
+        gc.collect()
+        gc.freeze()
+    report = dict(process_report('parent', time.perf_counter() - start), preloaded=preloaded)
+    logger.info("Preload report: %s", report)
+    return report
+
+
+def read_memory_usage() -> Dict[str, Optional[float]]:
+    """현재 프로세스 메모리 사용량 (MB)
+
+    rss: 상주 메모리, pss: 공유 페이지를 공유 프로세스 수로 나눈 비례 메모리,
+    shared/private: 공유/전용 페이지. /proc/self/smaps_rollup이 없으면 최대 RSS만 보고.
+    """
+    usage = {'rss_mb': None, 'pss_mb': None, 'shared_mb': None, 'private_mb': None}
+    try:
+        fields = {}
+        with open('/proc/self/smaps_rollup', 'r') as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                parts = value.split()
+                if len(parts) == 2 and parts[1] == 'kB':
+                    fields[name] = int(parts[0])
+        usage['rss_mb'] = round(fields.get('Rss', 0) / 1024.0, 1)
+        usage['pss_mb'] = round(fields.get('Pss', 0) / 1024.0, 1)
+        usage['shared_mb'] = round((fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0)) / 1024.0, 1)
+        usage['private_mb'] = round((fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)) / 1024.0, 1)
+    except OSError:
+        # ru_maxrss: Linux는 KB, macOS는 byte 단위
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        usage['rss_mb'] = round(max_rss / (1024.0 * 1024.0 if sys.platform == 'darwin' else 1024.0), 1)
+    return usage
+
+
+def process_report(role: str, startup_sec: float) -> Dict:
+    """프로세스 시작 시간/메모리 보고 (로그 및 벤치마크용)"""
+    return dict({'role': role, 'pid': os.getpid(), 'startup_sec': round(startup_sec, 3)}, **read_memory_usage())
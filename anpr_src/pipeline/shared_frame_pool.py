@@ -0,0 +1,79 @@
+import logging
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 간 메시지 종류
+TASK_RECOGNIZE = 'recognize'    # 캡처 -> 워커: 슬롯 프레임 번호판 인식
+TASK_RESULT = 'result'          # 워커 -> 캡처: 인식 결과 (투표는 카메라별 캡처 프로세스가 수행)
+TASK_CONFIRM = 'confirm'        # 캡처 -> 워커: 확정된 번호판 EV 판정 및 저장
+
+
+@dataclass
+class SlotTask:
+    """프로세스 간에 전달되는 슬롯 메시지 (프레임 픽셀은 포함하지 않음)"""
+    kind: str
+    camera_index: int
+    slot_index: int
+    shape: Tuple[int, int, int]
+    frame_id: int
+    grabbed_at: float
+    payload: Any = None
+
+
+class CameraSlots:
+    """카메라 1대분 공유 메모리 프레임 슬롯
+
+    하나의 SharedMemory 블록을 max_frame_shape 크기 슬롯 n개로 나눠 쓴다.
+    슬롯 소유권은 카메라별 free 큐로 관리하며, 캡처 프로세스는 free 슬롯이
+    없으면 프레임을 버린다. 카메라당 처리 중인 프레임 수가 슬롯 수로 제한되므로
+    하나의 작업 큐를 공유해도 특정 카메라가 워커를 독점하지 않는다.
+    """
+
+    def __init__(self, camera_index: int, num_slots: int, max_frame_shape: Tuple[int, int, int],
+                 name: Optional[str] = None):
+        self.camera_index = camera_index
+        self.num_slots = num_slots
+        self.max_frame_shape = tuple(max_frame_shape)
+        self.slot_bytes = int(np.prod(self.max_frame_shape))
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * num_slots)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+
+    def spec(self) -> dict:
+        """다른 프로세스에서 attach하기 위한 정보"""
+        return {
+            'camera_index': self.camera_index,
+            'num_slots': self.num_slots,
+            'max_frame_shape': self.max_frame_shape,
+            'name': self.shm.name,
+        }
+
+    @classmethod
+    def attach(cls, spec: dict) -> 'CameraSlots':
+        return cls(spec['camera_index'], spec['num_slots'], spec['max_frame_shape'], name=spec['name'])
+
+    def fits(self, shape) -> bool:
+        return int(np.prod(shape)) <= self.slot_bytes
+
+    def view(self, slot_index: int, shape) -> np.ndarray:
+        """슬롯 메모리를 그대로 가리키는 uint8 배열 (복사 없음)"""
+        return np.ndarray(tuple(shape), dtype=np.uint8, buffer=self.shm.buf,
+                          offset=slot_index * self.slot_bytes)
+
+    def write(self, slot_index: int, frame: np.ndarray):
+        np.copyto(self.view(slot_index, frame.shape), frame)
+
+    def close(self):
+        try:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except (BufferError, FileNotFoundError) as e:
+            logger.warning("Shared memory slot cleanup failed (%s): %s", self.shm.name, e)
@@ -0,0 +1,226 @@
+import os
+import sys
+import json
+import time
+import logging
+import platform
+from abc import ABC, abstractmethod
+from ctypes import cdll, c_char_p
+from typing import Dict, List, Optional
+import numpy as np
+from .pixel_recognizer import PixelRecognizer, configure_library
+
+logger = logging.getLogger(__name__)
+
+
+# ANPR 라이브러리 경로 설정
+def getLibPath():
+    os_name = platform.system().lower()
+    arch_name = platform.machine().lower()
+    logger.info('os_name=%s, arch_name=%s', os_name, arch_name)
+
+    if os_name == 'windows':
+        if arch_name == 'x86_64' or arch_name == 'amd64':
+            return os.path.join('..', 'bin', 'windows-x86_64', 'tsanpr.dll')
+        elif arch_name == 'x86':
+            return os.path.join('..', 'bin', 'windows-x86', 'tsanpr.dll')
+    elif os_name == 'linux':
+        if arch_name == 'x86_64':
+            return os.path.join('..', 'bin', 'linux-x86_64', 'libtsanpr.so')
+        elif arch_name == 'aarch64':
+            return os.path.join('..', 'bin', 'linux-aarch64', 'libtsanpr.so')
+
+    logger.error('Unsupported target platform')
+    sys.exit(-1)
+
+
+class RecognizerBackend(ABC):
+    """번호판 인식 백엔드 인터페이스
+
+    initialize()는 프로세스 시작 시 한 번, create_recognizer()는 카메라(또는 워커)마다
+    호출한다. recognizer.read_pixels(image, frame_index)는 libtsanpr와 같은
+    JSON bytes를 반환한다.
+    """
+    name = 'base'
+
+    @abstractmethod
+    def initialize(self) -> Optional[str]:
+        """백엔드 초기화, 오류 메시지 반환 (정상이면 None)"""
+
+    @abstractmethod
+    def create_recognizer(self, anpr_option: str, **kwargs):
+        """카메라별 recognizer 생성"""
+
+
+class TSANPRBackend(RecognizerBackend):
+    """libtsanpr ctypes 백엔드 (라이브러리는 initialize 시점에 로드)"""
+    name = 'tsanpr'
+
+    def __init__(self, lib_path: Optional[str] = None):
+        self.lib_path = lib_path
+        self.lib = None
+
+    def load(self):
+        if self.lib is None:
+            lib_path = self.lib_path or getLibPath()
+            logger.info('LIB_PATH=%s', lib_path)
+            lib = cdll.LoadLibrary(lib_path)
+
+            lib.anpr_initialize.argtype = c_char_p
+            lib.anpr_initialize.restype = c_char_p
+
+            lib.anpr_read_file.argtypes = (c_char_p, c_char_p, c_char_p)
+            lib.anpr_read_file.restype = c_char_p
+
+            # anpr_read_pixels: 픽셀 포인터(c_void_p) + stride 전달
+            self.lib = configure_library(lib)
+        return self.lib
+
+    def initialize(self) -> Optional[str]:
+        error = self.load().anpr_initialize('text')
+        return error.decode('utf8') if error else error
+
+    def create_recognizer(self, anpr_option: str, use_stride: bool = True, **kwargs) -> PixelRecognizer:
+        return PixelRecognizer(self.load(), anpr_option, use_stride=use_stride)
+
+
+def default_fake_script(plate_text: str = '12가3456', ev: bool = False,
+                        visible_frames: int = 10, empty_frames: int = 20) -> List[List[dict]]:
+    """차량 1대가 visible_frames 동안 보이고 empty_frames 동안 빈 차로인 스크립트"""
+    plate = {'text': plate_text, 'ev': ev, 'attrs': {'ev': ev}, 'conf': {'ocr': 0.95, 'plate': 0.93}}
+    return [[plate]] * visible_frames + [[]] * empty_frames
+
+
+def _fill_area(plate: dict, image: np.ndarray) -> dict:
+    """스크립트에 area가 없으면 이미지 중앙 하단에 번호판 영역 생성"""
+    if 'area' in plate:
+        return plate
+    height, width = image.shape[:2]
+    plate_w, plate_h = max(2, width // 8), max(2, height // 16)
+    return dict(plate, area={'x': (width - plate_w) // 2, 'y': height * 2 // 3,
+                             'width': plate_w, 'height': plate_h, 'angle': 0.0})
+
+
+class FakeRecognizer:
+    """스크립트된 번호판 JSON을 프레임 순서대로 반환 (지연 시간 설정 가능)"""
+
+    def __init__(self, script: List[List[dict]], latency_ms: float = 0.0):
+        self.script = script
+        self.latency = latency_ms / 1000.0
+        self.calls = 0
+
+    def read_pixels(self, image: np.ndarray, frame_index: Optional[int] = None) -> bytes:
+        index = self.calls if frame_index is None else frame_index
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        plates = self.script[index % len(self.script)] if self.script else []
+        if not plates:
+            return b''
+        return json.dumps([_fill_area(plate, image) for plate in plates], ensure_ascii=False).encode('utf-8')
+
+    def stats(self) -> dict:
+        return {'calls': self.calls}
+
+
+class FakeBackend(RecognizerBackend):
+    """libtsanpr 없이 동작하는 결정적(deterministic) 가짜 백엔드"""
+    name = 'fake'
+
+    def __init__(self, script: Optional[List[List[dict]]] = None, latency_ms: float = 0.0):
+        self.script = script if script is not None else default_fake_script()
+        self.latency_ms = latency_ms
+
+    def initialize(self) -> Optional[str]:
+        return None
+
+    def create_recognizer(self, anpr_option: str, **kwargs) -> FakeRecognizer:
+        return FakeRecognizer(self.script, self.latency_ms)
+
+
+class ReplayRecognizer:
+    """기록된 object_result_json을 프레임 번호로 조회해 반환 (없으면 빈 결과)"""
+
+    def __init__(self, results: Dict[int, list], latency_ms: float = 0.0):
+        self.results = results
+        self.latency = latency_ms / 1000.0
+        self.calls = 0
+        self.misses = 0
+
+    def read_pixels(self, image: np.ndarray, frame_index: Optional[int] = None) -> bytes:
+        index = self.calls if frame_index is None else frame_index
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        result = self.results.get(index)
+        if result is None:
+            self.misses += 1
+            return b''
+        return json.dumps(result, ensure_ascii=False).encode('utf-8')
+
+    def stats(self) -> dict:
+        return {'calls': self.calls, 'misses': self.misses}
+
+
+def load_replay_results(path: str) -> Dict[int, list]:
+    """기록 파일 로드
+
+    - .jsonl: 한 줄에 {"frame_index": n, "result": [...]}
+    - .json : {"n": [...], ...} 형식의 프레임 번호 -> 결과 매핑
+    """
+    results = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    results[int(record['frame_index'])] = record['result']
+        else:
+            results = {int(k): v for k, v in json.load(f).items()}
+    return results
+
+
+class ReplayBackend(RecognizerBackend):
+    """기록된 인식 결과 재생 백엔드"""
+    name = 'replay'
+
+    def __init__(self, results_path: str, latency_ms: float = 0.0):
+        self.results_path = results_path
+        self.latency_ms = latency_ms
+        self.results = None
+
+    def initialize(self) -> Optional[str]:
+        try:
+            self.results = load_replay_results(self.results_path)
+        except (OSError, ValueError, KeyError) as e:
+            return f"replay 결과 로드 실패: {self.results_path} - {e}"
+        return None
+
+    def create_recognizer(self, anpr_option: str, **kwargs) -> ReplayRecognizer:
+        if self.results is None:
+            self.results = load_replay_results(self.results_path)
+        return ReplayRecognizer(self.results, self.latency_ms)
+
+
+def create_backend(config: dict) -> RecognizerBackend:
+    """config의 'recognizer' 항목으로 백엔드 선택 (기본값: libtsanpr)
+
+    예시:
+        "recognizer": {"backend": "fake", "latency_ms": 40, "script_path": "fake_script.json"}
+        "recognizer": {"backend": "replay", "results_path": "recorded.jsonl"}
+    """
+    recognizer_config = config.get('recognizer', {})
+    backend_name = recognizer_config.get('backend', TSANPRBackend.name)
+    latency_ms = recognizer_config.get('latency_ms', 0.0)
+
+    if backend_name == TSANPRBackend.name:
+        return TSANPRBackend(recognizer_config.get('lib_path'))
+    if backend_name == FakeBackend.name:
+        script = None
+        if recognizer_config.get('script_path'):
+            with open(recognizer_config['script_path'], 'r', encoding='utf-8') as f:
+                script = json.load(f)
+        return FakeBackend(script, latency_ms)
+    if backend_name == ReplayBackend.name:
+        return ReplayBackend(recognizer_config['results_path'], latency_ms)
+    raise ValueError(f"Unknown recognizer backend: {backend_name}")
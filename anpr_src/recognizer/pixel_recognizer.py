@@ -0,0 +1,70 @@
+import logging
+from ctypes import c_char_p, c_int32, c_void_p
+from typing import Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PIXEL_FORMAT = b'BGR'
+OUTPUT_FORMAT = b'json'
+
+
+def configure_library(lib):
+    """libtsanpr 함수 시그니처 선언
+
+    anpr_read_pixels의 첫 인자를 c_char_p 대신 c_void_p로 선언해
+    bytes 복사 없이 numpy 버퍼 포인터를 그대로 넘길 수 있게 한다.
+    """
+    lib.anpr_read_pixels.argtypes = (c_void_p, c_int32, c_int32, c_int32, c_char_p, c_char_p, c_char_p)
+    lib.anpr_read_pixels.restype = c_char_p
+    return lib
+
+
+class PixelRecognizer:
+    """카메라별 anpr_read_pixels 래퍼 (포인터 + stride 전달)
+
+    ROI는 원본 프레임의 slice라 행 사이에 간격이 있지만, 각 행 내부의 픽셀은
+    연속이므로 stride(행 바이트 수)와 함께 첫 픽셀 포인터만 넘기면 복사가 필요 없다.
+    픽셀 배치가 맞지 않거나 use_stride=False인 경우에만 카메라별로 미리 할당한
+    버퍼에 복사한다.
+    """
+
+    def __init__(self, lib, anpr_option: str, use_stride: bool = True):
+        self.lib = lib
+        self.options = anpr_option.encode('utf-8')
+        self.use_stride = use_stride
+        self._buffer = None         # 복사가 필요할 때 재사용하는 버퍼
+        self.zero_copy_count = 0
+        self.copy_count = 0
+
+    def _pixel_view(self, image: np.ndarray) -> Tuple[np.ndarray, int]:
+        """라이브러리에 넘길 (배열, stride) 반환, 필요한 경우에만 복사"""
+        if image.dtype != np.uint8 or image.ndim != 3:
+            raise ValueError(f"BGR uint8 이미지가 필요합니다: dtype={image.dtype}, shape={image.shape}")
+
+        height, width, channels = image.shape
+        row_bytes = width * channels
+        rows_packed = image.strides[2] == 1 and image.strides[1] == channels
+
+        if image.flags['C_CONTIGUOUS']:
+            self.zero_copy_count += 1
+            return image, row_bytes
+        if self.use_stride and rows_packed and image.strides[0] >= row_bytes:
+            self.zero_copy_count += 1
+            return image, image.strides[0]
+
+        if self._buffer is None or self._buffer.shape != image.shape:
+            self._buffer = np.empty(image.shape, dtype=np.uint8)
+        np.copyto(self._buffer, image)
+        self.copy_count += 1
+        return self._buffer, row_bytes
+
+    def read_pixels(self, image: np.ndarray, frame_index: Optional[int] = None) -> bytes:
+        """번호판 인식 실행, 엔진 출력(JSON bytes) 반환 (frame_index는 백엔드 공통 인터페이스용)"""
+        pixels, stride = self._pixel_view(image)
+        height, width = pixels.shape[:2]
+        return self.lib.anpr_read_pixels(pixels.ctypes.data_as(c_void_p), width, height, stride,
+                                         PIXEL_FORMAT, OUTPUT_FORMAT, self.options)
+
+    def stats(self) -> dict:
+        return {'zero_copy': self.zero_copy_count, 'copied': self.copy_count}
@@ -0,0 +1,104 @@
+import math
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import numpy as np
+from .plate_vote_tracker import PlateTrack
+
+
+def score_plate(plate_info: dict) -> float:
+    """번호판 후보 품질 점수: conf.plate x conf.ocr x sqrt(번호판 면적)"""
+    conf = plate_info.get('conf', {})
+    area = plate_info.get('area', {})
+    size = max(0.0, float(area.get('width', 0))) * max(0.0, float(area.get('height', 0)))
+    return float(conf.get('plate', 0.0)) * float(conf.get('ocr', 0.0)) * math.sqrt(size)
+
+
+@dataclass
+class FrameCandidate:
+    """track별 후보 프레임"""
+    score: float
+    frame: np.ndarray
+    frame_roi: np.ndarray
+    plate_info: dict
+    object_result_json: Any
+    frame_id: int = 0
+
+
+@dataclass
+class _TrackCandidates:
+    track: PlateTrack
+    last_seen: float
+    heap: list = field(default_factory=list)   # (score, seq, FrameCandidate) min-heap
+
+
+class BestFrameSelector:
+    """track별 상위 K개 후보 프레임을 유지하고, track이 닫히면 최고 점수 프레임 1장을 반환
+
+    track은 close_after_seconds 동안 번호판이 보이지 않거나, 확정 후 max_wait_seconds가
+    지나면 닫힌다. 확정되지 않은 채 닫힌 track(오인식 등)의 후보는 버린다.
+    한 track은 한 번만 내보내며, 이후 같은 track의 프레임은 vote tracker가 track을 종료할 때까지
+    (cooldown 동안 보이지 않을 때까지) 무시한다. 내보냄 여부는 PlateTrack에 기록한다.
+    """
+
+    def __init__(self, top_k: int = 3, close_after_seconds: float = 1.0, max_wait_seconds: float = 5.0):
+        self.top_k = max(1, top_k)
+        self.close_after_seconds = close_after_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self._tracks: Dict[int, _TrackCandidates] = {}
+        self._seq = itertools.count()
+
+    def offer(self, track: PlateTrack, candidate: FrameCandidate, now: float):
+        """후보 프레임 추가 (상위 K개만 유지)"""
+        if track.best_frame_emitted:
+            return
+        entry = self._tracks.get(track.track_id)
+        if entry is None:
+            entry = self._tracks[track.track_id] = _TrackCandidates(track, now)
+        entry.last_seen = now
+        item = (candidate.score, next(self._seq), candidate)
+        if len(entry.heap) < self.top_k:
+            heapq.heappush(entry.heap, item)
+        elif candidate.score > entry.heap[0][0]:
+            heapq.heapreplace(entry.heap, item)
+
+    def poll(self, now: float) -> List[FrameCandidate]:
+        """닫힌 track의 최고 점수 후보 목록 반환"""
+        closed = []
+        for track_id, entry in list(self._tracks.items()):
+            unseen = now - entry.last_seen > self.close_after_seconds
+            waited_too_long = (entry.track.confirmed and
+                               now - entry.track.confirmed_at > self.max_wait_seconds)
+            if not (unseen or waited_too_long):
+                continue
+            del self._tracks[track_id]
+            if entry.track.confirmed:
+                closed.append(max(entry.heap)[2])
+                entry.track.best_frame_emitted = True
+        return closed
+
+    def flush(self) -> List[FrameCandidate]:
+        """스트림 종료 시 확정된 track의 후보를 모두 반환"""
+        closed = []
+        for entry in self._tracks.values():
+            if entry.track.confirmed:
+                closed.append(max(entry.heap)[2])
+                entry.track.best_frame_emitted = True
+        self._tracks.clear()
+        return closed
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+
+def create_best_frame_selector(config: dict) -> Optional[BestFrameSelector]:
+    """cc_anpr config의 'best_frame' 항목으로 생성 (비활성 시 None)"""
+    best_frame_config = config.get('best_frame', {})
+    if not best_frame_config.get('enabled', False):
+        return None
+    return BestFrameSelector(
+        top_k=best_frame_config.get('top_k', 3),
+        close_after_seconds=best_frame_config.get('close_after_seconds', 1.0),
+        max_wait_seconds=best_frame_config.get('max_wait_seconds', 5.0),
+    )
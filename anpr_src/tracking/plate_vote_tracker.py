@@ -0,0 +1,95 @@
+import time
+import itertools
+from collections import deque, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass
+class PlateTrack:
+    """번호판 단위 추적 정보"""
+    track_id: int
+    plate_text: str
+    first_seen: float
+    last_seen: float
+    votes: int = 0                      # 추적 시작 이후 누적 인식 횟수
+    confirmed_at: Optional[float] = None
+    best_frame_emitted: bool = False    # BestFrameSelector가 이 track의 프레임을 이미 내보냈는지
+
+    @property
+    def confirmed(self) -> bool:
+        return self.confirmed_at is not None
+
+
+class PlateVoteTracker:
+    """최근 n개 인식 결과에 대한 번호판 투표 (O(1) 갱신)
+
+    deque.count()로 매번 윈도우 전체를 훑는 대신 번호판별 카운터를
+    윈도우 eviction과 함께 증감한다. 같은 번호판은 확정 후 마지막으로 보인
+    시점부터 cooldown_seconds가 지나기 전까지 다시 확정하지 않으며,
+    그 이후 다시 나타나면 새 track_id로 추적한다.
+    """
+
+    def __init__(self, window_size: int, threshold: int, cooldown_seconds: float = 30.0):
+        """
+        Args:
+            window_size (int): 투표 윈도우 크기 (plate_count_deque_size)
+            threshold (int): 확정에 필요한 윈도우 내 인식 횟수 (plate_count_threshold)
+            cooldown_seconds (float): 확정된 번호판을 다시 확정하지 않는 시간 (초)
+        """
+        self.window_size = window_size
+        self.threshold = threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._window = deque()
+        self._counts: Dict[str, int] = {}
+        self._tracks: 'OrderedDict[str, PlateTrack]' = OrderedDict()   # last_seen 오름차순
+        self._track_ids = itertools.count(1)
+
+    def add(self, plate_text: str, now: Optional[float] = None) -> Optional[PlateTrack]:
+        """인식 결과 1건 투표, 이번 투표로 새로 확정된 경우 해당 track 반환"""
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+
+        # 윈도우가 가득 찼으면 가장 오래된 투표 제거
+        if len(self._window) >= self.window_size:
+            evicted = self._window.popleft()
+            remaining = self._counts[evicted] - 1
+            if remaining:
+                self._counts[evicted] = remaining
+            else:
+                del self._counts[evicted]
+        self._window.append(plate_text)
+        count = self._counts.get(plate_text, 0) + 1
+        self._counts[plate_text] = count
+
+        track = self._tracks.get(plate_text)
+        if track is None:
+            track = PlateTrack(next(self._track_ids), plate_text, first_seen=now, last_seen=now)
+            self._tracks[plate_text] = track
+        else:
+            track.last_seen = now
+            self._tracks.move_to_end(plate_text)
+        track.votes += 1
+
+        if count >= self.threshold and not track.confirmed:
+            track.confirmed_at = now
+            return track
+        return None
+
+    def _expire(self, now: float):
+        """cooldown 동안 보이지 않은 track 종료 (last_seen 순서라 앞에서부터만 확인)"""
+        while self._tracks:
+            plate_text, track = next(iter(self._tracks.items()))
+            if now - track.last_seen <= self.cooldown_seconds:
+                break
+            del self._tracks[plate_text]
+
+    def count(self, plate_text: str) -> int:
+        """윈도우 내 해당 번호판 투표 수"""
+        return self._counts.get(plate_text, 0)
+
+    def get_track(self, plate_text: str) -> Optional[PlateTrack]:
+        return self._tracks.get(plate_text)
+
+    def __len__(self) -> int:
+        return len(self._window)
@@ -0,0 +1,129 @@
+"""불확실/에러 케이스 저장: 인식 경로 동기 기록 vs CaseCaptureSink (비동기 + 시간당 예산 + reservoir sampling)
+
+1) 저조도 시간대 재현: confidence_threshold를 1.0 초과로 두어 모든 번호판이 불확실 케이스가 되게 하고
+   (이미지 저장 포함) process_realtime_batch 1회의 지연을 두 방식으로 비교한다.
+2) 가짜 시계로 한 시간에 많은 케이스를 넣어 예산/표본 수, 다음 시간대 기록, 표본의 균등성을 확인한다.
+   기록 수나 JSON 형식이 기대와 다르면 종료 코드 1.
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_case_capture [--plates 200]
+"""
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+import numpy as np
+
+import ev_detect
+from ev_src.detector.ev_detector_0327 import EVDetector
+from ev_src.utils.case_capture import CaseCaptureSink, CASE_UNCERTAIN
+from benchmarks.synthetic_env import make_synthetic_config, make_synthetic_frame, make_plate_info
+
+
+def make_low_light_config(workdir):
+    config = ev_detect.load_config(make_synthetic_config(workdir))
+    config['processing']['confidence_threshold'] = 1.01     # 모든 판정이 불확실 케이스
+    config['processing']['save_options']['save_uncertain_image'] = True
+    return config
+
+
+def per_vehicle_latency(config, detector, frames, plate_info, capture, interval=0.0):
+    """차량 1대씩 interval 초 간격으로 도착시키며 process_realtime_batch 지연(ms) 측정"""
+    latencies = []
+    for frame in frames:
+        start = time.perf_counter()
+        ev_detect.process_realtime_batch(frame, [plate_info], detector, config, capture)
+        latencies.append((time.perf_counter() - start) * 1e3)
+        time.sleep(interval)
+    return np.array(latencies)
+
+
+def describe(latencies):
+    return (f"p50={np.median(latencies):.2f} p95={np.percentile(latencies, 95):.2f} "
+            f"p99={np.percentile(latencies, 99):.2f}")
+
+
+class FakeClock:
+    def __init__(self, start):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+def check_budget(workdir, cases=1000, budget=100, reservoir=20):
+    """한 시간대에 cases건 → budget건 즉시 + reservoir건 표본, 표본은 초과분 전체에서 고르게"""
+    clock = FakeClock(datetime(2025, 4, 18, 13, 0, 0))
+    sink = CaseCaptureSink(max_queue_size=cases, hourly_budget=budget, reservoir_size=reservoir, clock=clock, seed=0)
+    for index in range(cases):
+        clock.now += timedelta(seconds=3)     # 1000건 = 50분
+        sink.capture(CASE_UNCERTAIN, workdir, None, {'index': index, 'value': np.float32(0.25), 'image_path': None})
+    in_hour = sink.stats()
+    clock.now = datetime(2025, 4, 18, 14, 0, 1)     # 다음 시간대 첫 케이스가 이전 표본을 내보냄
+    sink.capture(CASE_UNCERTAIN, workdir, None, {'index': cases, 'value': 1.0, 'image_path': None})
+    sink.close()
+    written = []
+    for path in glob.glob(os.path.join(workdir, '*', '*.json')):
+        with open(path, encoding='utf-8') as f:
+            written.append(json.load(f))
+    indices = sorted(case['index'] for case in written)
+    sampled = [index for index in indices if budget <= index < cases]
+    return in_hour, sink.stats(), indices, sampled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--plates', type=int, default=200)
+    parser.add_argument('--interval-ms', type=float, default=50.0, help='차량 도착 간격')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    ok = True
+    with tempfile.TemporaryDirectory() as workdir:
+        config = make_low_light_config(workdir)
+        detector = EVDetector(config['model']['xgb_path'], config['model']['lgbm_path'],
+                              confidence_threshold=config['processing']['confidence_threshold'])
+        frames = [make_synthetic_frame(seed=seed) for seed in range(8)]
+        frames = [frames[index % len(frames)] for index in range(args.plates)]
+        plate_info = make_plate_info()
+        per_vehicle_latency(config, detector, frames[:5], plate_info, None)     # 첫 호출 지연 제외
+
+        interval = args.interval_ms / 1e3
+        certain_config = dict(config, processing=dict(config['processing'], confidence_threshold=0.0))
+        floor_ms = per_vehicle_latency(certain_config, detector, frames, plate_info, None, interval)
+        sync_ms = per_vehicle_latency(config, detector, frames, plate_info, None, interval)
+        sink = CaseCaptureSink(max_queue_size=32, hourly_budget=10 ** 6)
+        async_ms = per_vehicle_latency(config, detector, frames, plate_info, sink, interval)
+        sink.close()
+        stats = sink.stats()
+        saved = glob.glob(os.path.join(config['paths']['uncertain_cases_dir'], '*', '*.json'))
+        with open(saved[-1], encoding='utf-8') as f:
+            keys = list(json.load(f))
+        ok &= keys == ['timestamp', 'input_plate_info', 'detection_result', 'image_path', 'metrics']
+
+        print(f"low-light hour, {args.plates} uncertain plates with images, one every {args.interval_ms:g} ms "
+              f"(ms/vehicle):")
+        print(f"  no case saved  {describe(floor_ms)}")
+        print(f"  sync           {describe(sync_ms)}")
+        print(f"  async          {describe(async_ms)}  (written={stats['written']}, dropped={stats['dropped']})")
+        print(f"  case JSON keys unchanged: {keys}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        in_hour, final, indices, sampled = check_budget(workdir)
+        expected = 100 + 20 + 1
+        ok &= len(indices) == expected and len(sampled) == 20 and indices[-1] == 1000
+        print(f"budget 100 + reservoir 20, 1000 cases in one hour: written={len(indices)} (expected {expected}), "
+              f"sampled_out={final['sampled_out']}, reservoir before rollover={in_hour['reservoir']}")
+        print(f"  sampled indices span {sampled[0]}..{sampled[-1]} of 100..999, "
+              f"mean {np.mean(sampled):.0f} (uniform mean 549)")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""컴파일된 트리 앙상블(.npz) vs 원본 XGBoost/LightGBM 분류기: 일치 여부, 추론 지연, 모델 로드 비용
+
+stand-in 모델(기본 50 트리, --trees로 조정)을 학습해 컴파일하고, 0/NaN이 섞인 입력까지 포함해
+양성 확률 최대 오차를 확인한다 (허용 오차 초과 시 종료 코드 1). 로드 비용은 새 인터프리터에서
+load_model() 한 번에 걸리는 시간과 xgboost/lightgbm import 여부로 비교한다.
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_compiled_trees [--trees 50] [--batch 8] [--iterations 300]
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+import timeit
+import joblib
+import numpy as np
+
+from ev_src.detector.compiled_trees import compile_model, max_probability_error
+from benchmarks.synthetic_env import make_synthetic_features, train_stand_in_models
+
+TOLERANCE = 1e-5
+
+LOAD_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+from ev_src.detector.compiled_trees import load_model
+load_model(sys.argv[1])
+print(json.dumps({'load_ms': (time.perf_counter() - start) * 1e3,
+                  'imports_xgboost': 'xgboost' in sys.modules,
+                  'imports_lightgbm': 'lightgbm' in sys.modules}))
+"""
+
+
+def make_test_rows(n, seed=7):
+    """학습 분포 행 + 결측(NaN) 행"""
+    X, _ = make_synthetic_features(n, seed=seed)
+    with_nan = X.copy()
+    with_nan[::3, 90:130] = np.nan
+    return X, with_nan
+
+
+def per_call_us(fn, iterations):
+    return min(timeit.repeat(fn, number=iterations, repeat=5)) / iterations * 1e6
+
+
+def measure_load(path):
+    output = subprocess.run([sys.executable, '-c', LOAD_PROBE, path], capture_output=True, text=True,
+                            check=True, cwd=os.getcwd()).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--trees', type=int, default=50, help='stand-in 모델 트리 수')
+    parser.add_argument('--batch', type=int, default=8, help='배치 크기 (한 프레임의 번호판 수)')
+    parser.add_argument('--iterations', type=int, default=300)
+    args = parser.parse_args()
+
+    X, X_nan = make_test_rows(500)
+    failed = False
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = train_stand_in_models(workdir, n_estimators=args.trees)
+        print(f"{'model':<8} {'trees':>5} {'max|dp|':>9} {'nan|dp|':>9} {'1row_orig':>10} {'1row_npz':>9} "
+              f"{f'{args.batch}row_orig':>10} {f'{args.batch}row_npz':>9} {'load_pkl_ms':>11} {'load_npz_ms':>11}")
+        for name, pkl_path in zip(('xgb', 'lgbm'), paths):
+            model = joblib.load(pkl_path)
+            forest = compile_model(model)
+            npz_path = os.path.join(workdir, name + '.npz')
+            forest.save(npz_path)
+
+            error = max_probability_error(model, forest, X)
+            nan_error = max_probability_error(model, forest, X_nan)
+            failed |= max(error, nan_error) > TOLERANCE
+            row, batch = X[:1], X[:args.batch]
+            timings = [per_call_us(lambda: m.predict_proba(rows), args.iterations)
+                       for rows in (row, batch) for m in (model, forest)]
+            load_pkl, load_npz = measure_load(pkl_path), measure_load(npz_path)
+            print(f"{name:<8} {forest.n_trees:5d} {error:9.1e} {nan_error:9.1e} "
+                  f"{timings[0]:10.1f} {timings[1]:9.1f} {timings[2]:10.1f} {timings[3]:9.1f} "
+                  f"{load_pkl['load_ms']:11.1f} {load_npz['load_ms']:11.1f}")
+            if load_npz['imports_xgboost'] or load_npz['imports_lightgbm']:
+                print(f"  WARNING: {name}.npz load imported a training library")
+                failed = True
+    print(f"agreement (tolerance {TOLERANCE:g}): {'FAIL' if failed else 'OK'}   (latency: us/call)")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
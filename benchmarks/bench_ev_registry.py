@@ -0,0 +1,74 @@
+"""ev_detect() 호출당 지연 시간 비교: 매 호출 재생성(cold) vs 프로세스 레지스트리(warm)
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_ev_registry [--config ev_config/config_0327.yaml] [--iterations 50]
+--config를 지정하지 않으면 synthetic_env의 stand-in 모델을 사용한다.
+"""
+import argparse
+import logging
+import tempfile
+import time
+import numpy as np
+
+import ev_detect as ev_detect_module
+from ev_src.detector.ev_detector_0327 import EVDetector
+from ev_src.utils.logging_config import setup_logging
+from benchmarks.synthetic_env import make_synthetic_config, make_synthetic_frame, make_plate_info
+
+
+def cold_ev_detect(frame, plate_info, config_path):
+    """기존 ev_detect() 동작 재현: 매 호출마다 설정/로깅/모델 로드"""
+    config = ev_detect_module.load_config(config_path)
+    setup_logging(config['paths']['logs_dir'], config)
+    detector = EVDetector(
+        config['model']['xgb_path'],
+        config['model']['lgbm_path'],
+        confidence_threshold=config['processing']['confidence_threshold'],
+        max_processing_time=config['realtime']['performance']['max_processing_time']
+    )
+    return ev_detect_module.process_realtime_data(frame, plate_info, detector, config)
+
+
+def time_calls(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return np.array(samples) * 1000.0
+
+
+def report(name, samples_ms):
+    print(f"{name:<6} mean={samples_ms.mean():8.2f}ms  p50={np.percentile(samples_ms, 50):8.2f}ms  "
+          f"p95={np.percentile(samples_ms, 95):8.2f}ms  max={samples_ms.max():8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--config', default=None, help='EV 설정 yaml 경로 (미지정 시 합성 모델 사용)')
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = args.config or make_synthetic_config(tmp_dir)
+        frame = make_synthetic_frame()
+        plate_info = make_plate_info()
+
+        cold = time_calls(lambda: cold_ev_detect(frame, plate_info, config_path), args.iterations)
+
+        first_start = time.perf_counter()
+        ev_detect_module.warmup(config_path)
+        warmup_ms = (time.perf_counter() - first_start) * 1000.0
+        warm = time_calls(lambda: ev_detect_module.ev_detect(frame, plate_info, config_path), args.iterations)
+
+        # 벤치마크 출력이 로그에 묻히지 않도록 핸들러 정리
+        logging.getLogger().handlers.clear()
+
+        print(f"iterations={args.iterations}, warmup={warmup_ms:.2f}ms (1회)")
+        report('cold', cold)
+        report('warm', warm)
+        print(f"speedup (p50): {np.percentile(cold, 50) / np.percentile(warm, 50):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""HSV 히스토그램 특징 추출 비교: 기존 split + calcHist x3 + np.r_ vs 출력 배열 직접 기록 (단건/배치)
+
+시간 측정만 한다 (기존 구현과 비트 단위로 같은지는 tests/test_image_processing.py에서 검증).
+오프셋 인코딩 np.bincount 방식도 참고용으로 함께 측정한다.
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_features [--plates 8] [--iterations 500]
+"""
+import argparse
+import timeit
+import cv2
+import numpy as np
+
+from ev_src.utils.image_processing import extract_features, extract_features_batch, preprocess_image
+from benchmarks.synthetic_env import make_synthetic_frame
+
+CHANNEL_OFFSETS = np.array([0, 256, 512], dtype=np.uint16)
+
+
+def legacy_extract_features(hsv_image):
+    """변경 전 extract_features"""
+    h, s, v = cv2.split(hsv_image)
+    hist_h = cv2.calcHist([h], [0], None, [256], [0, 256])
+    hist_s = cv2.calcHist([s], [0], None, [256], [0, 256])
+    hist_v = cv2.calcHist([v], [0], None, [256], [0, 256])
+    return np.r_[hist_h, hist_s, hist_v].squeeze()
+
+
+def bincount_extract_features(hsv_image):
+    """오프셋 인코딩 bincount (채널별 0/256/512를 더해 768 빈을 한 번에 집계)"""
+    codes = hsv_image.reshape(-1, 3) + CHANNEL_OFFSETS
+    return np.bincount(codes.ravel(), minlength=768).astype(np.float32)
+
+
+def make_hsv_crops(count, seed=0):
+    """합성 프레임에서 실제 전처리 경로로 만든 번호판 HSV 이미지"""
+    frame = make_synthetic_frame(seed=seed)
+    rng = np.random.default_rng(seed)
+    crops = [preprocess_image(frame, (int(rng.integers(0, 1700)), int(rng.integers(0, 1000)), 111, 60),
+                              float(rng.uniform(-15, 15)))
+             for _ in range(count)]
+    return crops
+
+
+def per_call_us(fn, iterations):
+    return min(timeit.repeat(fn, number=iterations, repeat=5)) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--plates', type=int, default=8, help='배치 크기 (한 프레임의 번호판 수)')
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args()
+
+    crops = make_hsv_crops(args.plates)
+    hsv = crops[0]
+    plates = crops[:args.plates]
+    out = np.empty((len(plates), 768), dtype=np.float32)
+    single = {
+        'legacy': per_call_us(lambda: legacy_extract_features(hsv), args.iterations),
+        'bincount': per_call_us(lambda: bincount_extract_features(hsv), args.iterations),
+        'new': per_call_us(lambda: extract_features(hsv), args.iterations),
+    }
+    batch = {
+        'legacy+vstack': per_call_us(lambda: np.vstack([legacy_extract_features(p) for p in plates]), args.iterations),
+        'new_batch': per_call_us(lambda: extract_features_batch(plates, out), args.iterations),
+    }
+    print("single 320x180 crop (us/call): " + ", ".join(f"{k}={v:.1f}" for k, v in single.items()))
+    print(f"batch of {len(plates)} (us/call):     " + ", ".join(f"{k}={v:.1f}" for k, v in batch.items()))
+    print(f"speedup: single {single['legacy'] / single['new']:.2f}x, "
+          f"batch {batch['legacy+vstack'] / batch['new_batch']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""카메라 프로세스 N개의 시작 시간/메모리 비교: 프로세스별 모델 로드(spawn) vs 부모 preload + fork + gc.freeze
+
+각 자식은 cc_anpr.process_camera와 같이 EV 모델 warmup 후 시작 보고를 보내고,
+모든 자식이 살아 있는 상태에서 RSS/PSS를 측정한다 (공유 페이지는 PSS에서 나눠 계산됨).
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_fork_preload [--config ev_config/config_0327.yaml] [--cameras 8]
+--config를 지정하지 않으면 synthetic_env의 stand-in 모델을 사용한다.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import tempfile
+import time
+
+
+def camera_stub(config_path, spawned_at, report_queue, release_event):
+    """카메라 프로세스 대역: EV warmup 후 시작 시간/메모리 보고, 측정이 끝날 때까지 대기"""
+    from ev_detect import warmup
+    from anpr_src.pipeline.preload import process_report
+    warmup(config_path)
+    report_queue.put(process_report('camera', time.monotonic() - spawned_at))
+    release_event.wait()
+
+
+def run_mode(mode, config_path, cameras):
+    if mode == 'fork_preload':
+        from anpr_src.pipeline.preload import preload_shared_state
+        parent = preload_shared_state({}, config_path)
+        context = multiprocessing.get_context('fork')
+    else:
+        parent = None
+        context = multiprocessing.get_context('spawn')
+
+    report_queue = context.Queue()
+    release_event = context.Event()
+    start = time.monotonic()
+    processes = [context.Process(target=camera_stub, args=(config_path, time.monotonic(), report_queue, release_event))
+                 for _ in range(cameras)]
+    for process in processes:
+        process.start()
+    reports = [report_queue.get() for _ in processes]
+    all_ready = time.monotonic() - start
+    release_event.set()
+    for process in processes:
+        process.join()
+
+    return {
+        'mode': mode,
+        'cameras': cameras,
+        'all_ready_sec': round(all_ready, 3),
+        'startup_sec_max': max(report['startup_sec'] for report in reports),
+        'rss_mb_total': round(sum(report['rss_mb'] or 0 for report in reports), 1),
+        'pss_mb_total': round(sum(report['pss_mb'] or 0 for report in reports), 1),
+        'parent': parent,
+        'processes': reports,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--config', default=None, help='EV 설정 yaml 경로 (미지정 시 합성 모델 사용)')
+    parser.add_argument('--cameras', type=int, default=8)
+    parser.add_argument('--output', default=None, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.config:
+            config_path = args.config
+        else:
+            from benchmarks.synthetic_env import make_synthetic_config
+            config_path = make_synthetic_config(tmp_dir)
+
+        # spawn 측정을 먼저 해야 부모의 preload가 자식에 섞이지 않음
+        results = [run_mode('spawn', config_path, args.cameras), run_mode('fork_preload', config_path, args.cameras)]
+
+    logging.getLogger().handlers.clear()
+    for result in results:
+        print(f"{result['mode']:<13} cameras={result['cameras']}  all_ready={result['all_ready_sec']:7.3f}s  "
+              f"startup_max={result['startup_sec_max']:7.3f}s  rss_total={result['rss_mb_total']:8.1f}MB  "
+              f"pss_total={result['pss_mb_total']:8.1f}MB")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
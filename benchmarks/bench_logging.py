@@ -0,0 +1,225 @@
+"""로깅: 기존 setup_logging(호출마다 RotatingFileHandler + basicConfig) vs 큐 기반 중앙 로깅
+
+1) setup_logging을 여러 번 호출할 때 열리는 로그 파일/fd/root 핸들러 수 비교
+2) 파일 핸들러로 직접(동기) 기록 vs LazyQueueHandler → QueueListener 기록의 호출 스레드 지연
+   (일반 파일, 주기적으로 쓰기가 멈추는 디스크 모사)
+3) 번호판별 plate_info 로그: 기존 INFO json.dumps vs log_plate_payload (INFO 레벨 / DEBUG + 번호판별 간격)
+4) fork된 multiprocessing 자식의 로그가 종료 시 파일에 모두 기록되는지
+중앙 로깅에서 fd/핸들러가 늘거나 기록이 유실되면 종료 코드 1.
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_logging [--calls 5000] [--setups 200]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import logging.handlers
+import argparse
+import tempfile
+import multiprocessing
+from datetime import datetime
+
+from ev_src.utils import logging_config
+from benchmarks.synthetic_env import make_plate_info
+
+
+def open_fds():
+    return len(os.listdir('/proc/self/fd'))
+
+
+def legacy_setup_logging(log_dir, config=None):
+    """기존 setup_logging 재현: 호출마다 RotatingFileHandler를 열고 basicConfig (첫 호출만 적용)"""
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = os.path.join(log_dir, f"ev_prediction_{datetime.now().strftime('%Y%m%d')}.log")
+    file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=10485760, backupCount=5)
+    logging.basicConfig(level=logging.INFO, format=logging_config.LOG_FORMAT,
+                        handlers=[file_handler, logging.StreamHandler()])
+    return logging.getLogger(__name__)
+
+
+def reset_root():
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+
+def count_setup(setup, log_dir, setups):
+    """(setups번 호출 후 늘어난 fd, root 핸들러 수, 호출당 us, 열린 로그 파일 수)"""
+    opened = [0]
+    original_init = logging.FileHandler.__init__
+
+    def counting_init(handler, *args, **kwargs):
+        opened[0] += 1
+        original_init(handler, *args, **kwargs)
+
+    fds_before = open_fds()
+    logging.FileHandler.__init__ = counting_init
+    try:
+        start = time.perf_counter()
+        for _ in range(setups):
+            setup(log_dir)
+        elapsed_us = (time.perf_counter() - start) / setups * 1e6
+    finally:
+        logging.FileHandler.__init__ = original_init
+    return open_fds() - fds_before, len(logging.getLogger().handlers), elapsed_us, opened[0]
+
+
+def time_calls_us(fn, calls):
+    start = time.perf_counter()
+    for index in range(calls):
+        fn(index)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+class StallingFileHandler(logging.FileHandler):
+    """stall_every건마다 stall_ms 만큼 쓰기가 멈추는 디스크 (페이지 캐시 write-back/NFS 지연 모사)"""
+
+    def __init__(self, path, stall_every=200, stall_ms=20.0):
+        super().__init__(path, encoding='utf-8')
+        self.stall_every = stall_every
+        self.stall_ms = stall_ms
+        self.emitted = 0
+
+    def emit(self, record):
+        self.emitted += 1
+        if self.emitted % self.stall_every == 0:
+            time.sleep(self.stall_ms / 1e3)
+        super().emit(record)
+
+
+def log_lines(logger, calls, interval=0.0002):
+    """interval 간격으로 한 줄씩 기록하며 호출 스레드 지연 (us) 분포"""
+    samples = []
+    for index in range(calls):
+        start = time.perf_counter()
+        logger.info("EV DETECT RESULT >> %s, %s", index, index % 2 == 0)
+        samples.append((time.perf_counter() - start) * 1e6)
+        time.sleep(interval)
+    samples.sort()
+    return {name: samples[int(q * (calls - 1))] for name, q in (('p50', 0.5), ('p99', 0.99), ('max', 1.0))}
+
+
+def describe(latency):
+    return ' '.join(f"{name}={value:.1f}" for name, value in latency.items())
+
+
+def install_sync(handler):
+    reset_root()
+    handler.setFormatter(logging.Formatter(logging_config.LOG_FORMAT))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+
+def install_queue(path, handler_class=None):
+    """프로세스 최초 설치처럼 configure_logging (이전 설치는 해제)"""
+    reset_root()
+    logging_config._installation = None
+    logging_config.configure_logging(file_path=path, console=False)
+    if handler_class is not None:
+        installation = logging_config._installation
+        installation.listener.stop()
+        installation.targets = [handler_class(path)]
+        installation.targets[0].setFormatter(logging.Formatter(logging_config.LOG_FORMAT))
+        installation.start()
+
+
+def plate_payload_calls(logger, calls, plates=20):
+    """plates대의 차량이 번갈아 인식되는 상황 (차량당 calls/plates번)"""
+    infos = []
+    for index in range(plates):
+        info = make_plate_info()
+        info['text'] = f'12가{3400 + index}'
+        infos.append(info)
+    legacy = time_calls_us(lambda index: logger.info(
+        f"입력된 plate_info 구조: {json.dumps(infos[index % plates], indent=2, ensure_ascii=False)}"), calls)
+    lazy = time_calls_us(lambda index: logging_config.log_plate_payload(logger, infos[index % plates]), calls)
+    return legacy, lazy
+
+
+def child_logs(lines):
+    logger = logging.getLogger('bench.child')
+    for index in range(lines):
+        logger.info("child line %d", index)
+
+
+def count_in_file(path, text):
+    with open(path, encoding='utf-8') as f:
+        return sum(1 for line in f if text in line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=5000)
+    parser.add_argument('--setups', type=int, default=200)
+    args = parser.parse_args()
+
+    ok = True
+    logger = logging.getLogger('bench')
+    with tempfile.TemporaryDirectory() as workdir:
+        stderr = sys.stderr
+        sys.stderr = open(os.devnull, 'w')     # 콘솔 핸들러 출력은 버림
+        try:
+            legacy = count_setup(legacy_setup_logging, os.path.join(workdir, 'legacy'), args.setups)
+            reset_root()
+            central = count_setup(logging_config.setup_logging, os.path.join(workdir, 'central'), args.setups)
+            ok &= central[0] <= 1 and central[1] == 1 and central[3] == 1
+            logging_config.shutdown_logging()
+        finally:
+            sys.stderr.close()
+            sys.stderr = stderr
+        print(f"{args.setups} setup_logging calls:")
+        for name, (fds, handlers, elapsed_us, opened) in (('legacy', legacy), ('central', central)):
+            print(f"  {name:<8} +{fds} fds, {handlers} root handlers, {opened} log files opened, "
+                  f"{elapsed_us:.1f} us/call")
+
+        print(f"{args.calls} log lines one every 0.2 ms, caller thread latency (us):")
+        for name, handler_class in (('file', None), ('stalling file', StallingFileHandler)):
+            path = os.path.join(workdir, f'sync_{name}.log')
+            install_sync(handler_class(path) if handler_class else logging.FileHandler(path, encoding='utf-8'))
+            sync_latency = log_lines(logger, args.calls)
+            path = os.path.join(workdir, f'queue_{name}.log')
+            install_queue(path, handler_class)
+            queue_latency = log_lines(logger, args.calls)
+            logging_config.shutdown_logging()
+            written = count_in_file(path, 'EV DETECT RESULT')
+            ok &= written == args.calls
+            print(f"  {name:<14} sync  {describe(sync_latency)}")
+            print(f"  {'':<14} queue {describe(queue_latency)}  (lines written {written})")
+
+        install_sync(logging.FileHandler(os.path.join(workdir, 'sync_payload.log'), encoding='utf-8'))
+        sync_payload, _ = plate_payload_calls(logger, args.calls)
+        payload_path = os.path.join(workdir, 'queue_payload.log')
+        install_queue(payload_path)
+        queued_payload, info_payload = plate_payload_calls(logger, args.calls)
+        logging.getLogger().setLevel(logging.DEBUG)
+        _, debug_payload = plate_payload_calls(logger, args.calls)
+        logging_config.shutdown_logging()
+        debug_written = count_in_file(payload_path, '입력된 plate_info 구조') - 2 * args.calls     # legacy INFO 2회분 제외
+        ok &= debug_written == 20
+        print(f"plate_info payload log, {args.calls} calls over 20 plates (us/call):")
+        print(f"  legacy INFO json.dumps: sync {sync_payload:.2f}, queued {queued_payload:.2f}")
+        print(f"  log_plate_payload: at INFO {info_payload:.3f}, at DEBUG {debug_payload:.2f} "
+              f"({debug_written} payloads written, 1 per plate per 60 s)")
+
+        # fork된 multiprocessing 자식: 자식마다 새 listener로 기록하고 종료 시 flush
+        fork_path = os.path.join(workdir, 'fork.log')
+        install_queue(fork_path)
+        context = multiprocessing.get_context('fork')
+        children = [context.Process(target=child_logs, args=(1000,)) for _ in range(4)]
+        for child in children:
+            child.start()
+        for child in children:
+            child.join()
+        logging_config.shutdown_logging()
+        child_lines = count_in_file(fork_path, 'child line')
+        ok &= child_lines == 4000
+        print(f"4 forked workers x 1000 lines: {child_lines} lines in file")
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""메트릭 히스토리 비교: 기존 무제한 list + 매 호출 np.mean 요약 vs MetricsHistory (링 버퍼 + 누적 집계)
+
+같은 메트릭 스트림으로 두 요약 값이 같은지 확인하고 (다르면 종료 코드 1), 누적 건수별
+get_metrics_summary 1회 비용과 히스토리가 붙잡고 있는 메모리(tracemalloc)를 보고한다.
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_metrics_history [--counts 1000 10000 100000] [--capacity 1024]
+"""
+import sys
+import copy
+import math
+import argparse
+import timeit
+import tracemalloc
+import numpy as np
+
+from ev_src.detector.ev_classifier_0327 import ProcessingMetrics
+from ev_src.detector.metrics_history import MetricsHistory
+
+
+def legacy_summary(history):
+    """변경 전 EVClassifier.get_metrics_summary"""
+    if not history:
+        return {}
+    return {
+        'total_processed': len(history),
+        'avg_processing_time': np.mean([m.elapsed_time for m in history]),
+        'avg_confidence': np.mean([m.confidence_score for m in history]),
+        'error_rate': sum(1 for m in history if m.error_occurred) / len(history),
+        'model_usage': {
+            'xgb': sum(1 for m in history if m.model_used == 'xgb'),
+            'lgbm': sum(1 for m in history if m.model_used == 'lgbm')
+        }
+    }
+
+
+def make_metrics(count, seed=0):
+    rng = np.random.default_rng(seed)
+    elapsed = rng.lognormal(np.log(0.004), 0.6, count)
+    confidence = rng.uniform(0, 1, count)
+    errors = rng.random(count) < 0.01
+    return [ProcessingMetrics(elapsed_time=float(e), confidence_score=0.0 if err else float(c),
+                              model_used='none' if err else ('xgb' if c >= 0.45 else 'lgbm'),
+                              error_occurred=bool(err), error_message='synthetic' if err else None)
+            for e, c, err in zip(elapsed, confidence, errors)]
+
+
+def summaries_match(legacy, new) -> bool:
+    return (legacy['total_processed'] == new['total_processed']
+            and legacy['model_usage'] == new['model_usage']
+            and all(math.isclose(legacy[key], new[key], rel_tol=1e-9)
+                    for key in ('avg_processing_time', 'avg_confidence', 'error_rate')))
+
+
+def fill(history, stream):
+    for metrics in stream:
+        history.append(copy.copy(metrics))
+    return history
+
+
+def traced_kib(build):
+    tracemalloc.start()
+    history = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del history
+    return current / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--capacity', type=int, default=1024)
+    args = parser.parse_args()
+
+    ok = True
+    print(f"{'records':>8} {'legacy_us':>11} {'new_us':>8} {'legacy_KiB':>11} {'new_KiB':>8} {'match':>6}")
+    for count in args.counts:
+        stream = make_metrics(count)
+        legacy = list(stream)
+        history = MetricsHistory(args.capacity)
+        history.extend(stream)
+        match = summaries_match(legacy_summary(legacy), history.summary())
+        ok &= match
+
+        number = max(1, 20000 // count)
+        legacy_us = min(timeit.repeat(lambda: legacy_summary(legacy), number=number, repeat=3)) / number * 1e6
+        new_us = min(timeit.repeat(history.summary, number=1000, repeat=3)) / 1000 * 1e6
+        # 메트릭 객체를 추적 구간 안에서 새로 만들어 히스토리가 붙잡고 있는 메모리까지 측정
+        legacy_kib = traced_kib(lambda: [copy.copy(m) for m in stream])
+        new_kib = traced_kib(lambda: fill(MetricsHistory(args.capacity), stream))
+        print(f"{count:8d} {legacy_us:11.1f} {new_us:8.2f} {legacy_kib:11.1f} {new_kib:8.1f} {str(match):>6}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""anpr_read_pixels 입력 준비 비용 비교 (libtsanpr 호출 자체는 제외)
+
+- bytes(frame_roi)          : 기존 방식 (gather + bytes 복사)
+- np.ascontiguousarray      : 매 프레임 새 배열 할당 + 복사
+- PixelRecognizer(copy)     : 미리 할당한 버퍼에 복사 (use_stride=False)
+- PixelRecognizer(stride)   : 포인터 + stride, 복사 없음
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_pixel_handoff [--iterations 200]
+"""
+import argparse
+import time
+from ctypes import c_void_p
+import numpy as np
+
+from anpr_src.recognizer.pixel_recognizer import PixelRecognizer
+from benchmarks.synthetic_env import make_synthetic_frame
+
+ROI = (0.3, 1.0, 0.1, 0.9)   # cc_anpr config['roi'] 형식 (y1, y2, x1, x2 비율)
+
+
+def roi_slice(frame, roi):
+    h, w = frame.shape[:2]
+    y1, y2, x1, x2 = roi
+    return frame[int(y1 * h):int(y2 * h), int(x1 * w):int(x2 * w)]
+
+
+def time_per_call(fn, iterations):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    for height, width in ((480, 640), (1080, 1920)):
+        frame = make_synthetic_frame(height, width)
+        frame_roi = roi_slice(frame, ROI)
+        roi_mb = frame_roi.nbytes / 1e6
+
+        stride_recognizer = PixelRecognizer(None, '', use_stride=True)
+        copy_recognizer = PixelRecognizer(None, '', use_stride=False)
+
+        def with_stride():
+            pixels, _ = stride_recognizer._pixel_view(frame_roi)
+            return pixels.ctypes.data_as(c_void_p)
+
+        def with_buffer():
+            pixels, _ = copy_recognizer._pixel_view(frame_roi)
+            return pixels.ctypes.data_as(c_void_p)
+
+        cases = {
+            'bytes(frame_roi)': lambda: bytes(frame_roi),
+            'np.ascontiguousarray': lambda: np.ascontiguousarray(frame_roi).ctypes.data_as(c_void_p),
+            'PixelRecognizer(copy)': with_buffer,
+            'PixelRecognizer(stride)': with_stride,
+        }
+        print(f"frame {width}x{height}, roi {frame_roi.shape[1]}x{frame_roi.shape[0]} ({roi_mb:.2f} MB)")
+        for name, fn in cases.items():
+            us = time_per_call(fn, args.iterations)
+            print(f"  {name:<26} {us:10.1f} us/frame")
+
+
+if __name__ == '__main__':
+    main()
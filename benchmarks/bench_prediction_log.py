@@ -0,0 +1,142 @@
+"""종합 판정 로그: 건별 open/append/close (기존 save_comprehensive_log) vs PredictionLogWriter
+
+같은 판정 결과로 두 방식의 건당 기록 비용을 비교하고 (평문, gzip, flush마다 fsync),
+기록된 줄이 기존 방식과 같은지(타임스탬프 제외), 자정 rollover 후 날짜별 파일과 gzip member를
+모두 읽을 수 있는지, fork된 카메라 프로세스 여러 개가 같은 일자 파일에 쓴 줄을 빠짐없이 읽을 수 있는지
+확인한다. 다르면 종료 코드 1.
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_prediction_log [--records 20000]
+"""
+import os
+import sys
+import glob
+import gzip
+import json
+import zlib
+import time
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+import ev_detect
+from ev_src.utils.prediction_log import PredictionLogWriter
+from benchmarks.synthetic_env import make_plate_info
+
+CONFIG = {'processing': {'confidence_threshold': 0.45}}
+
+
+def make_detection_result(index):
+    return {'ev': index % 3 == 0, 'conf': {'ev': (index % 100) / 100.0},
+            'metrics': {'model_used': 'xgb' if index % 4 else 'lgbm'}, 'elapsed': 0.0012}
+
+
+def timed_us(write, records):
+    plate_info = make_plate_info()
+    results = [make_detection_result(index) for index in range(records)]
+    start = time.perf_counter()
+    for result in results:
+        write(plate_info, result)
+    return (time.perf_counter() - start) / records * 1e6
+
+
+def read_lines(base_dir):
+    lines = []
+    for path in sorted(glob.glob(os.path.join(base_dir, '*', 'predictions.jsonl*'))):
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            lines.extend(json.loads(line) for line in f)
+    return lines
+
+
+def without_timestamp(entries):
+    return [{key: value for key, value in entry.items() if key != 'timestamp'} for entry in entries]
+
+
+def check_rollover(workdir, compress):
+    """23:59:58부터 1초 간격 4건 → 이틀치 파일에 2건씩"""
+    clock_now = [datetime(2025, 4, 18, 23, 59, 58)]
+    writer = PredictionLogWriter(workdir, compress=compress, clock=lambda: clock_now[0])
+    for index in range(4):
+        writer.write({'index': index})
+        clock_now[0] += timedelta(seconds=1)
+    writer.close()
+    counts = {}
+    for path in glob.glob(os.path.join(workdir, '*', '*')):
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            counts[os.path.basename(os.path.dirname(path))] = sum(1 for _ in f)
+    return counts == {'20250418': 2, '20250419': 2}, writer.stats()['rollovers']
+
+
+def check_forked_writers(workdir, compress, processes=4, records=2000):
+    """프로세스마다 writer를 열어 같은 일자 파일에 기록 (작은 flush_bytes로 flush를 자주 섞음)"""
+    children = []
+    for worker in range(processes):
+        pid = os.fork()
+        if pid == 0:
+            writer = PredictionLogWriter(workdir, flush_bytes=512, compress=compress)
+            for index in range(records):
+                writer.write({'worker': worker, 'index': index})
+            writer.close()
+            os._exit(0)
+        children.append(pid)
+    for pid in children:
+        os.waitpid(pid, 0)
+    try:
+        entries = read_lines(workdir)
+    except (OSError, EOFError, ValueError, zlib.error) as e:    # 깨진 gzip member/json 줄
+        return False, f"unreadable: {e}"
+    seen = {(entry['worker'], entry['index']) for entry in entries}
+    ok = len(entries) == len(seen) == processes * records
+    return ok, f"{len(seen)}/{processes * records} lines"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=20000)
+    args = parser.parse_args()
+
+    ok = True
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        legacy_dir = os.path.join(workdir, 'legacy')
+        config = dict(CONFIG, paths={'comprehensive_log_base_dir': legacy_dir})
+        rows.append(('per-record open/close', timed_us(
+            lambda plate_info, result: ev_detect.save_comprehensive_log(config, plate_info, result), args.records)))
+        expected = without_timestamp(read_lines(legacy_dir))
+
+        for name, options in [('writer', {}), ('writer gzip', {'compress': True}),
+                              ('writer fsync/flush', {'fsync_interval': 0})]:
+            base_dir = os.path.join(workdir, name.replace(' ', '_').replace('/', '_'))
+            writer = PredictionLogWriter(base_dir, **options)
+            rows.append((name, timed_us(
+                lambda plate_info, result: ev_detect.save_comprehensive_log(config, plate_info, result, writer),
+                args.records)))
+            writer.close()
+            same = without_timestamp(read_lines(base_dir)) == expected
+            ok &= same
+            stats = writer.stats()
+            rows[-1] += (f"identical lines: {same}, flushes={stats['flushes']}, fsyncs={stats['fsyncs']}, "
+                         f"file={os.path.getsize(glob.glob(os.path.join(base_dir, '*', '*'))[0]) / 1024:.0f} KiB",)
+
+    print(f"{args.records} comprehensive log records (us/record):")
+    for row in rows:
+        print(f"  {row[0]:<22} {row[1]:8.2f}  " + (row[2] if len(row) > 2 else ''))
+    for compress in (False, True):
+        with tempfile.TemporaryDirectory() as workdir:
+            rolled, rollovers = check_rollover(workdir, compress)
+            ok &= rolled
+            print(f"midnight rollover ({'gzip' if compress else 'plain'}): 2 + 2 lines in two daily files: {rolled} "
+                  f"(rollovers={rollovers})")
+        with tempfile.TemporaryDirectory() as workdir:
+            readable, detail = check_forked_writers(workdir, compress)
+            ok &= readable
+            print(f"4 forked writers, one daily file ({'gzip' if compress else 'plain'}): all lines readable: "
+                  f"{readable} ({detail})")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+"""판정 결과 직렬화: 기존 dict 생성 + convert_numpy_types + json.dumps vs __slots__ 레코드 to_json_bytes()
+
+판정 결과(process_realtime_data 반환값), 종합 판정 로그 1줄, 불확실 케이스 JSON, save_results 배열에 대해
+레코드 1건당 생성+직렬화 비용(us)과 객체 크기를 비교한다 ('+ numpy walk'는 ev_detect0415처럼
+convert_numpy_types를 거친 경우). 레코드 출력이 기존 dict를 json.dumps 한
+바이트와 다르거나(케이스 JSON/save_results는 json.loads 결과 비교), dict 방식 조회 결과가 다르면 종료 코드 1.
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_records [--records 20000]
+"""
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from datetime import datetime
+import numpy as np
+
+from ev_src.detector.ev_classifier_0327 import ProcessingMetrics
+from ev_src.detector.ev_detector_0327 import DetectionResult
+from ev_src.detector.records import DetectionRecord, PredictionLogRecord, UncertainCaseRecord
+from benchmarks.synthetic_env import make_plate_info
+
+CONFIDENCE_THRESHOLD = 0.45
+
+
+def convert_numpy_types(obj):
+    """기존 ev_detect.convert_numpy_types (np.float_는 NumPy 2에서 제거되어 np.float64로 대체)"""
+    if isinstance(obj, dict):
+        return {k: convert_numpy_types(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [convert_numpy_types(i) for i in obj]
+    elif isinstance(obj, (np.int_, np.intc, np.intp, np.int8,
+                        np.int16, np.int32, np.int64, np.uint8,
+                        np.uint16, np.uint32, np.uint64)):
+        return int(obj)
+    elif isinstance(obj, (np.float64, np.float16, np.float32)):
+        return float(obj)
+    elif isinstance(obj, (np.ndarray,)):
+        return obj.tolist()
+    elif isinstance(obj, (np.bool_)):
+        return bool(obj)
+    elif isinstance(obj, (np.void)):
+        return None
+    return obj
+
+
+def legacy_detection_result(plate_info, result):
+    """기존 ev_detect.build_detection_result"""
+    return {
+        "area": {
+            "angle": float(plate_info["area"]["angle"]),
+            "height": float(plate_info["area"]["height"]),
+            "width": float(plate_info["area"]["width"]),
+            "x": float(plate_info["area"]["x"]),
+            "y": float(plate_info["area"]["y"])
+        },
+        "attrs": {"ev": bool(result.is_ev)},
+        "conf": {
+            "ocr": float(plate_info["conf"]["ocr"]),
+            "plate": float(plate_info["conf"]["plate"]),
+            "ev": float(result.confidence)
+        },
+        "elapsed": float(result.processing_time),
+        "ev": bool(result.is_ev),
+        "text": str(result.plate_number),
+        "timestamp": result.timestamp.isoformat(),
+        "metrics": {
+            "elapsed_time": float(result.metrics.elapsed_time),
+            "confidence_score": float(result.metrics.confidence_score),
+            "model_used": str(result.metrics.model_used),
+            "error_occurred": bool(result.metrics.error_occurred),
+            "error_message": str(result.metrics.error_message)
+        }
+    }
+
+
+def legacy_log_entry(timestamp, plate_info, detection_result):
+    """기존 save_comprehensive_log의 log_entry"""
+    return {
+        'timestamp': timestamp,
+        'plate_number': plate_info.get('text', ''),
+        'ts_ev_prediction': plate_info.get('attrs', {}).get('ev'),
+        'my_model_ev_prediction': detection_result.get('ev'),
+        'my_model_confidence': detection_result.get('conf', {}).get('ev'),
+        'model_used': detection_result.get('metrics', {}).get('model_used'),
+        'processing_time': detection_result.get('elapsed'),
+        'saved_in_uncertain': detection_result.get('conf', {}).get('ev', 0) < CONFIDENCE_THRESHOLD
+    }
+
+
+def record_log_entry(timestamp, plate_info, record):
+    return PredictionLogRecord(timestamp, plate_info.get('text', ''), plate_info.get('attrs', {}).get('ev'),
+                               record.ev, record.conf_ev, record.model_used, record.elapsed,
+                               record.conf_ev < CONFIDENCE_THRESHOLD)
+
+
+def legacy_save_results_item(r):
+    """기존 EVDetector.save_results의 항목"""
+    return {
+        'plate_number': r.plate_number, 'is_ev': r.is_ev, 'confidence': r.confidence,
+        'processing_time': r.processing_time, 'timestamp': r.timestamp.isoformat(), 'plate_area': r.plate_area,
+        'metrics': {'elapsed_time': r.metrics.elapsed_time, 'confidence_score': r.metrics.confidence_score,
+                    'model_used': r.metrics.model_used, 'error_occurred': r.metrics.error_occurred,
+                    'error_message': r.metrics.error_message}
+    }
+
+
+def make_inputs(count):
+    """EVDetector._detect와 같은 형태의 판정 결과 (신뢰도는 float32 확률을 float로 변환한 값)"""
+    rng = np.random.default_rng(0)
+    inputs = []
+    for index in range(count):
+        plate_info = make_plate_info(x=int(rng.integers(0, 1800)), angle=float(rng.normal(0, 5)),
+                                     text=f'{index % 100:02d}너{1000 + index % 9000}')
+        confidence = rng.random(dtype=np.float32)
+        metrics = ProcessingMetrics(elapsed_time=float(rng.random() / 100), confidence_score=float(confidence),
+                                    model_used='xgb' if index % 4 else 'lgbm')
+        inputs.append((plate_info, DetectionResult(
+            plate_number=plate_info['text'], is_ev=bool(confidence > 0.5), confidence=metrics.confidence_score,
+            timestamp=datetime.now(), processing_time=metrics.elapsed_time, plate_area=plate_info['area'],
+            metrics=metrics)))
+    return inputs
+
+
+def per_record_us(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(*item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def retained_bytes(build, items):
+    """build로 만든 결과를 모두 보관할 때 건당 메모리"""
+    tracemalloc.start()
+    kept = [build(*item) for item in items]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size / len(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=20000)
+    args = parser.parse_args()
+
+    inputs = make_inputs(args.records)
+    timestamp = datetime.now().isoformat()
+    ok = True
+
+    # 출력 동일성 (판정 결과/종합 로그는 바이트 단위, 케이스/save_results는 JSON 값 비교)
+    for plate_info, result in inputs:
+        legacy = legacy_detection_result(plate_info, result)
+        record = DetectionRecord(plate_info, result)
+        ok &= record.to_json_bytes() == json.dumps(legacy, ensure_ascii=False).encode('utf-8')
+        ok &= record == legacy and record['conf']['ev'] == legacy['conf']['ev'] and record.get('x') is None
+        ok &= (record_log_entry(timestamp, plate_info, record).to_json_bytes()
+               == json.dumps(legacy_log_entry(timestamp, plate_info, legacy), ensure_ascii=False).encode('utf-8'))
+        case = UncertainCaseRecord(timestamp, plate_info, record, '/tmp/case.jpg')
+        ok &= json.loads(case.to_json_bytes()) == {'timestamp': timestamp, 'input_plate_info': plate_info,
+                                                   'detection_result': legacy, 'image_path': '/tmp/case.jpg',
+                                                   'metrics': legacy['metrics']}
+        ok &= json.loads(result.to_json_bytes()) == convert_numpy_types(legacy_save_results_item(result))
+    nan_metrics = ProcessingMetrics(float('nan'), float('inf'), 'xgb', True, '오류 "따옴표"\n')
+    ok &= nan_metrics.to_json_str() == json.dumps({'elapsed_time': float('nan'), 'confidence_score': float('inf'),
+                                                   'model_used': 'xgb', 'error_occurred': True,
+                                                   'error_message': '오류 "따옴표"\n'}, ensure_ascii=False)
+    print(f"{args.records} records: outputs identical to legacy json.dumps: {ok}")
+
+    rows = [
+        ('detection result',
+         lambda plate_info, result: json.dumps(legacy_detection_result(plate_info, result),
+                                               ensure_ascii=False).encode('utf-8'),
+         lambda plate_info, result: DetectionRecord(plate_info, result).to_json_bytes()),
+        ('  + numpy walk',
+         lambda plate_info, result: json.dumps(convert_numpy_types(legacy_detection_result(plate_info, result)),
+                                               ensure_ascii=False).encode('utf-8'),
+         lambda plate_info, result: DetectionRecord(plate_info, result).to_json_bytes()),
+        ('prediction log line',
+         lambda plate_info, result: json.dumps(legacy_log_entry(timestamp, plate_info,
+                                                                legacy_detection_result(plate_info, result)),
+                                               ensure_ascii=False).encode('utf-8'),
+         lambda plate_info, result: record_log_entry(timestamp, plate_info,
+                                                     DetectionRecord(plate_info, result)).to_json_bytes()),
+        ('uncertain case JSON',
+         lambda plate_info, result: json.dumps(
+             {'timestamp': timestamp, 'input_plate_info': plate_info,
+              'detection_result': (legacy := legacy_detection_result(plate_info, result)),
+              'image_path': None, 'metrics': legacy['metrics']}, indent=2, ensure_ascii=False).encode('utf-8'),
+         lambda plate_info, result: UncertainCaseRecord(timestamp, plate_info,
+                                                        DetectionRecord(plate_info, result)).to_json_bytes()),
+        ('save_results item',
+         lambda plate_info, result: json.dumps(legacy_save_results_item(result), indent=4,
+                                               ensure_ascii=False).encode('utf-8'),
+         lambda plate_info, result: result.to_json_bytes()),
+    ]
+    print("build + serialize, us/record:")
+    for name, legacy_fn, record_fn in rows:
+        legacy_us = per_record_us(legacy_fn, inputs)
+        record_us = per_record_us(record_fn, inputs)
+        print(f"  {name:<20} legacy {legacy_us:6.2f}  record {record_us:6.2f}  ({legacy_us / record_us:.1f}x)")
+
+    legacy_size = retained_bytes(legacy_detection_result, inputs)
+    record_size = retained_bytes(DetectionRecord, inputs)
+    print(f"retained detection result: dict {legacy_size:.0f} B/record, DetectionRecord {record_size:.0f} B/record")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""판정 캐시 효과: 같은 차량 재확정(박스 흔들림 + 밝기 노이즈) 스트림에서 적중률, 적중/미스 지연, 판정 일치율
+
+stand-in 모델로 EVDetector를 캐시 없이/있이 만들어 같은 스트림을 처리한다. 캐시 적중 결과의
+EV 판정이 새로 분류한 결과와 다른 비율을 모델 자체 변동(캐시 없이 재확정끼리 다른 비율)과 함께
+보고하고, 같은 텍스트의 다른 색 번호판이 적중하면 종료 코드 1.
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_result_cache [--vehicles 50] [--repeats 4]
+"""
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import cv2
+import numpy as np
+
+from ev_src.detector.ev_detector_0327 import EVDetector
+from ev_src.detector.result_cache import DetectionCache
+from benchmarks.synthetic_env import make_plate_info, train_stand_in_models
+
+
+PLATE_BOX = (612, 447, 111, 60)
+EV_PLATE_BGR = (200, 120, 40)      # 전기차 번호판 (청색 바탕)
+ICE_PLATE_BGR = (235, 235, 235)
+
+
+def draw_vehicle(text, plate_bgr, seed):
+    """매끈한 차체 색 배경 위에 번호판(바탕색 + 검은 글자) 그리기"""
+    rng = np.random.default_rng(seed)
+    frame = np.empty((1080, 1920, 3), dtype=np.uint8)
+    frame[:] = rng.integers(30, 200, size=3, dtype=np.uint8)
+    x, y, w, h = PLATE_BOX
+    frame[y:y + h, x:x + w] = plate_bgr
+    cv2.putText(frame, text, (x + 4, y + 42), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (20, 20, 20), 2)
+    return frame
+
+
+def make_stream(vehicles, repeats, seed=0):
+    """(frame, plate_info) 스트림: 차량마다 repeats번 재확정, 매번 박스 ±3px 이동 + 센서 노이즈 + 밝기 ±10"""
+    rng = np.random.default_rng(seed)
+    texts = [f'{vehicle:02d}가{1000 + vehicle}' for vehicle in range(vehicles)]
+    base_frames = [draw_vehicle(f'{vehicle:02d}A{1000 + vehicle}',
+                                EV_PLATE_BGR if vehicle % 2 == 0 else ICE_PLATE_BGR, seed + vehicle)
+                   for vehicle in range(vehicles)]
+    stream = []
+    for repeat in range(repeats):
+        for vehicle, base in enumerate(base_frames):
+            noise = rng.integers(-6, 7, size=base.shape, dtype=np.int16) + int(rng.integers(-10, 11))
+            frame = np.clip(base.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+            dx, dy = rng.integers(-3, 4, size=2)
+            plate_info = make_plate_info(x=PLATE_BOX[0] + int(dx), y=PLATE_BOX[1] + int(dy), text=texts[vehicle])
+            stream.append((frame, plate_info))
+    return stream
+
+
+def misread_rejected(detector) -> bool:
+    """같은 텍스트로 읽힌 다른 색 번호판(오인식/복제 번호판)은 캐시를 재사용하지 않아야 함"""
+    plate_info = make_plate_info(text='99가9999')
+    detector.process_frames(draw_vehicle('99A9999', EV_PLATE_BGR, 1), [plate_info])
+    result, = detector.process_frames(draw_vehicle('99A9999', ICE_PLATE_BGR, 2), [plate_info])
+    return not result.cache_hit
+
+
+def run(detector, stream):
+    latencies, results = [], []
+    for frame, plate_info in stream:
+        start = time.perf_counter()
+        result, = detector.process_frames(frame, [plate_info])
+        latencies.append((time.perf_counter() - start) * 1e6)
+        results.append(result)
+    return np.array(latencies), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vehicles', type=int, default=50)
+    parser.add_argument('--repeats', type=int, default=4)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)   # process_frames의 plate_info INFO 로그 숨김
+
+    stream = make_stream(args.vehicles, args.repeats)
+    with tempfile.TemporaryDirectory() as workdir:
+        xgb_path, lgbm_path = train_stand_in_models(workdir)
+        plain = EVDetector(xgb_path, lgbm_path)
+        cache = DetectionCache()
+        cached = EVDetector(xgb_path, lgbm_path, cache=cache)
+        run(plain, stream[:5])      # 첫 호출 지연 제외
+        plain_latency, plain_results = run(plain, stream)
+        cached_latency, cached_results = run(cached, stream)
+        rejected = misread_rejected(cached)
+
+    hits = np.array([result.cache_hit for result in cached_results])
+    disagree = sum(a.is_ev != b.is_ev for a, b, hit in zip(plain_results, cached_results, hits) if hit)
+    stats = cache.stats()
+    print(f"stream: {len(stream)} confirmations ({args.vehicles} vehicles x {args.repeats})")
+    print(f"cache: hits={stats['hits']} misses={stats['misses']} hit_rate={stats['hit_rate']:.2%} "
+          f"entries={stats['entries']}")
+    print(f"latency p50 (us): no_cache={np.median(plain_latency):.1f}, "
+          f"cache_miss={np.median(cached_latency[~hits]):.1f}, cache_hit={np.median(cached_latency[hits]):.1f}")
+    print(f"mean latency (us): no_cache={plain_latency.mean():.1f}, cache={cached_latency.mean():.1f}")
+    # 기준선: 캐시 없이도 같은 차량의 재확정끼리 판정이 바뀌는 비율 (박스 흔들림/노이즈에 대한 모델 자체 변동)
+    first = {result.plate_number: result.is_ev for result in plain_results[:args.vehicles]}
+    flips = sum(result.is_ev != first[result.plate_number] for result in plain_results[args.vehicles:])
+    print(f"hit results disagreeing with fresh classification: {disagree}/{int(hits.sum())} "
+          f"(baseline, fresh re-confirmations disagreeing with the first: {flips}/{len(stream) - args.vehicles})")
+    print(f"same text, different plate color -> cache miss: {rejected}")
+    if not rejected:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""ev_src 전처리/추론 단계별 벤치마크 (커밋 간 회귀 비교용 JSON 출력)
+
+합성 히스토그램으로 학습한 stand-in XGBoost/LightGBM 모델과 합성 프레임, 크기/각도/경계 클램핑이 다른
+plate_info 박스로 validate_plate_info, preprocess_image(FusedPreprocessor), extract_features,
+모델 단계(원본/컴파일된 트리), predict_batch, EVDetector 전체 판정을 각각 측정한다.
+
+단계/케이스별로 호출당 지연 p50/p95/p99/mean(us)과 tracemalloc 기준 호출당 할당량(호출 중 최대 추가
+메모리, 호출 후 남은 메모리 bytes)을 --output JSON에 기록하고, --compare로 다른 커밋의 결과 파일과
+p50을 비교한다. 단계를 이어 붙인 결과와 전체 판정 결과가 다르거나 컴파일된 트리 오차가 크면 종료 코드 1,
+--fail-on-regression이면 p50이 --threshold 이상 느려진 항목이 있을 때도 종료 코드 1.
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_stages [--iterations 300] [--filter preprocess] [--output out.json]
+    python -m benchmarks.bench_stages --compare bench_stages_<이전 커밋>.json [--fail-on-regression]
+"""
+import os
+import gc
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+from datetime import datetime
+import cv2
+import joblib
+import numpy as np
+
+from ev_src.detector.compiled_trees import compile_model, max_probability_error
+from ev_src.detector.ev_classifier_0327 import EVClassifier
+from ev_src.detector.ev_detector_0327 import EVDetector
+from ev_src.utils.image_processing import (preprocess_image, FusedPreprocessor, extract_features,
+                                          validate_plate_info, FEATURE_DIM)
+from benchmarks.synthetic_env import (make_synthetic_features, train_stand_in_models, make_synthetic_frame,
+                                      make_plate_info)
+
+# (케이스, x, y, width, height, angle): 1920x1080 프레임 기준
+PLATE_CASES = [
+    ('small', 820, 600, 40, 22, 0.0),
+    ('typical', 612, 447, 111, 60, 8.0732),
+    ('large_rotated', 300, 200, 400, 220, -20.0),
+    ('clamped_bottom_right', 1850, 1050, 111, 60, -5.0),
+    ('clamped_negative_origin', -30, -12, 111, 60, 3.0),
+]
+BATCH_PLATES = 4
+TOLERANCE = 1e-5
+
+
+def plate_infos():
+    return {name: make_plate_info(x=x, y=y, width=width, height=height, angle=angle, text=f'{index:02d}가1234')
+            for index, (name, x, y, width, height, angle) in enumerate(PLATE_CASES)}
+
+
+def crop_args(plate_info):
+    area = plate_info['area']
+    return (area['x'], area['y'], area['width'], area['height']), area['angle']
+
+
+def git_revision():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment():
+    import xgboost
+    import lightgbm
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'xgboost': xgboost.__version__,
+        'lightgbm': lightgbm.__version__,
+    }
+
+
+def time_calls_us(fn, iterations, warmup):
+    """호출 1회씩 측정한 지연 시간 배열 (us)"""
+    for _ in range(warmup):
+        fn()
+    gc.collect()
+    samples = np.empty(iterations)
+    for index in range(iterations):
+        start = time.perf_counter_ns()
+        fn()
+        samples[index] = time.perf_counter_ns() - start
+    return samples / 1e3
+
+
+def allocations_per_call(fn, calls):
+    """(호출 중 추가로 잡힌 최대 메모리 중앙값, 호출 후 남은 메모리 평균) bytes (tracemalloc 추적 대상만)"""
+    fn()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        peaks = [0] * calls     # 측정 중 리스트가 늘어나는 할당이 retained에 섞이지 않도록 미리 할당
+        for index in range(calls):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            result = fn()
+            peaks[index] = tracemalloc.get_traced_memory()[1] - before
+            del result
+        retained = (tracemalloc.get_traced_memory()[0] - baseline) / calls
+    finally:
+        tracemalloc.stop()
+    return int(np.median(peaks)), retained
+
+
+class StageSuite:
+    """stand-in 모델/입력을 준비하고 (단계, 케이스, 함수) 목록을 만든다"""
+
+    def __init__(self, workdir):
+        logging.disable(logging.WARNING)    # 클램핑 케이스 등 단계 내부 로그 제외
+        self.frame = make_synthetic_frame()
+        self.plates = plate_infos()
+        self.batch = [self.plates[name] for name, *_ in PLATE_CASES[:BATCH_PLATES]]
+
+        xgb_path, lgbm_path = train_stand_in_models(os.path.join(workdir, 'models'))
+        self.xgb = joblib.load(xgb_path)
+        self.lgbm = joblib.load(lgbm_path)
+        compiled_paths = []
+        for model, path in ((self.xgb, xgb_path), (self.lgbm, lgbm_path)):
+            compiled_path = os.path.splitext(path)[0] + '.npz'
+            compile_model(model).save(compiled_path)
+            compiled_paths.append(compiled_path)
+        self.detector = EVDetector(xgb_path, lgbm_path)
+        self.detector_optimized = EVDetector(*compiled_paths, fused_preprocess=True)
+        self.classifier: EVClassifier = self.detector.classifier
+        self.compiled_xgb = self.detector_optimized.classifier.xgb_model
+        self.compiled_lgbm = self.detector_optimized.classifier.lgbm_model
+        self.fused = FusedPreprocessor()
+
+    def stages(self):
+        frame = self.frame
+        cases = []
+        list_area = dict(self.plates['typical'], area=[612, 447, 111, 60])
+        cases.append(('validate_plate_info', 'dict_area', lambda: validate_plate_info(self.plates['typical'])))
+        cases.append(('validate_plate_info', 'list_area', lambda: validate_plate_info(list_area)))
+
+        for name, plate_info in self.plates.items():
+            box, angle = crop_args(plate_info)
+            cases.append(('preprocess_image', name, lambda box=box, angle=angle: preprocess_image(frame, box, angle)))
+        for name, plate_info in self.plates.items():
+            box, angle = crop_args(plate_info)
+            cases.append(('fused_preprocess', name, lambda box=box, angle=angle: self.fused(frame, box, angle)))
+
+        hsv = preprocess_image(frame, *crop_args(self.plates['typical']))
+        out = np.empty(FEATURE_DIM, dtype=np.float32)
+        cases.append(('extract_features', 'typical', lambda: extract_features(hsv)))
+        cases.append(('extract_features', 'typical_out_buffer', lambda: extract_features(hsv, out)))
+
+        features = np.stack([extract_features(preprocess_image(frame, *crop_args(p))) for p in self.batch])
+        for rows in (1, BATCH_PLATES):
+            X = features[:rows]
+            case = f'{rows}_rows'
+            cases.append(('xgb_predict_proba', case, lambda X=X: self.classifier._predict_positive(self.xgb, X)))
+            cases.append(('lgbm_predict_proba', case, lambda X=X: self.classifier._predict_positive(self.lgbm, X)))
+            cases.append(('xgb_compiled', case, lambda X=X: self.classifier._predict_positive(self.compiled_xgb, X)))
+            cases.append(('lgbm_compiled', case,
+                          lambda X=X: self.classifier._predict_positive(self.compiled_lgbm, X)))
+
+        typical = [self.plates['typical']]
+        cases.append(('predict_batch', '1_plate', lambda: self.classifier.predict_batch(frame, typical)))
+        cases.append(('predict_batch', f'{BATCH_PLATES}_plates',
+                      lambda: self.classifier.predict_batch(frame, self.batch)))
+
+        for name in ('typical', 'clamped_bottom_right'):
+            plate_info = self.plates[name]
+            cases.append(('detector_process_frame', name, lambda p=plate_info: self.detector.process_frame(frame, p)))
+        cases.append(('detector_process_frames', f'{BATCH_PLATES}_plates',
+                      lambda: self.detector.process_frames(frame, self.batch)))
+        cases.append(('detector_optimized_process_frames', f'{BATCH_PLATES}_plates',
+                      lambda: self.detector_optimized.process_frames(frame, self.batch)))
+        return cases
+
+    def check(self):
+        """단계를 직접 이어 붙인 예측 == EVDetector 판정, 컴파일된 트리 오차, 경계 밖 박스 예외"""
+        problems = []
+        threshold = self.classifier.confidence_threshold
+        for name, plate_info in self.plates.items():
+            row = extract_features(preprocess_image(self.frame, *crop_args(plate_info)))[None, :]
+            xgb_probability = float(self.xgb.predict_proba(row)[0, 1])
+            model = self.xgb if xgb_probability >= threshold else self.lgbm
+            expected = bool(model.predict(row)[0])
+            result = self.detector.process_frame(self.frame, plate_info)
+            if result.is_ev != expected or abs(result.confidence - xgb_probability) > 1e-6:
+                problems.append(f"{name}: detector {result.is_ev}/{result.confidence:.6f}, "
+                                f"stages {expected}/{xgb_probability:.6f}")
+        X, _ = make_synthetic_features(500, seed=1)
+        for label, model, forest in (('xgb', self.xgb, self.compiled_xgb), ('lgbm', self.lgbm, self.compiled_lgbm)):
+            error = max_probability_error(model, forest, X)
+            if error > TOLERANCE:
+                problems.append(f"compiled {label}: max |dp| {error:.2e}")
+        logging.disable(logging.CRITICAL)   # 예상된 전처리 오류 로그 제외
+        for preprocess in (preprocess_image, self.fused):
+            try:
+                preprocess(self.frame, (5000, 10, 100, 50), 5.0)
+                problems.append(f"{getattr(preprocess, '__name__', 'fused')}: box outside frame did not raise")
+            except ValueError:
+                pass
+        logging.disable(logging.WARNING)
+        return problems
+
+
+def run(suite, iterations, warmup, alloc_calls, name_filter):
+    results = []
+    for stage, case, fn in suite.stages():
+        if name_filter and name_filter not in f'{stage}/{case}':
+            continue
+        samples = time_calls_us(fn, iterations, warmup)
+        peak, retained = allocations_per_call(fn, alloc_calls)
+        results.append({
+            'stage': stage, 'case': case, 'calls': iterations,
+            'p50_us': float(np.percentile(samples, 50)), 'p95_us': float(np.percentile(samples, 95)),
+            'p99_us': float(np.percentile(samples, 99)), 'mean_us': float(samples.mean()),
+            'alloc_peak_bytes': peak, 'alloc_retained_bytes': retained,
+        })
+        row = results[-1]
+        print(f"  {stage + '/' + case:<50} p50={row['p50_us']:9.1f} p95={row['p95_us']:9.1f} "
+              f"p99={row['p99_us']:9.1f}  alloc={peak / 1024:8.1f} KiB  retained={retained:8.0f} B")
+    return results
+
+
+def compare(results, baseline_path, threshold):
+    """기준 파일 대비 p50 비율, threshold 이상 느려진 항목 목록 반환"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    base = {(row['stage'], row['case']): row for row in baseline['results']}
+    regressions = []
+    print(f"compared with {baseline_path} (revision {baseline.get('revision')}), p50 new/base:")
+    for row in results:
+        key = (row['stage'], row['case'])
+        if key not in base:
+            continue
+        ratio = row['p50_us'] / base[key]['p50_us']
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            flag = '  REGRESSION'
+        print(f"  {key[0] + '/' + key[1]:<50} {base[key]['p50_us']:9.1f} -> {row['p50_us']:9.1f} us "
+              f"({ratio:5.2f}x){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--alloc-calls', type=int, default=20, help='할당량 측정 호출 수 (tracemalloc)')
+    parser.add_argument('--filter', default=None, help='"단계/케이스"에 이 문자열이 포함된 항목만 측정')
+    parser.add_argument('--output', default=None, help='결과 JSON 경로 (기본: bench_stages_<커밋>.json)')
+    parser.add_argument('--compare', default=None, help='비교할 이전 결과 JSON')
+    parser.add_argument('--threshold', type=float, default=0.10, help='회귀로 볼 p50 증가 비율')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    revision = git_revision()
+    with tempfile.TemporaryDirectory() as workdir:
+        suite = StageSuite(workdir)
+        problems = suite.check()
+        for problem in problems:
+            print(f"CHECK FAILED: {problem}")
+        print(f"revision {revision}, {args.iterations} calls per stage (us):")
+        results = run(suite, args.iterations, args.warmup, args.alloc_calls, args.filter)
+
+    output = args.output or f"bench_stages_{revision or 'unknown'}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'revision': revision, 'created': datetime.now().isoformat(), 'environment': environment(),
+                   'iterations': args.iterations, 'plate_cases': PLATE_CASES, 'checks_passed': not problems,
+                   'results': results}, f, indent=2, ensure_ascii=False)
+    print(f"results written to {output}")
+
+    regressions = compare(results, args.compare, args.threshold) if args.compare else []
+    if problems or (args.fail_on_regression and regressions):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""벤치마크용 합성 환경 (stand-in 모델 + 설정 파일 + 합성 프레임/plate_info)
+
+실제 ev_config/모델 파일이 없는 개발 머신에서도 ev_src 파이프라인을
+측정할 수 있도록 작은 XGBoost/LightGBM 모델을 합성 히스토그램으로 학습해
+임시 디렉토리에 저장하고, 그 경로를 가리키는 yaml 설정을 만든다.
+"""
+import os
+import yaml
+import joblib
+import numpy as np
+
+FEATURE_DIM = 768
+
+
+def make_synthetic_features(n: int, seed: int = 0):
+    """합성 HSV 히스토그램 특징과 라벨 생성 (EV: 청색 계열 H 빈에 질량 집중)"""
+    rng = np.random.default_rng(seed)
+    X = rng.gamma(1.0, 20.0, size=(n, FEATURE_DIM)).astype(np.float32)
+    y = rng.integers(0, 2, size=n)
+    X[y == 1, 100:130] += rng.gamma(4.0, 40.0, size=(int(y.sum()), 30))
+    return X, y
+
+
+def train_stand_in_models(out_dir: str, n_estimators: int = 50, seed: int = 0):
+    """작은 XGBoost/LightGBM 분류기를 학습해 joblib으로 저장, (xgb_path, lgbm_path) 반환"""
+    from xgboost import XGBClassifier
+    from lightgbm import LGBMClassifier
+
+    X, y = make_synthetic_features(2000, seed)
+    xgb = XGBClassifier(n_estimators=n_estimators, max_depth=4, n_jobs=1)
+    xgb.fit(X, y)
+    lgbm = LGBMClassifier(n_estimators=n_estimators, num_leaves=15, n_jobs=1, verbose=-1)
+    lgbm.fit(X, y)
+
+    os.makedirs(out_dir, exist_ok=True)
+    xgb_path = os.path.join(out_dir, 'xgb_model.pkl')
+    lgbm_path = os.path.join(out_dir, 'lgbm_model.pkl')
+    joblib.dump(xgb, xgb_path)
+    joblib.dump(lgbm, lgbm_path)
+    return xgb_path, lgbm_path
+
+
+def make_synthetic_config(out_dir: str, seed: int = 0) -> str:
+    """stand-in 모델과 config_0327.yaml 형식의 설정 파일 생성 후 설정 경로 반환"""
+    xgb_path, lgbm_path = train_stand_in_models(os.path.join(out_dir, 'models'), seed=seed)
+    config = {
+        'model': {'xgb_path': xgb_path, 'lgbm_path': lgbm_path},
+        'paths': {
+            'logs_dir': os.path.join(out_dir, 'logs'),
+            'uncertain_cases_dir': os.path.join(out_dir, 'uncertain_cases'),
+            'error_cases_dir': os.path.join(out_dir, 'error_cases'),
+            'comprehensive_log_base_dir': os.path.join(out_dir, 'comprehensive_predictions'),
+        },
+        'logging': {'file_rotation': {'max_bytes': 10485760, 'backup_count': 5}},
+        'processing': {
+            'confidence_threshold': 0.45,
+            'save_options': {
+                'save_uncertain_image': False,
+                'save_error_image': False,
+                'resize_saved_image': False,
+                'saved_image_size': [640, 360],
+            },
+        },
+        'realtime': {
+            'performance': {'max_processing_time': 1.0, 'skip_if_exceeded': False},
+            'error_handling': {'retry_count': 1, 'retry_delay': 0.0},
+        },
+    }
+    config_path = os.path.join(out_dir, 'config_synthetic.yaml')
+    with open(config_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, allow_unicode=True)
+    return config_path
+
+
+def make_synthetic_frame(height: int = 1080, width: int = 1920, seed: int = 0) -> np.ndarray:
+    """합성 BGR 프레임 생성"""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+
+def make_plate_info(x=612, y=447, width=111, height=60, angle=8.0732, text='01너3346') -> dict:
+    """TS ANPR 엔진 출력 형식의 plate_info 생성"""
+    return {
+        'area': {'angle': angle, 'height': height, 'width': width, 'x': x, 'y': y},
+        'attrs': {'ev': True},
+        'conf': {'ocr': 0.926, 'plate': 0.9273},
+        'text': text,
+    }
@@ -1,27 +1,31 @@
 import multiprocessing
-from ctypes import *
 import cv2
-import sys, os, platform
+import sys, os
 import time
 import json
+import queue
+import threading
 import logging  # Added logging module
 import numpy as np
-from collections import deque
-from concurrent.futures import ThreadPoolExecutor
 import pymysql
 import re
 from datetime import datetime
-from ev_detect import ev_detect
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),  # Log to console
-        logging.FileHandler("anpr.log", encoding="utf-8")  # Log to file
-    ]
-)
+from ev_detect import ev_detect_batch, warmup as warmup_ev_detector, shutdown as shutdown_ev_detector
+from ev_src.detector.detector_registry import DEFAULT_CONFIG_PATH as EV_CONFIG_PATH
+from ev_src.utils.logging_config import configure_logging
+from anpr_src.capture.frame_grabber import FrameGrabber
+from anpr_src.capture.motion_gate import create_motion_gate
+from anpr_src.capture.rate_controller import create_rate_controller
+from anpr_src.recognizer.backends import create_backend
+from anpr_src.tracking.plate_vote_tracker import PlateVoteTracker
+from anpr_src.tracking.best_frame import FrameCandidate, create_best_frame_selector, score_plate
+from anpr_src.pipeline.persistence import create_persistence
+from anpr_src.pipeline.entry_journal import EntryEvent, create_entry_journal
+from anpr_src.pipeline.preload import preload_shared_state, process_report, worker_context
+from anpr_src.pipeline.shared_frame_pool import CameraSlots, SlotTask, TASK_RECOGNIZE, TASK_RESULT, TASK_CONFIRM
+
+# Configure logging (콘솔 + anpr.log, 프로세스당 한 번 설치, 파일 I/O는 QueueListener 스레드)
+configure_logging(file_path="anpr.log", fmt='%(asctime)s - %(levelname)s - %(message)s')
 
 # 설정 파일 로드
 config = {}
@@ -29,45 +33,18 @@ def load_config(config_path):
     with open(config_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-# ANPR 라이브러리 경로 설정
-def getLibPath():
-    os_name = platform.system().lower()
-    arch_name = platform.machine().lower()
-    logging.info('os_name=%s, arch_name=%s', os_name, arch_name)
-
-    if os_name == 'windows':
-        if arch_name == 'x86_64' or arch_name == 'amd64':
-            return os.path.join('..', 'bin', 'windows-x86_64', 'tsanpr.dll')
-        elif arch_name == 'x86':
-            return os.path.join('..', 'bin', 'windows-x86', 'tsanpr.dll')
-    elif os_name == 'linux':
-        if arch_name == 'x86_64':
-            return os.path.join('..', 'bin', 'linux-x86_64', 'libtsanpr.so')
-        elif arch_name == 'aarch64':
-            return os.path.join('..', 'bin', 'linux-aarch64', 'libtsanpr.so')
-
-    logging.error('Unsupported target platform')
-    sys.exit(-1)
-
-
 IMG_PATH = '../img/'
-LIB_PATH = getLibPath()
-logging.info('LIB_PATH=%s', LIB_PATH)
-lib = cdll.LoadLibrary(LIB_PATH)
 
-lib.anpr_initialize.argtype = c_char_p
-lib.anpr_initialize.restype = c_char_p
-
-lib.anpr_read_file.argtypes = (c_char_p, c_char_p, c_char_p)
-lib.anpr_read_file.restype = c_char_p
-
-lib.anpr_read_pixels.argtypes = (c_char_p, c_int32, c_int32, c_int32, c_char_p, c_char_p, c_char_p)
-lib.anpr_read_pixels.restype = c_char_p
+# 번호판 인식 백엔드 (libtsanpr / fake / replay), main()에서 config에 따라 생성
+backend = None
 
 # ANPR 라이브러리 초기화
 def initialize():
-    error = lib.anpr_initialize('text')
-    return error.decode('utf8') if error else error
+    global backend
+    if backend is None:
+        backend = create_backend(config)
+    logging.info("Recognizer backend: %s", backend.name)
+    return backend.initialize()
 
 # 차량 번호판 이미지 저장
 def save_image(image_bytes, save_path):
@@ -91,70 +68,43 @@ def get_frame_roi(frame, roi):
         return frame[y1:y2, x1:x2]
     return frame
 
-# 카메라 영상 처리
-def process_camera(rtsp_url):
-
-    # rtsp 스트림에서 캡처 생성
-    capture = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG)
-    capture.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-
-    anpr_option = config['anpr_option']
-    plate_count_deque_size = config['plate_count_deque_size']
-    plate_count_threshold = config['plate_count_threshold']
-    plate_texts = deque(maxlen=plate_count_deque_size)      # 최근 n개의 차량 번호 저장할 deque
-    
-    max_workers = os.cpu_count() or 2  # CPU 코어 수에 따라 동적 설정
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        while True:
-            ret, frame = capture.read()
-
-            # RTSP 스트림이 끊어졌을 경우 재연결
-            if not ret:
-                logging.warning("Stream disconnected. Reconnecting...")
-                capture.release()
-                time.sleep(5)  # 재연결 대기 시간
-                capture = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG)
-                continue
-            
-            # ROI 설정 적용
-            roi = config['roi'].get(rtsp_url, None)
-            frame_roi = get_frame_roi(frame, roi)
-            height, width = frame_roi.shape[:2]
-
-#===============================
-
-
-  #===========================              
-            # 차량 번호판 인식
-            object_result = lib.anpr_read_pixels(bytes(frame_roi), width, height, 0, 'BGR'.encode('utf-8'), 'json'.encode('utf-8'), anpr_option.encode('utf-8'))
-
-            # 번호판 인식 결과가 있을 경우
-            if len(object_result) > 0:
-                object_result_json = json.loads(object_result.decode('utf8'))
-                #logging.info(f"ANPR 결과 (JSON): {object_result_json}") # <-- 바로 이 줄을 추가해 주세요.
-
-            if object_result_json:
-                if 'text' in object_result_json[0]:
-                    # 차량 번호판 텍스트 추출
-                    plate_info = object_result_json[0]
-                    plate_text = plate_info['text']
-                    
-                    # 차량 번호판 패턴과 일치하는지 확인
-                    pattern = r'^(\d{2,3}|[가-힣]{2}\d{1,2})[가-힣]\d{4}$'
-                    if re.match(pattern, plate_text):
-                        powertrainTypeCode = 'ev' if object_result_json[0]['ev'] else 'ice'
-                        plate_texts.append(plate_text)
-
-                        # 최근 n개의 plate_text에서 m번 이상 같은 plate_text가 있는지 확인
-                        if plate_texts.count(plate_text) >= plate_count_threshold and plate_texts.count(plate_text) < plate_count_threshold+1:
-                            logging.info("TS RESULT >> plate number, powerTrainTypeCode :: %s , %s", plate_text, powertrainTypeCode)
-
-                            # ev 판정
-                            ev_detect_result = ev_detect(frame_roi, plate_info)
-                            if ev_detect_result['ev'] is not None:
-                                logging.info("EV DETECT RESULT >> %s", ev_detect_result['ev'])
-                                powertrainTypeCode = 'ev' if ev_detect_result['ev'] else 'ice'
+# 차량 번호판 패턴
+PLATE_PATTERN = re.compile(r'^(\d{2,3}|[가-힣]{2}\d{1,2})[가-힣]\d{4}$')
+
+# 번호판 인식 결과(JSON bytes) 파싱
+def parse_anpr_result(object_result):
+    if object_result and len(object_result) > 0:
+        return json.loads(object_result.decode('utf8'))
+    return []
+
+# 패턴과 일치하는 번호판 정보 선택 (한 프레임의 모든 번호판, 엔진 결과 순서 유지)
+def select_plates(object_result_json):
+    return [plate_info for plate_info in object_result_json or []
+            if 'text' in plate_info and PLATE_PATTERN.match(plate_info['text'])]
+
+# 번호판 투표, 이번 프레임으로 새로 확정된 번호판 목록 반환
+def vote_plates(vote_tracker, plate_infos, now):
+    confirmed = []
+    for plate_info in plate_infos:
+        track = vote_tracker.add(plate_info['text'], now)
+        if track is not None:
+            logging.info("TS RESULT >> [track %d] plate number, powerTrainTypeCode :: %s , %s",
+                         track.track_id, plate_info['text'], 'ev' if plate_info['ev'] else 'ice')
+            confirmed.append(plate_info)
+    return confirmed
+
+# 확정된 번호판 처리 (한 프레임에서 새로 확정된 번호판들을 EV 일괄 판정 후 차량 이미지/결과 JSON 저장 요청)
+# journal: 입차 이벤트 저널 (설정 시 차량 이미지 기록이 끝나면 verify_entry용 이벤트 추가)
+def handle_confirmed_plates(frame, frame_roi, plate_infos, object_result_json, persistence, journal=None):
+    # ev 판정 (번호판 여러 개를 한 번에)
+    ev_detect_results = ev_detect_batch(frame_roi, plate_infos, config.get('ev_config_path', EV_CONFIG_PATH))
+
+    for plate_info, ev_detect_result in zip(plate_infos, ev_detect_results):
+        plate_text = plate_info['text']
+        powertrainTypeCode = 'ev' if plate_info['ev'] else 'ice'
+        if ev_detect_result and ev_detect_result['ev'] is not None:
+            logging.info("EV DETECT RESULT >> %s, %s", plate_text, ev_detect_result['ev'])
+            powertrainTypeCode = 'ev' if ev_detect_result['ev'] else 'ice'
 
 #========================================
 			     # plate_info 
@@ -169,49 +119,322 @@ def process_camera(rtsp_url):
 
 
 #=========================================
-                            # 차량 후면 이미지 저장
-                            temp_car_image_save_path = config['temp_car_image_save_path']
-                            current_time = time.strftime('%Y%m%d_%H%M%S')
-                            current_date = time.strftime('%Y%m%d')
-                            img_save_path = os.path.join(temp_car_image_save_path, f'{plate_text}_{powertrainTypeCode}_{current_time}.jpg')
-                            ret, buffer = cv2.imencode('.jpg', frame)
-                            if ret:
-                                image_bytes = buffer.tobytes()
-                                executor.submit(save_image, image_bytes, img_save_path)
+        # 차량 후면 이미지 저장
+        temp_car_image_save_path = config['temp_car_image_save_path']
+        entry_time = datetime.now()
+        current_time = entry_time.strftime('%Y%m%d_%H%M%S')
+        current_date = entry_time.strftime('%Y%m%d')
+        img_save_path = os.path.join(temp_car_image_save_path, f'{plate_text}_{powertrainTypeCode}_{current_time}.jpg')
+        on_written = None
+        if journal is not None:
+            # 이미지 파일이 생긴 뒤에 이벤트를 기록해야 verify_entry가 없는 파일을 처리하지 않음
+            event = EntryEvent(plate_text, powertrainTypeCode, entry_time, os.path.basename(img_save_path))
+            on_written = lambda _path, event=event: journal.append(event)
+        persistence.save_image(frame, img_save_path, on_written)     # JPEG 인코딩/쓰기는 writer 스레드에서 처리
 #----------------------------------------------------------------------------------
 # 크롭 영역 표시된 차량 후면 이미지 저장
-#                            if object_result_json and len(object_result_json) > 0 and 'area' in object_result_json[0]:
-#                                plate_info = object_result_json[0]
-#                                x = int(plate_info['area']['x'])
-#                                y = int(plate_info['area']['y'])
-#                                width = int(plate_info['area']['width'])
-#                                height = int(plate_info['area']['height'])##
-
-#                                frame_with_roi = frame.copy() # 원본 프레임 복사
-#                                cv2.rectangle(frame_with_roi, (x, y), (x + width, y - height), (0, 255, 0), 2) # 녹색 사각형
+#        if object_result_json and len(object_result_json) > 0 and 'area' in object_result_json[0]:
+#            plate_info = object_result_json[0]
+#            x = int(plate_info['area']['x'])
+#            y = int(plate_info['area']['y'])
+#            width = int(plate_info['area']['width'])
+#            height = int(plate_info['area']['height'])##
+
+#            frame_with_roi = frame.copy() # 원본 프레임 복사
+#            cv2.rectangle(frame_with_roi, (x, y), (x + width, y - height), (0, 255, 0), 2) # 녹색 사각형
 #
-#                                roi_marked_img_save_path = os.path.join(config['roi_marked_image_save_path'], f'{plate_text}_roi_marked_{powertrainTypeCode}_{current_time}.jpg') # 새로운 경로 사용
-#                                ret_roi_marked, buffer_roi_marked = cv2.imencode('.jpg', frame_with_roi)
-#                                if ret_roi_marked:
-#                                    image_bytes_roi_marked = buffer_roi_marked.tobytes()
-#                                    executor.submit(save_image, image_bytes_roi_marked, roi_marked_img_save_path)
+#            roi_marked_img_save_path = os.path.join(config['roi_marked_image_save_path'], f'{plate_text}_roi_marked_{powertrainTypeCode}_{current_time}.jpg') # 새로운 경로 사용
+#            ret_roi_marked, buffer_roi_marked = cv2.imencode('.jpg', frame_with_roi)
+#            if ret_roi_marked:
+#                image_bytes_roi_marked = buffer_roi_marked.tobytes()
+#                executor.submit(save_image, image_bytes_roi_marked, roi_marked_img_save_path)
 #
-#                                # 실제 크롭된 번호판 이미지 저장 (추가된 부분)
-#                                cropped_plate = frame[y:y + height, x:x + width]
-#                                cropped_plate_save_path = os.path.join(config['roi_marked_image_save_path'], f'{plate_text}_cropped_{powertrainTypeCode}_{current_time}.jpg') # 파일명 변경
-#                                ret_cropped, buffer_cropped = cv2.imencode('.jpg', cropped_plate)
-#                                if ret_cropped:
-#                                    image_bytes_cropped = buffer_cropped.tobytes()
-#                                    executor.submit(save_image, image_bytes_cropped, cropped_plate_save_path)
+#            # 실제 크롭된 번호판 이미지 저장 (추가된 부분)
+#            cropped_plate = frame[y:y + height, x:x + width]
+#            cropped_plate_save_path = os.path.join(config['roi_marked_image_save_path'], f'{plate_text}_cropped_{powertrainTypeCode}_{current_time}.jpg') # 파일명 변경
+#            ret_cropped, buffer_cropped = cv2.imencode('.jpg', cropped_plate)
+#            if ret_cropped:
+#                image_bytes_cropped = buffer_cropped.tobytes()
+#                executor.submit(save_image, image_bytes_cropped, cropped_plate_save_path)
  #-----------------------------------------------------------------------------------------
-                            # result_json 저장
-                            result_json_save_path = config['result_json_save_path']
-                            json_save_path = os.path.join(result_json_save_path, current_date,f'{plate_text}_{powertrainTypeCode}_{current_time}.json')
-                            os.makedirs(os.path.dirname(json_save_path), exist_ok=True)
-                            with open(json_save_path, 'w', encoding='utf-8') as json_file:
-                                json.dump(object_result_json, json_file, ensure_ascii=False, indent=4)
-    capture.release()
-    cv2.destroyAllWindows()
+        # result_json 저장
+        result_json_save_path = config['result_json_save_path']
+        json_save_path = os.path.join(result_json_save_path, current_date,f'{plate_text}_{powertrainTypeCode}_{current_time}.json')
+        persistence.save_json(object_result_json, json_save_path)
+
+# track별 상위 K개 후보 프레임 등록 (best_frame 활성 시, 확정 전 프레임도 후보로 유지)
+def offer_best_frames(best_frame_selector, vote_tracker, frame, frame_roi, plate_infos, object_result_json, frame_meta):
+    for plate_info in plate_infos:
+        track = vote_tracker.get_track(plate_info['text'])
+        if track is None:
+            continue
+        candidate = FrameCandidate(score_plate(plate_info), frame, frame_roi, plate_info,
+                                   object_result_json, frame_meta.frame_id)
+        best_frame_selector.offer(track, candidate, frame_meta.grabbed_at)
+
+# 닫힌 track의 최고 점수 프레임으로 EV 판정/저장 (같은 프레임의 번호판은 한 번에 판정)
+def handle_best_frames(candidates, persistence, journal=None, metrics=None):
+    by_frame = {}
+    for candidate in candidates:
+        by_frame.setdefault(id(candidate.frame), []).append(candidate)
+    for group in by_frame.values():
+        first = group[0]
+        logging.info("BEST FRAME >> frame %d, plates %s, scores %s", first.frame_id,
+                     [candidate.plate_info['text'] for candidate in group],
+                     [round(candidate.score, 2) for candidate in group])
+        handle_confirmed_plates(first.frame, first.frame_roi, [candidate.plate_info for candidate in group],
+                                first.object_result_json, persistence, journal)
+        if metrics is not None:
+            for _ in group:
+                metrics.record_confirmation()
+
+# 카메라 영상 처리
+# frame_source: FrameGrabber와 같은 인터페이스의 프레임 소스 (replay용, 기본값은 RTSP 수신 스레드)
+# metrics: PipelineMetrics (replay 벤치마크에서 처리량/지연 측정 시 전달)
+# spawned_at: 부모가 프로세스를 시작한 시각 (time.monotonic, 시작 시간/메모리 보고용)
+def process_camera(rtsp_url, frame_source=None, metrics=None, spawned_at=None):
+
+    # EV 판정 모델을 카메라 시작 시점에 미리 로드 (확정 시점 지연 방지)
+    try:
+        warmup_ev_detector(config.get('ev_config_path', EV_CONFIG_PATH))
+    except Exception as e:
+        logging.error("EV detector warmup failed: %s", e)
+
+    # rtsp 스트림 수신 스레드 시작 (인식이 느려도 디코더가 밀리지 않도록 최신 프레임만 유지)
+    grabber = frame_source or FrameGrabber(rtsp_url, buffer_size=config.get('frame_buffer_size', 2))
+    grabber.start()
+    stats_interval = config.get('grabber_stats_interval', 60)
+    last_stats_time = time.monotonic()
+
+    anpr_option = config['anpr_option']
+    plate_count_deque_size = config['plate_count_deque_size']
+    plate_count_threshold = config['plate_count_threshold']
+    # 최근 n개의 차량 번호에 대한 투표 (확정 후 cooldown 동안 같은 번호판 재확정 안 함)
+    vote_tracker = PlateVoteTracker(plate_count_deque_size, plate_count_threshold,
+                                    cooldown_seconds=config.get('plate_cooldown_seconds', 30))
+    recognizer = backend.create_recognizer(anpr_option, use_stride=config.get('anpr_use_stride', True))
+    motion_gate = create_motion_gate(config, rtsp_url)     # 빈 차로 프레임은 인식 생략 (비활성 시 None)
+    rate_controller = create_rate_controller(config, rtsp_url)  # 차량 유무/인식 지연에 따른 인식 빈도 조절
+    persistence = create_persistence(config)               # 확정 결과물 저장은 write-behind
+    best_frame_selector = create_best_frame_selector(config)  # track 종료 시 최고 품질 프레임 1장만 판정/저장 (비활성 시 None)
+    journal = create_entry_journal(config)                 # verify_entry로 넘길 입차 이벤트 저널 (비활성 시 None)
+    if spawned_at is not None:
+        logging.info("Camera process ready (%s): %s", rtsp_url, process_report('camera', time.monotonic() - spawned_at))
+    
+    try:
+        while not grabber.exhausted:
+            # 항상 가장 최신 프레임으로 인식 (재연결은 grabber 스레드가 처리)
+            frame, frame_meta = grabber.read(timeout=1.0)
+            if frame is None:
+                continue
+            if metrics is not None:
+                metrics.record_frame()
+
+            # 번호판이 더 이상 보이지 않는 track은 닫고 최고 점수 프레임으로 판정/저장
+            if best_frame_selector is not None:
+                handle_best_frames(best_frame_selector.poll(frame_meta.grabbed_at), persistence, journal, metrics)
+
+            if time.monotonic() - last_stats_time >= stats_interval:
+                logging.info("Grabber stats (%s): %s, recognizer: %s, motion_gate: %s, rate: %s, persistence: %s",
+                             rtsp_url, grabber.stats(), recognizer.stats(), motion_gate.stats() if motion_gate else None,
+                             rate_controller.stats() if rate_controller else None, persistence.stats())
+                last_stats_time = time.monotonic()
+
+            # 빈 차로에서는 낮은 빈도로, 인식기 처리량을 넘거나 지연된 프레임은 버림
+            now = time.monotonic() if frame_source is None else None
+            if rate_controller is not None and not rate_controller.admit(frame_meta.grabbed_at, now):
+                continue
+            
+            # ROI 설정 적용
+            roi = config['roi'].get(rtsp_url, None)
+            frame_roi = get_frame_roi(frame, roi)
+
+            # 변화가 없는 프레임은 ANPR 엔진 호출 생략 (인식 빈도/backlog 집계에서 처리로 세지 않음)
+            if motion_gate is not None and not motion_gate.should_process(frame_roi, frame_meta.grabbed_at):
+                if rate_controller is not None:
+                    rate_controller.record_gated()
+                continue
+            if rate_controller is not None:
+                rate_controller.mark_processed(frame_meta.grabbed_at, now)
+
+            # 차량 번호판 인식
+            recognition_start = time.perf_counter()
+            object_result_json = parse_anpr_result(recognizer.read_pixels(frame_roi, frame_meta.frame_id))
+            recognition_latency = time.perf_counter() - recognition_start
+            if metrics is not None:
+                metrics.record_recognition(recognition_latency)
+            if rate_controller is not None:
+                rate_controller.record_recognition(recognition_latency, bool(object_result_json), frame_meta.grabbed_at)
+
+            # 프레임의 모든 번호판을 투표, 최근 n개 중 m번 이상이면 확정 (track당 1회)
+            plate_infos = select_plates(object_result_json)
+            confirmed = vote_plates(vote_tracker, plate_infos, frame_meta.grabbed_at)
+            if best_frame_selector is not None:
+                offer_best_frames(best_frame_selector, vote_tracker, frame, frame_roi, plate_infos,
+                                  object_result_json, frame_meta)
+            elif confirmed:
+                handle_confirmed_plates(frame, frame_roi, confirmed, object_result_json, persistence, journal)
+                if metrics is not None:
+                    for _ in confirmed:
+                        metrics.record_confirmation()
+        # 스트림 종료 시 아직 열려 있는 확정 track 처리
+        if best_frame_selector is not None:
+            handle_best_frames(best_frame_selector.flush(), persistence, journal, metrics)
+    finally:
+        grabber.stop()
+        persistence.close()     # 대기 중인 이미지 기록(및 저널 이벤트)을 마친 뒤 저널 종료
+        if journal is not None:
+            journal.close()
+        shutdown_ev_detector(config.get('ev_config_path', EV_CONFIG_PATH))     # 불확실/에러 케이스, 종합 로그 기록 마무리
+    if frame_source is None:
+        cv2.destroyAllWindows()
+    if metrics is not None:
+        return metrics.summary(getattr(grabber, 'fps', None), persistence.stats()['bytes_written'])
+
+
+# 공유 메모리 파이프라인: 카메라별 캡처 프로세스 (수신, 움직임 게이트, 슬롯 기록, 투표)
+def capture_camera(camera_index, rtsp_url, slots_spec, task_queue, free_queue, result_queue):
+    slots = CameraSlots.attach(slots_spec)
+    grabber = FrameGrabber(rtsp_url, buffer_size=config.get('frame_buffer_size', 2)).start()
+    motion_gate = create_motion_gate(config, rtsp_url)
+    vote_tracker = PlateVoteTracker(config['plate_count_deque_size'], config['plate_count_threshold'],
+                                    cooldown_seconds=config.get('plate_cooldown_seconds', 30))
+    roi = config['roi'].get(rtsp_url, None)
+    stats_interval = config.get('grabber_stats_interval', 60)
+    last_stats_time = time.monotonic()
+    no_slot_drops = 0
+
+    # 워커의 인식 결과로 투표 후 확정이면 EV/저장 작업 요청, 아니면 슬롯 반환
+    def collect_results():
+        while True:
+            result = result_queue.get()
+            confirmed = vote_plates(vote_tracker, select_plates(result.payload), result.grabbed_at)
+            if not confirmed:
+                free_queue.put(result.slot_index)
+                continue
+            task_queue.put(SlotTask(TASK_CONFIRM, camera_index, result.slot_index, result.shape,
+                                    result.frame_id, result.grabbed_at,
+                                    payload={'result': result.payload, 'confirmed': confirmed}))
+
+    threading.Thread(target=collect_results, name=f"results-{camera_index}", daemon=True).start()
+
+    try:
+        while True:
+            frame, frame_meta = grabber.read(timeout=1.0)
+            if frame is None:
+                continue
+
+            if time.monotonic() - last_stats_time >= stats_interval:
+                logging.info("Capture stats (%s): %s, no_slot_drops: %d, motion_gate: %s", rtsp_url, grabber.stats(),
+                             no_slot_drops, motion_gate.stats() if motion_gate else None)
+                last_stats_time = time.monotonic()
+
+            if motion_gate is not None and not motion_gate.should_process(get_frame_roi(frame, roi), frame_meta.grabbed_at):
+                continue
+
+            if not slots.fits(frame.shape):
+                logging.error("Frame %s exceeds shared slot size %s (%s)", frame.shape, slots.max_frame_shape, rtsp_url)
+                continue
+
+            # free 슬롯이 없으면 (워커가 밀린 상태) 프레임 버림
+            try:
+                slot_index = free_queue.get_nowait()
+            except queue.Empty:
+                no_slot_drops += 1
+                continue
+
+            slots.write(slot_index, frame)
+            task_queue.put(SlotTask(TASK_RECOGNIZE, camera_index, slot_index, frame.shape,
+                                    frame_meta.frame_id, frame_meta.grabbed_at))
+    finally:
+        grabber.stop()
+
+
+# 공유 메모리 파이프라인: ANPR/EV 워커 프로세스 (모든 카메라의 슬롯을 공유 작업 큐 순서대로 처리)
+def recognition_worker(rtsp_urls, slots_specs, task_queue, free_queues, result_queues, spawned_at=None):
+    slots = [CameraSlots.attach(spec) for spec in slots_specs]
+    rois = [config['roi'].get(rtsp_url, None) for rtsp_url in rtsp_urls]
+    recognizer = backend.create_recognizer(config['anpr_option'], use_stride=config.get('anpr_use_stride', True))
+
+    try:
+        warmup_ev_detector(config.get('ev_config_path', EV_CONFIG_PATH))
+    except Exception as e:
+        logging.error("EV detector warmup failed: %s", e)
+    if spawned_at is not None:
+        logging.info("Recognition worker ready: %s", process_report('worker', time.monotonic() - spawned_at))
+
+    persistence = create_persistence(config)
+    journal = create_entry_journal(config)
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+
+            camera_index = task.camera_index
+            frame = slots[camera_index].view(task.slot_index, task.shape)
+            frame_roi = get_frame_roi(frame, rois[camera_index])
+            try:
+                if task.kind == TASK_RECOGNIZE:
+                    object_result_json = parse_anpr_result(recognizer.read_pixels(frame_roi, task.frame_id))
+                    result_queues[camera_index].put(SlotTask(TASK_RESULT, camera_index, task.slot_index, task.shape,
+                                                             task.frame_id, task.grabbed_at, payload=object_result_json))
+                    continue
+
+                # 슬롯은 곧 재사용되므로 저장 대기열에는 복사본을 넘김
+                owned_frame = frame.copy()
+                handle_confirmed_plates(owned_frame, get_frame_roi(owned_frame, rois[camera_index]),
+                                        task.payload['confirmed'], task.payload['result'], persistence, journal)
+                free_queues[camera_index].put(task.slot_index)
+            except Exception as e:
+                logging.error("Worker task failed (%s, camera %d): %s", task.kind, camera_index, e)
+                free_queues[camera_index].put(task.slot_index)
+            finally:
+                del frame, frame_roi
+    finally:
+        persistence.close()
+        if journal is not None:
+            journal.close()
+        shutdown_ev_detector(config.get('ev_config_path', EV_CONFIG_PATH))
+
+
+# 공유 메모리 파이프라인 실행 (카메라 수와 인식 워커 수 분리)
+def run_shared_pool(rtsp_urls, context=multiprocessing):
+    pool_config = config.get('shared_pool', {})
+    num_workers = pool_config.get('workers') or os.cpu_count() or 2
+    slots_per_camera = pool_config.get('slots_per_camera', 3)
+    max_frame_shape = pool_config.get('max_frame_shape', [1080, 1920, 3])
+    logging.info("Shared pool: %d cameras, %d workers, %d slots/camera", len(rtsp_urls), num_workers, slots_per_camera)
+
+    task_queue = context.Queue()
+    camera_slots = [CameraSlots(index, slots_per_camera, max_frame_shape) for index in range(len(rtsp_urls))]
+    free_queues = []
+    result_queues = []
+    for _ in rtsp_urls:
+        free_queue = context.Queue()
+        for slot_index in range(slots_per_camera):
+            free_queue.put(slot_index)
+        free_queues.append(free_queue)
+        result_queues.append(context.Queue())
+    slots_specs = [slots.spec() for slots in camera_slots]
+
+    processes = []
+    for _ in range(num_workers):
+        processes.append(context.Process(target=recognition_worker,
+                                         args=(rtsp_urls, slots_specs, task_queue, free_queues, result_queues),
+                                         kwargs={'spawned_at': time.monotonic()}))
+    for camera_index, rtsp_url in enumerate(rtsp_urls):
+        processes.append(context.Process(target=capture_camera,
+                                         args=(camera_index, rtsp_url, slots_specs[camera_index], task_queue,
+                                               free_queues[camera_index], result_queues[camera_index])))
+    try:
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    finally:
+        for slots in camera_slots:
+            slots.close()
 
 
 def main():
@@ -228,10 +451,19 @@ def main():
     rtsp_urls = config['rtsp_urls']
     logging.info("RTSP URLs: %s", rtsp_urls)
 
+    # EV 모델은 부모에서 한 번만 로드하고 fork로 자식과 공유 (카메라 수만큼 RSS가 늘지 않도록)
+    preload_shared_state(config, config.get('ev_config_path', EV_CONFIG_PATH))
+    context = worker_context(config)
+
+    # 공유 메모리 + 고정 크기 인식 워커 풀 모드
+    if config.get('shared_pool', {}).get('enabled', False):
+        run_shared_pool(rtsp_urls, context)
+        return
+
     # 프로세스 생성 및 시작
     processes = []
     for rtsp_url in rtsp_urls:
-        process = multiprocessing.Process(target=process_camera, args=(rtsp_url,))
+        process = context.Process(target=process_camera, args=(rtsp_url,), kwargs={'spawned_at': time.monotonic()})
         processes.append(process)
         process.start()
 
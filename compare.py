@@ -7,6 +7,7 @@ import numpy as np
 from datetime import datetime
 from src.detector.ev_detector_0327 import EVDetector
 from src.utils.logging_config import setup_logging
+from ev_src.utils.json_records import to_builtin
 import time 
 
 def load_config(config_path: str) -> dict:
@@ -14,27 +15,6 @@ def load_config(config_path: str) -> dict:
     with open(config_path, 'r', encoding='utf-8') as f:
         return yaml.safe_load(f)
 
-def convert_numpy_types(obj):
-    """딕셔너리/리스트 내의 numpy 타입을 파이썬 기본 타입으로 변환"""
-    if isinstance(obj, dict):
-        return {k: convert_numpy_types(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(i) for i in obj]
-    elif isinstance(obj, (np.int_, np.intc, np.intp, np.int8,
-                        np.int16, np.int32, np.int64, np.uint8,
-                        np.uint16, np.uint32, np.uint64)):
-        return int(obj)
-    elif isinstance(obj, (np.float_, np.float16, np.float32, 
-                        np.float64)):
-        return float(obj)
-    elif isinstance(obj, (np.ndarray,)): # ndarray를 리스트로 변환 (필요시)
-        return obj.tolist()
-    elif isinstance(obj, (np.bool_)):
-        return bool(obj)
-    elif isinstance(obj, (np.void)): # void 타입 처리 (필요시)
-        return None
-    return obj
-
 def save_uncertain_case(config: dict, frame: np.ndarray, plate_info: dict, result: dict):
     """불확실한 판정 결과 저장"""
     try:
@@ -50,15 +30,10 @@ def save_uncertain_case(config: dict, frame: np.ndarray, plate_info: dict, resul
                 'metrics': result.get('metrics', {})
             }
 
-            # --- 수정된 부분 ---
-            # JSON 저장 전에 numpy 타입을 파이썬 기본 타입으로 변환
-            case_info_serializable = convert_numpy_types(case_info)
-            # ---------------
-
             json_path = os.path.join(uncertain_dir, f'{timestamp}.json')
             with open(json_path, 'w', encoding='utf-8') as f:
-                # 변환된 딕셔너리를 dump
-                json.dump(case_info_serializable, f, indent=2, ensure_ascii=False) 
+                # numpy 타입은 to_builtin으로 파이썬 기본 타입으로 변환
+                json.dump(case_info, f, indent=2, ensure_ascii=False, default=to_builtin)
 
             logging.info(f"불확실한 판정 케이스 저장 완료: {json_path}")
 
@@ -1,12 +1,15 @@
 import os
 import yaml
 import cv2
-import json
 import logging
 import numpy as np
 from datetime import datetime
 from ev_src.detector.ev_detector_0327 import EVDetector
-from ev_src.utils.logging_config import setup_logging
+from ev_src.detector.detector_registry import get_registry, DEFAULT_CONFIG_PATH
+from ev_src.detector.records import DetectionRecord, ErrorCaseRecord, PredictionLogRecord, UncertainCaseRecord
+from ev_src.utils.case_capture import CaseCaptureSink, CASE_ERROR, CASE_UNCERTAIN
+from ev_src.utils.prediction_log import PredictionLogWriter
+from ev_src.utils.logging_config import shutdown_logging
 import time 
 
 def load_config(config_path: str) -> dict:
@@ -14,61 +17,20 @@ def load_config(config_path: str) -> dict:
     with open(config_path, 'r', encoding='utf-8') as f:
         return yaml.safe_load(f)
 
-def convert_numpy_types(obj):
-    """딕셔너리/리스트 내의 numpy 타입을 파이썬 기본 타입으로 변환"""
-    if isinstance(obj, dict):
-        return {k: convert_numpy_types(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(i) for i in obj]
-    elif isinstance(obj, (np.int_, np.intc, np.intp, np.int8,
-                        np.int16, np.int32, np.int64, np.uint8,
-                        np.uint16, np.uint32, np.uint64)):
-        return int(obj)
-    elif isinstance(obj, (np.float_, np.float16, np.float32, 
-                        np.float64)):
-        return float(obj)
-    elif isinstance(obj, (np.ndarray,)): # ndarray를 리스트로 변환 (필요시)
-        return obj.tolist()
-    elif isinstance(obj, (np.bool_)):
-        return bool(obj)
-    elif isinstance(obj, (np.void)): # void 타입 처리 (필요시)
-        return None
-    return obj
+def _saved_image_size(config: dict):
+    """저장 이미지 축소 크기 (축소하지 않으면 None)"""
+    save_options = config['processing']['save_options']
+    return tuple(save_options['saved_image_size']) if save_options['resize_saved_image'] else None
 
-def save_uncertain_case(config: dict, frame: np.ndarray, plate_info: dict, result: dict):
-    """불확실한 판정 결과 저장"""
-    try:
-        if result['conf']['ev'] < config['processing']['confidence_threshold']:
-            # ... (디렉토리 생성, 타임스탬프, 이미지 저장 로직 동일) ...
-
-            # 판정 정보 저장
-            case_info = {
-                'timestamp': datetime.now().isoformat(),
-                'input_plate_info': plate_info,
-                'detection_result': result,
-                'image_path': image_path,
-                'metrics': result.get('metrics', {})
-            }
-
-            # --- 수정된 부분 ---
-            # JSON 저장 전에 numpy 타입을 파이썬 기본 타입으로 변환
-            case_info_serializable = convert_numpy_types(case_info)
-            # ---------------
-
-            json_path = os.path.join(uncertain_dir, f'{timestamp}.json')
-            with open(json_path, 'w', encoding='utf-8') as f:
-                # 변환된 딕셔너리를 dump
-                json.dump(case_info_serializable, f, indent=2, ensure_ascii=False) 
-
-            logging.info(f"불확실한 판정 케이스 저장 완료: {json_path}")
-
-    except Exception as e:
-        # 여기의 에러 메시지도 상세하게 수정 가능
-        logging.error(f"불확실한 판정 케이스 저장 실패: {type(e).__name__} - {str(e)}")
-
-
-def save_error_case(config: dict, frame: np.ndarray, plate_info: dict, error_msg: str):
-    """에러 케이스 저장"""
+def save_error_case(config: dict, frame: np.ndarray, plate_info: dict, error_msg: str,
+                    capture: CaseCaptureSink = None):
+    """에러 케이스 저장 (capture가 있으면 writer 스레드에 맡기고 바로 반환)"""
+    if capture is not None:
+        save_image = config['processing']['save_options']['save_error_image']
+        capture.capture(CASE_ERROR, config['paths']['error_cases_dir'], frame if save_image else None,
+                        ErrorCaseRecord(datetime.now().isoformat(), plate_info, error_msg),
+                        resize_to=_saved_image_size(config))
+        return
     try:
         # 에러 케이스 저장 디렉토리 생성
         error_dir = os.path.join(config['paths']['error_cases_dir'], 
@@ -90,27 +52,30 @@ def save_error_case(config: dict, frame: np.ndarray, plate_info: dict, error_msg
             cv2.imwrite(image_path, save_frame)
         
         # 에러 정보 저장
-        error_info = {
-            'timestamp': datetime.now().isoformat(),
-            'plate_info': plate_info,
-            'error_message': error_msg,
-            'image_path': image_path
-        }
+        error_info = ErrorCaseRecord(datetime.now().isoformat(), plate_info, error_msg, image_path)
         
         error_json_path = os.path.join(error_dir, f'{timestamp}.json')
-        with open(error_json_path, 'w', encoding='utf-8') as f:
-            json.dump(error_info, f, indent=2, ensure_ascii=False)
+        with open(error_json_path, 'wb') as f:
+            f.write(error_info.to_json_bytes())
             
         logging.info(f"에러 케이스 저장 완료: {error_json_path}")
         
     except Exception as e:
         logging.error(f"에러 케이스 저장 실패: {str(e)}")
 
-def save_uncertain_case(config: dict, frame: np.ndarray, plate_info: dict, result: dict):
-    """불확실한 판정 결과 저장"""
+def save_uncertain_case(config: dict, frame: np.ndarray, plate_info: dict, result: dict,
+                        capture: CaseCaptureSink = None):
+    """불확실한 판정 결과 저장 (capture가 있으면 writer 스레드에 맡기고 바로 반환)"""
     try:
         # 신뢰도가 임계값보다 낮은 경우에만 저장
         if result['conf']['ev'] < config['processing']['confidence_threshold']:
+            if capture is not None:
+                save_image = config['processing']['save_options']['save_uncertain_image']
+                capture.capture(CASE_UNCERTAIN, config['paths']['uncertain_cases_dir'], frame if save_image else None,
+                                UncertainCaseRecord(datetime.now().isoformat(), plate_info, result),
+                                resize_to=_saved_image_size(config))
+                return
+
             # 저장 디렉토리 생성
             uncertain_dir = os.path.join(config['paths']['uncertain_cases_dir'],
                                        datetime.now().strftime('%Y%m%d'))
@@ -131,17 +96,11 @@ def save_uncertain_case(config: dict, frame: np.ndarray, plate_info: dict, resul
                 cv2.imwrite(image_path, save_frame)
             
             # 판정 정보 저장
-            case_info = {
-                'timestamp': datetime.now().isoformat(),
-                'input_plate_info': plate_info,
-                'detection_result': result,
-                'image_path': image_path,
-                'metrics': result.get('metrics', {})
-            }
+            case_info = UncertainCaseRecord(datetime.now().isoformat(), plate_info, result, image_path)
             
             json_path = os.path.join(uncertain_dir, f'{timestamp}.json')
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(case_info, f, indent=2, ensure_ascii=False)
+            with open(json_path, 'wb') as f:
+                f.write(case_info.to_json_bytes())
                 
             logging.info(f"불확실한 판정 케이스 저장 완료: {json_path}")
             
@@ -170,20 +129,25 @@ def validate_input(frame: np.ndarray, plate_info: dict, config: dict) -> tuple:
 
 
 # 250418 am 1014 - Add new function to save comprehensive log
-def save_comprehensive_log(config: dict, plate_info: dict, detection_result: dict):
-    """종합 판정 결과를 로그 파일에 저장"""
+def save_comprehensive_log(config: dict, plate_info: dict, detection_result: dict,
+                           prediction_log: PredictionLogWriter = None):
+    """종합 판정 결과를 로그 파일에 저장 (prediction_log가 있으면 열어 둔 일자별 파일에 버퍼링 기록)"""
     try:
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'plate_number': plate_info.get('text', ''), # 번호판 번호
-            'ts_ev_prediction': plate_info.get('attrs', {}).get('ev'), # TS 엔진 예측 (boolean)
-            'my_model_ev_prediction': detection_result.get('ev'), # 사용자 모델 최종 예측 (boolean)
-            'my_model_confidence': detection_result.get('conf', {}).get('ev'), # 사용자 모델 신뢰도 점수
-            'model_used': detection_result.get('metrics', {}).get('model_used'), # 사용된 모델 ('xgb' or 'lgbm')
-            'processing_time': detection_result.get('elapsed'), # 처리 시간
+        confidence = detection_result.get('conf', {}).get('ev')
+        log_entry = PredictionLogRecord(
+            timestamp=datetime.now().isoformat(),
+            plate_number=plate_info.get('text', ''), # 번호판 번호
+            ts_ev_prediction=plate_info.get('attrs', {}).get('ev'), # TS 엔진 예측 (boolean)
+            my_model_ev_prediction=detection_result.get('ev'), # 사용자 모델 최종 예측 (boolean)
+            my_model_confidence=confidence, # 사용자 모델 신뢰도 점수
+            model_used=detection_result.get('metrics', {}).get('model_used'), # 사용된 모델 ('xgb' or 'lgbm')
+            processing_time=detection_result.get('elapsed'), # 처리 시간
             # 해당 데이터가 uncertain_cases에 저장되었는지 여부 (참고용)
-            'saved_in_uncertain': detection_result.get('conf', {}).get('ev', 0) < config['processing']['confidence_threshold']
-        }
+            saved_in_uncertain=(confidence if confidence is not None else 0) < config['processing']['confidence_threshold']
+        )
+        if prediction_log is not None:
+            prediction_log.write(log_entry)
+            return
 
         log_base_dir = config['paths']['comprehensive_log_base_dir']
         
@@ -198,9 +162,8 @@ def save_comprehensive_log(config: dict, plate_info: dict, detection_result: dic
         #log_dir = os.path.dirname(log_file_path)
         #os.makedirs(log_dir, exist_ok=True) # 로그 파일 디렉토리 생성
 
-        with open(log_file_path, 'a', encoding='utf-8') as f:
-            json.dump(log_entry, f, ensure_ascii=False)
-            f.write('\n') # 각 로그 항목을 새로운 줄에 기록
+        with open(log_file_path, 'ab') as f:
+            f.write(log_entry.to_json_bytes() + b'\n') # 각 로그 항목을 새로운 줄에 기록
 
         # 로그 저장 성공 메시지는 너무 많이 출력될 수 있으므로 기본적으로는 출력하지 않습니다.
         # logging.info(f"종합 로그 저장 완료: {log_file_path}")
@@ -212,124 +175,126 @@ def save_comprehensive_log(config: dict, plate_info: dict, detection_result: dic
 
 
 
-def process_realtime_data(frame: np.ndarray, plate_info: dict, detector: EVDetector, config: dict) -> dict:
-    """실시간 데이터 처리"""
+def build_detection_result(plate_info: dict, result) -> DetectionRecord:
+    """원본 plate_info와 detector 결과(DetectionResult)로 판정 결과 생성 (기존 dict와 같은 키로 조회 가능)"""
+    return DetectionRecord(plate_info, result)
+
+def finalize_detection(frame: np.ndarray, plate_info: dict, result, config: dict,
+                       capture: CaseCaptureSink = None,
+                       prediction_log: PredictionLogWriter = None) -> DetectionRecord:
+    """판정 결과 생성 후 종합 로그/처리 시간/불확실 케이스 처리"""
+    detection_result = build_detection_result(plate_info, result)
+
+    # --- log save func call ---
+    # if not error : log save
+    if not detection_result.error_occurred:
+        save_comprehensive_log(config, plate_info, detection_result, prediction_log)
+    # -------------------------------------------
+
+    # 처리 시간 체크 (result.processing_time 사용)
+    if (result.processing_time > config['realtime']['performance']['max_processing_time'] and 
+        config['realtime']['performance']['skip_if_exceeded']):
+        error_msg = f"처리 시간 초과: {result.processing_time:.4f}초"
+        # 에러 케이스 저장 시 원본 plate_info 사용
+        save_error_case(config, frame, plate_info, error_msg, capture)
+        return None
+
+    # 불확실한 판정 결과 저장 (detection_result와 원본 plate_info 사용)
+    save_uncertain_case(config, frame, plate_info, detection_result, capture)
+
+    return detection_result
+
+def process_realtime_batch(frame: np.ndarray, plate_infos: list, detector: EVDetector, config: dict,
+                           capture: CaseCaptureSink = None, prediction_log: PredictionLogWriter = None) -> list:
+    """실시간 데이터 일괄 처리 (한 프레임의 번호판 여러 개를 detector 한 번 호출로 판정)
+
+    capture: 불확실/에러 케이스 비동기 저장 단계 (None이면 인식 경로에서 바로 기록)
+    prediction_log: 종합 판정 로그 writer (None이면 건별로 파일을 열어 기록)
+
+    Returns:
+        list: plate_infos와 같은 순서의 판정 결과 (검증/처리 실패 항목은 None)
+    """
     retry_count = config['realtime']['error_handling']['retry_count']
     retry_delay = config['realtime']['error_handling']['retry_delay']
-    
+    results = [None] * len(plate_infos)
+
+    # 입력 데이터 검증 (원본 plate_info 사용), 실패 항목은 에러 케이스로 저장
+    valid_indices = []
+    for index, plate_info in enumerate(plate_infos):
+        is_valid, error_msg = validate_input(frame, plate_info, config)
+        if is_valid:
+            valid_indices.append(index)
+        else:
+            save_error_case(config, frame, plate_info, error_msg, capture)
+    if not valid_indices:
+        return results
+
+    valid_plate_infos = [plate_infos[index] for index in valid_indices]
     for attempt in range(retry_count):
         try:
-            # 입력 데이터 검증 (원본 plate_info 사용)
-            is_valid, error_msg = validate_input(frame, plate_info, config)
-            if not is_valid:
-                # 에러 케이스 저장 시 원본 plate_info 사용
-                save_error_case(config, frame, plate_info, error_msg) 
-                return None
-                
-            # -------------------------------------------------------------
-            # 주석 처리된 부분과 아래 area_info 생성 블록 모두 제거합니다.
-            # # area 정보를 detector가 이해할 수 있는 형식으로 변환 
-            # area_info = { ... } 
-            # -------------------------------------------------------------
-
-            # 이미지 처리 (원본 plate_info 직접 전달)
-            # result = detector.process_frame(frame, area_info) # 이전 코드
-            result = detector.process_frame(frame, plate_info) # 수정된 코드: 원본 plate_info 전달
-            
-            # 결과 생성 (원본 plate_info와 detector 결과(result) 사용)	# 250416  9~10 AM modified
-            detection_result = {
-                "area": { # 원본 plate_info['area'] 정보를 다시 사용
-                    "angle": float(plate_info["area"]["angle"]), 
-                    "height": float(plate_info["area"]["height"]),
-                    "width": float(plate_info["area"]["width"]),
-                    "x": float(plate_info["area"]["x"]),
-                    "y": float(plate_info["area"]["y"])
-                },
-                "attrs": {
-                    "ev": bool(result.is_ev) # Mydetector 결과 사용
-                },
-                "conf": {
-                    "ocr": float(plate_info["conf"]["ocr"]), # 원본 plate_info 사용
-                    "plate": float(plate_info["conf"]["plate"]), # 원본 plate_info 사용
-                    "ev": float(result.confidence) # Mydetector 결과 사용
-                },
-                "elapsed": float(result.processing_time), # Mydetector 결과 사용
-                "ev": bool(result.is_ev), # Mydetector 결과 사용
-                "text": str(result.plate_number), # Mydetector 결과 사용 (원본 text와 동일할 것임)
-                "timestamp": result.timestamp.isoformat(), # Mydetector 결과 사용
-                "metrics": {
-                    # ... (result.metrics 내용 동일하게 복사) ...
-                    "elapsed_time": float(result.metrics.elapsed_time),
-                    "confidence_score": float(result.metrics.confidence_score),
-                    "model_used": str(result.metrics.model_used),
-                    "error_occurred": bool(result.metrics.error_occurred),
-                    "error_message": str(result.metrics.error_message)
-                }
-            }
-            
-            # --- log save func call ---
-            # if not error : log save
-            if not detection_result.get('metrics',{}).get('error_occurred', False):
-                save_comprehensive_log(config, plate_info, detection_result)
-            # -------------------------------------------
-            
-            
-            # 처리 시간 체크 (result.processing_time 사용)
-            if (result.processing_time > config['realtime']['performance']['max_processing_time'] and 
-                config['realtime']['performance']['skip_if_exceeded']):
-                error_msg = f"처리 시간 초과: {result.processing_time:.4f}초"
-                # 에러 케이스 저장 시 원본 plate_info 사용
-                save_error_case(config, frame, plate_info, error_msg) 
-                return None
-            
-            # 불확실한 판정 결과 저장 (detection_result와 원본 plate_info 사용)
-            save_uncertain_case(config, frame, plate_info, detection_result)
-            
-            return detection_result
-            
+            # 이미지 처리 (원본 plate_info 직접 전달), 번호판별 전처리 오류는 해당 결과의 metrics로 반환됨
+            detections = detector.process_frames(frame, valid_plate_infos)
         except Exception as e:
+            # 모델 호출 실패 등 프레임 전체 오류만 재시도
             error_msg = f"실시간 처리 중 오류 발생 (시도 {attempt + 1}/{retry_count}): {str(e)}"
             logging.error(error_msg)
             
             if attempt < retry_count - 1:
-                # import time # 이미 상단에 import 되어 있다면 여기서 필요 없음
                 time.sleep(retry_delay)
                 continue
                 
             # 최종 에러 발생 시 원본 plate_info 사용 + error log save
-            save_error_case(config, frame, plate_info, error_msg) 
-            return None
+            for plate_info in valid_plate_infos:
+                save_error_case(config, frame, plate_info, error_msg, capture)
+            return [None] * len(plate_infos)
 
-def ev_detect(frame, plate_info):
-    # 설정 로드
-    config = load_config('ev_config/config_0327.yaml')
-    
-    # 로깅 설정(config 전달)
-    logger = setup_logging(config['paths']['logs_dir'], config)
-    logger.info("EV detecting system Start...")
-    
-    # EVDetector 초기화
-    detector = EVDetector(
-        config['model']['xgb_path'],
-        config['model']['lgbm_path'],
-        confidence_threshold=config['processing']['confidence_threshold'],
-        max_processing_time=config['realtime']['performance']['max_processing_time']
-    )
+        for index, result in zip(valid_indices, detections):
+            if result.metrics.error_occurred:
+                # 실패한 번호판만 에러 케이스로 저장 (나머지 번호판 결과는 유지)
+                error_msg = f"실시간 처리 중 오류 발생: {result.metrics.error_message}"
+                logging.error(error_msg)
+                save_error_case(config, frame, plate_infos[index], error_msg, capture)
+                continue
+            results[index] = finalize_detection(frame, plate_infos[index], result, config, capture,
+                                                prediction_log)
+        return results
+
+def process_realtime_data(frame: np.ndarray, plate_info: dict, detector: EVDetector, config: dict,
+                          capture: CaseCaptureSink = None, prediction_log: PredictionLogWriter = None) -> dict:
+    """실시간 데이터 처리"""
+    return process_realtime_batch(frame, [plate_info], detector, config, capture, prediction_log)[0]
+
+def warmup(config_path: str = DEFAULT_CONFIG_PATH) -> dict:
+    """카메라 시작 시 호출: 설정/모델/로거를 미리 로드하고 더미 추론 수행"""
+    return get_registry(config_path).warmup()
+
+def shutdown(config_path: str = DEFAULT_CONFIG_PATH):
+    """프로세스 종료 전 호출: 대기 중인 불확실/에러 케이스와 종합 판정 로그, 큐에 쌓인 로그 기록 마무리"""
+    get_registry(config_path).close()
+    shutdown_logging()
+
+def ev_detect_batch(frame, plate_infos, config_path: str = DEFAULT_CONFIG_PATH) -> list:
+    """한 프레임에서 새로 확정된 번호판들을 한 번에 EV 판정 (결과는 plate_infos 순서)"""
+    # 설정/로깅/EVDetector는 프로세스당 한 번만 로드 (detector_registry)
+    registry = get_registry(config_path)
+    config, detector, logger = registry.get()
     
-    logger.info("Real-time processing mode Start!")
+    logger.info("Real-time processing mode Start! (plates: %d)", len(plate_infos))
     try:
-        result = None
-
-        # 실시간 처리
-        result = process_realtime_data(frame, plate_info, detector, config)
-        if result:
+        # 실시간 처리 (불확실/에러 케이스, 종합 판정 로그 디스크 기록은 registry의 저장 단계에서)
+        results = process_realtime_batch(frame, plate_infos, detector, config, registry.case_capture,
+                                         registry.prediction_log)
+        for result in results:
+            if not result:
+                continue
             logger.info("Real-time processing result:")
-            logger.info(f"  - Plate Number: {result['text']}")
-            logger.info(f"  - EV Classification: {'EV' if result['ev'] else 'ICE'}")
-            logger.info(f"  - EV Confidence: {result['conf']['ev']:.2f}")
-            logger.info(f"  - Processing Time: {result['elapsed']:.4f}sec")
-            logger.info(f"  - Model Used: {result['metrics']['model_used']}")
+            logger.info("  - Plate Number: %s", result['text'])
+            logger.info("  - EV Classification: %s", 'EV' if result['ev'] else 'ICE')
+            logger.info("  - EV Confidence: %.2f", result['conf']['ev'])
+            logger.info("  - Processing Time: %.4fsec", result['elapsed'])
+            logger.info("  - Model Used: %s", result['metrics']['model_used'])
             
+        if any(results):
             # 메트릭 요약 출력
             metrics_summary = detector.get_metrics_summary()
             logger.info("Process Metric Summary:")
@@ -337,14 +302,19 @@ def ev_detect(frame, plate_info):
             #logger.info(f"  - 평균 처리 시간: {metrics_summary['avg_processing_time']:.4f}초")
             #logger.info(f"  - 평균 신뢰도: {metrics_summary['avg_confidence']:.2f}")
             #logger.info(f"  - 에러율: {metrics_summary['error_rate']:.2%}")
-            logger.info(f"  - Model Usage rate : XGBoost {metrics_summary['model_usage']['xgb']}, LightGBM {metrics_summary['model_usage']['lgbm']}")
+            logger.info("  - Model Usage rate : XGBoost %s, LightGBM %s",
+                        metrics_summary['model_usage']['xgb'], metrics_summary['model_usage']['lgbm'])
         
-        return result
+        return results
         
     except Exception as e:
         logger.error(f"Error occurred during real-time processing: {str(e)}")
 
     logger.info("EV detection system terminated")
+    return [None] * len(plate_infos)
+
+def ev_detect(frame, plate_info, config_path: str = DEFAULT_CONFIG_PATH):
+    return ev_detect_batch(frame, [plate_info], config_path)[0]
 
 def main():
 
@@ -0,0 +1,271 @@
+"""XGBoost/LightGBM 이진 분류 모델을 NumPy 배열로 컴파일한 트리 앙상블
+
+학습 라이브러리(xgboost, lightgbm, sklearn) 없이 모든 트리를 행 배치 단위로 한꺼번에
+평가한다. 컴파일은 학습 환경에서 한 번 수행하고 (.npz), 런타임은 numpy만 import 한다.
+
+컴파일 (학습 라이브러리가 설치된 환경, 저장소 루트에서):
+    python -m ev_src.detector.compiled_trees --xgb models/xgb.pkl --lgbm models/lgbm.pkl --out models/compiled
+이후 설정 파일의 model.xgb_path / model.lgbm_path를 생성된 .npz 경로로 바꾸면 된다.
+"""
+import json
+import numpy as np
+from typing import Dict, List, Optional
+
+MISSING_NONE = 0    # NaN은 0.0으로 비교 (LightGBM missing_type=None)
+MISSING_NAN = 1     # NaN이면 default 방향 (XGBoost, LightGBM missing_type=NaN)
+MISSING_ZERO = 2    # 0이면 default 방향 (LightGBM missing_type=Zero)
+_ZERO_THRESHOLD = 1e-35     # LightGBM kZeroThreshold
+
+
+class CompiledForest:
+    """평탄화된 트리 앙상블 (sklearn 분류기와 같은 predict/predict_proba 인터페이스)
+
+    모든 트리의 노드를 하나의 배열에 이어 붙이고, 리프 노드는 자기 자신을 자식으로 가리키게 해
+    max_depth번 반복하면 모든 (행, 트리) 쌍이 리프에 도달한다.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray, right: np.ndarray,
+                 default_left: np.ndarray, missing: np.ndarray, value: np.ndarray, roots: np.ndarray,
+                 max_depth: int, base_margin: float, less_equal: bool, source: str = ''):
+        self.feature = feature.astype(np.intp)
+        self.threshold = threshold
+        self.left = left.astype(np.intp)
+        self.right = right.astype(np.intp)
+        self.default_left = default_left.astype(bool)
+        self.missing = missing.astype(np.int8)
+        self.value = value.astype(np.float64)
+        self.roots = roots.astype(np.intp)
+        self.max_depth = int(max_depth)
+        self.base_margin = float(base_margin)
+        self.less_equal = bool(less_equal)     # LightGBM: x <= threshold, XGBoost: x < threshold
+        self.source = source
+        self.classes_ = np.array([0, 1])
+        self._has_missing_rules = bool((self.missing != MISSING_NONE).any())
+        # LightGBM 모델에 NaN 분기 노드가 없으면 NaN → 0 변환을 입력 전체에 한 번만 적용
+        self._nan_as_zero = bool(self.less_equal and not (self.missing == MISSING_NAN).any())
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def decision_function(self, X) -> np.ndarray:
+        """행별 raw margin (모든 트리 리프 값 합 + base margin)"""
+        X = np.asarray(X, dtype=self.threshold.dtype)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+        if self._nan_as_zero and np.isnan(X).any():
+            X = np.nan_to_num(X, nan=0.0)
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            values = X[rows, self.feature[nodes]]
+            thresholds = self.threshold[nodes]
+            go_left = values <= thresholds if self.less_equal else values < thresholds
+            if self._has_missing_rules:
+                missing = self.missing[nodes]
+                nan = np.isnan(values)
+                if self.less_equal:
+                    # LightGBM: missing_type이 NaN이 아닌 노드는 NaN을 0으로 보고 비교
+                    values = np.where(nan & (missing != MISSING_NAN), 0.0, values)
+                    go_left = values <= thresholds
+                is_missing = ((missing == MISSING_NAN) & nan) | \
+                             ((missing == MISSING_ZERO) & (np.abs(values) <= _ZERO_THRESHOLD))
+                go_left = np.where(is_missing, self.default_left[nodes], go_left)
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.value[nodes].sum(axis=1) + self.base_margin
+
+    def predict_proba(self, X) -> np.ndarray:
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def save(self, path: str):
+        np.savez(path, feature=self.feature.astype(np.int32), threshold=self.threshold,
+                 left=self.left.astype(np.int32), right=self.right.astype(np.int32),
+                 default_left=self.default_left, missing=self.missing, value=self.value,
+                 roots=self.roots.astype(np.int32),
+                 meta=np.array(json.dumps({'max_depth': self.max_depth, 'base_margin': self.base_margin,
+                                           'less_equal': self.less_equal, 'source': self.source})))
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledForest':
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            return cls(data['feature'], data['threshold'], data['left'], data['right'], data['default_left'],
+                       data['missing'], data['value'], data['roots'], meta['max_depth'], meta['base_margin'],
+                       meta['less_equal'], meta.get('source', ''))
+
+
+class _ForestBuilder:
+    """트리를 하나씩 평탄화 배열에 추가"""
+
+    def __init__(self):
+        self.columns: Dict[str, List] = {name: [] for name in
+                                         ('feature', 'threshold', 'left', 'right', 'default_left', 'missing', 'value')}
+        self.roots: List[int] = []
+        self.max_depth = 0
+
+    def add_node(self) -> int:
+        for column in self.columns.values():
+            column.append(0)
+        return len(self.columns['feature']) - 1
+
+    def set_split(self, node, feature, threshold, left, right, default_left, missing):
+        for name, value in (('feature', feature), ('threshold', threshold), ('left', left), ('right', right),
+                            ('default_left', default_left), ('missing', missing)):
+            self.columns[name][node] = value
+
+    def set_leaf(self, node, value):
+        self.set_split(node, 0, 0.0, node, node, False, MISSING_NONE)
+        self.columns['value'][node] = value
+
+    def build(self, threshold_dtype, base_margin: float, less_equal: bool, source: str) -> CompiledForest:
+        return CompiledForest(np.array(self.columns['feature']),
+                              np.array(self.columns['threshold'], dtype=threshold_dtype),
+                              np.array(self.columns['left']), np.array(self.columns['right']),
+                              np.array(self.columns['default_left']), np.array(self.columns['missing']),
+                              np.array(self.columns['value'], dtype=np.float64), np.array(self.roots),
+                              self.max_depth, base_margin, less_equal, source)
+
+
+def _calibrate_base_margin(forest: CompiledForest, raw_margin_fn, n_features: int) -> CompiledForest:
+    """원본 모델의 raw margin과 트리 합의 차이로 base margin 결정 (라이브러리 버전별 base_score 표현 차이 회피)"""
+    probe = np.zeros((1, n_features), dtype=np.float32)
+    forest.base_margin = 0.0
+    forest.base_margin = float(np.asarray(raw_margin_fn(probe)).ravel()[0] - forest.decision_function(probe)[0])
+    return forest
+
+
+def compile_xgboost(model) -> CompiledForest:
+    """XGBClassifier(binary:logistic) 컴파일 (xgboost는 이 함수 안에서만 필요)"""
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    learner = json.loads(booster.save_raw(raw_format='json'))['learner']
+    if learner['objective']['name'] != 'binary:logistic':
+        raise ValueError(f"지원하지 않는 XGBoost objective: {learner['objective']['name']}")
+    n_features = int(learner['learner_model_param']['num_feature'])
+
+    builder = _ForestBuilder()
+    for tree in learner['gradient_booster']['model']['trees']:
+        if any(tree.get('split_type', [])):
+            raise ValueError("범주형 분할 트리는 지원하지 않습니다.")
+        offset = len(builder.columns['feature'])
+        lefts, rights = tree['left_children'], tree['right_children']
+        for node_id in range(len(lefts)):
+            node = builder.add_node()
+            if lefts[node_id] == -1:
+                builder.set_leaf(node, tree['split_conditions'][node_id])
+            else:
+                builder.set_split(node, tree['split_indices'][node_id], tree['split_conditions'][node_id],
+                                  offset + lefts[node_id], offset + rights[node_id],
+                                  bool(tree['default_left'][node_id]), MISSING_NAN)
+        builder.roots.append(offset)
+        builder.max_depth = max(builder.max_depth, _depth(lefts, rights))
+
+    forest = builder.build(np.float32, 0.0, less_equal=False, source='xgboost')
+    return _calibrate_base_margin(forest, lambda X: booster.inplace_predict(X, predict_type='margin'), n_features)
+
+
+def compile_lightgbm(model) -> CompiledForest:
+    """LGBMClassifier(binary) 컴파일 (lightgbm은 이 함수 안에서만 필요)"""
+    booster = model.booster_ if hasattr(model, 'booster_') else model
+    dump = booster.dump_model()
+    if not dump['objective'].startswith('binary') or dump['num_class'] != 1 or dump.get('average_output'):
+        raise ValueError(f"지원하지 않는 LightGBM 모델: objective={dump['objective']}")
+    sigmoid = float(dump['objective'].partition('sigmoid:')[2] or 1.0)
+    if sigmoid != 1.0:
+        raise ValueError(f"sigmoid 파라미터 {sigmoid}는 지원하지 않습니다.")
+    missing_types = {'None': MISSING_NONE, 'NaN': MISSING_NAN, 'Zero': MISSING_ZERO}
+
+    builder = _ForestBuilder()
+
+    def add(structure, depth) -> int:
+        node = builder.add_node()
+        builder.max_depth = max(builder.max_depth, depth)
+        if 'leaf_value' in structure:
+            builder.set_leaf(node, structure['leaf_value'])
+            return node
+        if structure['decision_type'] != '<=':
+            raise ValueError("범주형 분할 트리는 지원하지 않습니다.")
+        left = add(structure['left_child'], depth + 1)
+        right = add(structure['right_child'], depth + 1)
+        builder.set_split(node, structure['split_feature'], structure['threshold'], left, right,
+                          bool(structure['default_left']), missing_types[structure['missing_type']])
+        return node
+
+    for tree in dump['tree_info']:
+        builder.roots.append(add(tree['tree_structure'], 0))
+
+    forest = builder.build(np.float64, 0.0, less_equal=True, source='lightgbm')
+    return _calibrate_base_margin(forest, lambda X: booster.predict(X, raw_score=True), dump['max_feature_idx'] + 1)
+
+
+def _depth(lefts: List[int], rights: List[int]) -> int:
+    """XGBoost 배열 트리의 최대 깊이"""
+    depth, frontier = 0, [0]
+    while True:
+        frontier = [child for node in frontier for child in (lefts[node], rights[node]) if child != -1]
+        if not frontier:
+            return depth
+        depth += 1
+
+
+def compile_model(model) -> CompiledForest:
+    """학습된 sklearn 래퍼 모델 종류에 맞게 컴파일"""
+    if hasattr(model, 'get_booster'):
+        return compile_xgboost(model)
+    if hasattr(model, 'booster_'):
+        return compile_lightgbm(model)
+    raise TypeError(f"컴파일할 수 없는 모델 타입: {type(model).__name__}")
+
+
+def max_probability_error(model, forest: CompiledForest, X: np.ndarray) -> float:
+    """원본 모델과 컴파일 모델의 양성 확률 최대 오차"""
+    return float(np.abs(np.asarray(model.predict_proba(X))[:, 1] - forest.predict_proba(X)[:, 1]).max())
+
+
+def load_model(path: str):
+    """모델 로드: .npz는 컴파일된 트리 (학습 라이브러리 import 없음), 그 외는 joblib pickle"""
+    if path.endswith('.npz'):
+        return CompiledForest.load(path)
+    import joblib
+    return joblib.load(path)
+
+
+def main(argv: Optional[List[str]] = None):
+    import os
+    import argparse
+    import joblib
+
+    parser = argparse.ArgumentParser(description='XGBoost/LightGBM 모델을 NumPy 트리 배열(.npz)로 컴파일')
+    parser.add_argument('--xgb', help='XGBoost 모델 pkl 경로')
+    parser.add_argument('--lgbm', help='LightGBM 모델 pkl 경로')
+    parser.add_argument('--out', required=True, help='출력 디렉토리')
+    parser.add_argument('--tolerance', type=float, default=1e-5, help='허용 확률 오차')
+    parser.add_argument('--verify-rows', type=int, default=2000, help='검증용 무작위 히스토그램 행 수')
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    failed = False
+    for model_path in filter(None, (args.xgb, args.lgbm)):
+        model = joblib.load(model_path)
+        forest = compile_model(model)
+        # 검증 입력: 번호판 HSV 히스토그램과 비슷한 범위의 비음수 카운트 (0 포함)
+        rng = np.random.default_rng(0)
+        n_features = getattr(model, 'n_features_in_', None) or int(forest.feature.max()) + 1
+        X = np.floor(rng.gamma(0.5, 150.0, size=(args.verify_rows, n_features))).astype(np.float32)
+        error = max_probability_error(model, forest, X)
+        out_path = os.path.join(args.out, os.path.splitext(os.path.basename(model_path))[0] + '.npz')
+        ok = error <= args.tolerance
+        if ok:
+            forest.save(out_path)       # 허용 오차를 넘으면 기존 .npz를 덮어쓰지 않음
+        failed |= not ok
+        print(f"{model_path} -> {out_path}: {forest.n_trees} trees, {len(forest.feature)} nodes, "
+              f"max depth {forest.max_depth}, max |dp| = {error:.2e} ({'OK' if ok else 'FAIL, not written'})")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
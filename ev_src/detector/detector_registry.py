@@ -0,0 +1,163 @@
+import os
+import yaml
+import atexit
+import logging
+import threading
+import numpy as np
+from typing import Dict, Optional, Tuple
+from .ev_detector_0327 import EVDetector
+from .result_cache import create_detection_cache
+from ..utils.logging_config import setup_logging
+from ..utils.case_capture import CaseCaptureSink, create_case_capture
+from ..utils.prediction_log import PredictionLogWriter, create_prediction_log
+from ..utils.image_processing import FEATURE_DIM
+
+DEFAULT_CONFIG_PATH = 'ev_config/config_0327.yaml'
+
+
+def _load_config(config_path: str) -> dict:
+    """설정 파일 로드"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+class DetectorRegistry:
+    """프로세스 단위로 설정/모델/로거를 한 번만 로드해 재사용하는 레지스트리
+
+    ev_detect()가 호출될 때마다 yaml 로드, 로깅 설정, joblib 모델 로드를
+    반복하지 않도록 최초 접근 시 한 번만 초기화한다 (lazy + thread-safe).
+    """
+
+    def __init__(self, config_path: str = DEFAULT_CONFIG_PATH):
+        self.config_path = config_path
+        self._lock = threading.Lock()
+        self._config: Optional[dict] = None
+        self._detector: Optional[EVDetector] = None
+        self._logger: Optional[logging.Logger] = None
+        self._warmup_result: Optional[Dict] = None
+        self._case_capture: Optional[CaseCaptureSink] = None
+        self._prediction_log: Optional[PredictionLogWriter] = None
+        self._sinks_pid: Optional[int] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._detector is not None
+
+    def get(self) -> Tuple[dict, EVDetector, logging.Logger]:
+        """(config, detector, logger) 반환, 최초 호출 시에만 초기화"""
+        if self._detector is None:
+            with self._lock:
+                # double-checked locking: 다른 스레드가 먼저 초기화했을 수 있음
+                if self._detector is None:
+                    self._load()
+        return self._config, self._detector, self._logger
+
+    def _load(self):
+        config = _load_config(self.config_path)
+        logger = setup_logging(config['paths']['logs_dir'], config)
+        logger.info("EV detecting system Start... (pid=%s)", os.getpid())
+
+        detector = EVDetector(
+            config['model']['xgb_path'],
+            config['model']['lgbm_path'],
+            cache=create_detection_cache(config),     # 프로세스별 캐시 (카메라 간 공유 없음)
+            confidence_threshold=config['processing']['confidence_threshold'],
+            max_processing_time=config['realtime']['performance']['max_processing_time'],
+            fused_preprocess=config['processing'].get('fused_preprocess', False),
+            metrics_history_size=config['processing'].get('metrics_history_size', 1024)
+        )
+
+        # detector를 마지막에 대입해야 get()의 빠른 경로가 반쯤 초기화된 상태를 보지 않음
+        self._config = config
+        self._logger = logger
+        self._detector = detector
+
+    def _process_sinks(self) -> Tuple[Optional[CaseCaptureSink], Optional[PredictionLogWriter]]:
+        """이 프로세스의 진단 저장 단계 (케이스 저장, 종합 판정 로그), 처음 사용할 때 생성
+
+        writer 스레드와 열린 파일은 fork로 제대로 복제되지 않으므로 부모에서 get()으로 미리
+        로드해도 여기서는 만들지 않고, 실제로 기록하는 프로세스에서 만든다.
+        """
+        if self._sinks_pid != os.getpid():
+            config, _, _ = self.get()
+            with self._lock:
+                if self._sinks_pid != os.getpid():
+                    self._case_capture = create_case_capture(config)
+                    self._prediction_log = create_prediction_log(config)
+                    self._sinks_pid = os.getpid()
+                    # fork된 자식은 atexit이 실행되지 않으므로 cc_anpr 워커는 ev_detect.shutdown()을 직접 호출
+                    atexit.register(self.close)
+        return self._case_capture, self._prediction_log
+
+    @property
+    def case_capture(self) -> Optional[CaseCaptureSink]:
+        """불확실/에러 케이스 비동기 저장 단계"""
+        return self._process_sinks()[0]
+
+    @property
+    def prediction_log(self) -> Optional[PredictionLogWriter]:
+        """종합 판정 로그 writer (일자별 파일 핸들 유지 + 버퍼링)"""
+        return self._process_sinks()[1]
+
+    def close(self):
+        """이 프로세스의 진단 저장 단계 종료 (대기 중인 케이스/로그 기록 후)"""
+        with self._lock:
+            sinks = (self._case_capture, self._prediction_log) if self._sinks_pid == os.getpid() else ()
+            self._case_capture = None
+            self._prediction_log = None
+            self._sinks_pid = None
+        for sink in sinks:
+            if sink is not None:
+                sink.close()
+
+    def warmup(self) -> Dict:
+        """카메라 시작 시 호출: 모델 로드 + 더미 추론으로 첫 호출 지연 제거
+
+        프로세스당 한 번만 추론하며, 이후 호출은 첫 결과를 그대로 반환한다.
+        fork 전 부모 프로세스에서는 get()으로 로드만 하고 warmup은 자식에서 호출할 것
+        (XGBoost/LightGBM의 OpenMP 스레드 풀이 부모에서 만들어진 뒤 fork하면 자식이 멈출 수 있음).
+
+        Returns:
+            Dict: 모델 로드 여부 및 warmup 추론 결과 정보
+        """
+        if self._warmup_result is not None:
+            return self._warmup_result
+        config, detector, logger = self.get()
+        dummy = np.zeros((1, FEATURE_DIM), dtype=np.float32)
+        classifier = detector.classifier
+        try:
+            classifier.xgb_model.predict_proba(dummy)
+            if hasattr(classifier.lgbm_model, 'predict_proba'):
+                classifier.lgbm_model.predict_proba(dummy)
+            else:
+                classifier.lgbm_model.predict(dummy)
+            logger.info("EV detector warmup 완료 (pid=%s)", os.getpid())
+            self._warmup_result = {'loaded': True, 'warmed_up': True}
+            return self._warmup_result
+        except Exception as e:
+            logger.warning(f"EV detector warmup 추론 실패: {str(e)}")
+            return {'loaded': True, 'warmed_up': False}
+
+    def reset(self):
+        """로드된 상태 초기화 (설정/모델 재로드가 필요한 경우)"""
+        with self._lock:
+            self._config = None
+            self._detector = None
+            self._logger = None
+            self._warmup_result = None
+
+
+_registries: Dict[str, DetectorRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(config_path: str = DEFAULT_CONFIG_PATH) -> DetectorRegistry:
+    """설정 파일 경로별 프로세스 전역 레지스트리 반환"""
+    registry = _registries.get(config_path)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(config_path)
+            if registry is None:
+                registry = DetectorRegistry(config_path)
+                _registries[config_path] = registry
+    return registry
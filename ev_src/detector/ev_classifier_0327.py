@@ -1,14 +1,17 @@
 import cv2
 import numpy as np
-import joblib
 import logging
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional, Sequence, Union
 import time
 from dataclasses import dataclass
-from ..utils.image_processing import preprocess_image, extract_features, validate_plate_info
+from .compiled_trees import load_model
+from .metrics_history import MetricsHistory
+from ..utils.json_records import JsonRecord, JsonTemplate, encode_bool, encode_float, encode_str
+from ..utils.image_processing import (preprocess_image, extract_features, validate_plate_info,
+                                      FusedPreprocessor, FEATURE_DIM)
 
-@dataclass
-class ProcessingMetrics:
+@dataclass(slots=True)
+class ProcessingMetrics(JsonRecord):
     """처리 메트릭 데이터 클래스"""
     elapsed_time: float     # 처리 시간
     confidence_score: float # 신뢰도 점수
@@ -16,13 +19,21 @@ class ProcessingMetrics:
     error_occurred: bool = False
     error_message: str = None
 
+    _JSON = JsonTemplate((('elapsed_time', encode_float), ('confidence_score', encode_float),
+                          ('model_used', encode_str), ('error_occurred', encode_bool),
+                          ('error_message', encode_str)))
+
+    def _json_values(self):
+        return (self.elapsed_time, self.confidence_score, self.model_used, self.error_occurred, self.error_message)
+
 class EVClassifier:
     def __init__(self, 
                  xgb_model_path: str, 
                  lgbm_model_path: str,
                  confidence_threshold: float = 0.45,
-                 max_processing_time: float = 1.0):
-        self.metrics_history:List[ProcessingMetrics] = []
+                 max_processing_time: float = 1.0,
+                 fused_preprocess: bool = False,
+                 metrics_history_size: int = 1024):
         """전기차 판별 모델 로드
         
         Args:
@@ -30,14 +41,18 @@ class EVClassifier:
             lgbm_model_path (str): LightGBM 모델 경로
             confidence_threshold (float): 예측 신뢰도 임계값
             max_processing_time (float): 최대 처리 시간 (초)
+            fused_preprocess (bool): 크롭/리사이즈/회전을 affine 1회로 처리하는 FusedPreprocessor 사용
+            metrics_history_size (int): 보관할 최근 메트릭 수 (집계는 전체 기간 누적)
         """
         self.logger = logging.getLogger(__name__)
+        self.metrics_history = MetricsHistory(metrics_history_size)  # 메트릭 히스토리 (고정 용량 링 버퍼)
         try:
-            self.xgb_model = joblib.load(xgb_model_path)
-            self.lgbm_model = joblib.load(lgbm_model_path)
+            # .npz(컴파일된 트리)면 xgboost/lightgbm을 import하지 않음
+            self.xgb_model = load_model(xgb_model_path)
+            self.lgbm_model = load_model(lgbm_model_path)
             self.confidence_threshold = confidence_threshold
             self.max_processing_time = max_processing_time
-            self.metrics_history: List[ProcessingMetrics] = []  # 메트릭 히스토리 저장
+            self.preprocess = FusedPreprocessor() if fused_preprocess else preprocess_image
         except Exception as e:
             self.logger.error(f"모델 로드 실패: {str(e)}")
             raise
@@ -51,78 +66,114 @@ class EVClassifier:
         Returns:
             Tuple[bool, ProcessingMetrics]: (예측 결과, 처리 메트릭)
         """
-        try:
-            start_time = time.time()
-            
-            # 입력 검증
-            if not isinstance(frame, np.ndarray):
-                raise TypeError("frame은 numpy array여야 합니다.")
-            if not validate_plate_info(plate_info):
-                raise ValueError("유효하지 않은 번호판 정보입니다.")
-            
-            # 번호판 정보 추출
-            area = plate_info['area']
-            crop_box = (area['x'], area['y'], area['width'], area['height'])
-            
-            # 이미지 전처리
-            hsv_image = preprocess_image(frame, crop_box, area.get('angle', 0))
-            
-            # 특징 추출
-            features = extract_features(hsv_image)
-            
-            # 예측
-            xgb_pred = self.xgb_model.predict([features])[0]
-            xgb_prob = self.xgb_model.predict_proba([features])[0][1]
-            
-            # 신뢰도 기반 앙상블
-            if xgb_prob < self.confidence_threshold:
-                prediction = self.lgbm_model.predict([features])[0]
-                model_used = 'lgbm'
-                # LightGBM add 0417 am 10:04 modified
-                lgbm_prob = self.lgbm_model.predict_proba([features])[0][1] if hasattr(self.lgbm_model, 'predict_proba') else xgb_prob	# 0417 predict_proba X-> xgb_prob use 
-                confidence_score = lgbm_prob	# 0417
-            else:
-                prediction = xgb_pred
-                model_used = 'xgb'
-                
-                confidence_score = xgb_prob	# 0417 am 10:04 modified
-            	
-            elapsed_time = time.time() - start_time
-            metrics = ProcessingMetrics(
-                elapsed_time=elapsed_time,
-                confidence_score=xgb_prob,
-                model_used=model_used
-            )
-            
-            if elapsed_time > self.max_processing_time:
-                self.logger.warning(f"처리 시간 초과: {elapsed_time:.2f}초")
-            
-            self.metrics_history.append(metrics)
-            return bool(prediction), metrics
-            
-        except Exception as e:
-            self.logger.error(f"프레임 처리 중 오류 발생: {str(e)}")    
-            metrics = ProcessingMetrics(
-                elapsed_time=time.time() - start_time,       # 오류 발생해도도 처리 시간 저장  
-                confidence_score=0.0,                        # 오류 발생으로 예측 신뢰도 0.0
-                model_used='none',                           # 사용된 모델 없음
-                error_occurred=True,                         # 오류 발생 표시
-                error_message=str(e)                         # 오류 상세 내용 str(e)로 저장
-            )
-            raise
+        (prediction, metrics), = self.predict_batch([frame], [plate_info])
+        if metrics.error_occurred:
+            raise ValueError(metrics.error_message)
+        return prediction, metrics
+
+    def _extract_row(self, frame: np.ndarray, plate_info: Dict, out: np.ndarray) -> np.ndarray:
+        """번호판 1개의 특징 벡터를 out(특징 행렬의 한 행)에 추출 (입력 검증 포함)"""
+        if not isinstance(frame, np.ndarray):
+            raise TypeError("frame은 numpy array여야 합니다.")
+        if not validate_plate_info(plate_info):
+            raise ValueError("유효하지 않은 번호판 정보입니다.")
+
+        # 번호판 정보 추출
+        area = plate_info['area']
+        crop_box = (area['x'], area['y'], area['width'], area['height'])
+
+        # 이미지 전처리 및 특징 추출
+        hsv_image = self.preprocess(frame, crop_box, area.get('angle', 0))
+        return extract_features(hsv_image, out)
+
+    @staticmethod
+    def _predict_positive(model, rows: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """predict_proba 한 번으로 (예측 라벨, 양성 확률) 계산 (predict_proba가 없으면 predict만 사용)"""
+        if not hasattr(model, 'predict_proba'):
+            return np.asarray(model.predict(rows)), None
+        proba = np.asarray(model.predict_proba(rows))
+        # sklearn 분류기 predict와 동일: classes_[argmax(proba)] (동률이면 앞 클래스)
+        classes = getattr(model, 'classes_', None)
+        labels = np.argmax(proba, axis=1)
+        predictions = np.asarray(classes)[labels] if classes is not None else labels
+        return predictions, proba[:, 1]
+
+    def predict_batch(self, frames: Union[np.ndarray, Sequence[np.ndarray]],
+                      plate_infos: Sequence[Dict]) -> List[Tuple[Optional[bool], ProcessingMetrics]]:
+        """번호판 여러 개 일괄 예측
+
+        특징 벡터를 2차원 배열로 쌓아 XGBoost predict_proba를 한 번만 호출하고,
+        신뢰도가 임계값보다 낮은 행만 모아 LightGBM에 한 번 더 넘긴다.
+
+        Args:
+            frames: 번호판별 입력 이미지 목록 (단일 np.ndarray면 모든 번호판이 같은 프레임)
+            plate_infos (Sequence[Dict]): 번호판 정보 목록
+        Returns:
+            List[Tuple[Optional[bool], ProcessingMetrics]]: plate_infos 순서의 (예측 결과, 처리 메트릭).
+                전처리에 실패한 행은 (None, error_occurred=True 메트릭)
+        """
+        if isinstance(frames, np.ndarray):
+            frames = [frames] * len(plate_infos)
+        if len(frames) != len(plate_infos):
+            raise ValueError("frames와 plate_infos의 길이가 다릅니다.")
+
+        results: List[Tuple[Optional[bool], ProcessingMetrics]] = [None] * len(plate_infos)
+        row_times = [0.0] * len(plate_infos)
+        features = np.empty((len(plate_infos), FEATURE_DIM), dtype=np.float32)
+        row_indices = []
+
+        # 행별 전처리/특징 추출 (실패한 행만 오류 메트릭, 나머지는 계속 처리)
+        for index, (frame, plate_info) in enumerate(zip(frames, plate_infos)):
+            row_start = time.time()
+            try:
+                self._extract_row(frame, plate_info, features[len(row_indices)])
+                row_indices.append(index)
+            except Exception as e:
+                self.logger.error(f"프레임 처리 중 오류 발생: {str(e)}")
+                results[index] = (None, ProcessingMetrics(
+                    elapsed_time=time.time() - row_start,        # 오류 발생해도 처리 시간 저장
+                    confidence_score=0.0,                        # 오류 발생으로 예측 신뢰도 0.0
+                    model_used='none',                           # 사용된 모델 없음
+                    error_occurred=True,                         # 오류 발생 표시
+                    error_message=str(e)                         # 오류 상세 내용 str(e)로 저장
+                ))
+            row_times[index] = time.time() - row_start
+
+        if row_indices:
+            try:
+                model_start = time.time()
+                features = features[:len(row_indices)]
+
+                # 예측 (XGBoost 1회)
+                predictions, xgb_probs = self._predict_positive(self.xgb_model, features)
+                predictions = predictions.astype(bool)
+                models_used = np.full(len(row_indices), 'xgb', dtype=object)
+
+                # 신뢰도 기반 앙상블: 낮은 신뢰도 행만 LightGBM 1회
+                low = np.flatnonzero(xgb_probs < self.confidence_threshold)
+                if low.size:
+                    lgbm_predictions, _ = self._predict_positive(self.lgbm_model, features[low])
+                    predictions[low] = lgbm_predictions.astype(bool)
+                    models_used[low] = 'lgbm'
+                model_time = (time.time() - model_start) / len(row_indices)   # 모델 시간은 행 수로 나눠 배분
+            except Exception as e:
+                self.logger.error(f"프레임 처리 중 오류 발생: {str(e)}")
+                raise
+
+            for position, index in enumerate(row_indices):
+                elapsed_time = row_times[index] + model_time
+                metrics = ProcessingMetrics(
+                    elapsed_time=elapsed_time,
+                    confidence_score=float(xgb_probs[position]),
+                    model_used=models_used[position]
+                )
+                if elapsed_time > self.max_processing_time:
+                    self.logger.warning(f"처리 시간 초과: {elapsed_time:.2f}초")
+                results[index] = (bool(predictions[position]), metrics)
+
+        self.metrics_history.extend(metrics for _, metrics in results)
+        return results
 
     def get_metrics_summary(self) -> Dict:
-        """처리 메트릭 요약 정보 반환"""
-        if not self.metrics_history:
-            return {}
-            
-        return {
-            'total_processed': len(self.metrics_history),
-            'avg_processing_time': np.mean([m.elapsed_time for m in self.metrics_history]), # 평균 처리 시간간
-            'avg_confidence': np.mean([m.confidence_score for m in self.metrics_history]),  # 신뢰도
-            'error_rate': sum(1 for m in self.metrics_history if m.error_occurred) / len(self.metrics_history),
-            'model_usage': {
-                'xgb': sum(1 for m in self.metrics_history if m.model_used == 'xgb'),
-                'lgbm': sum(1 for m in self.metrics_history if m.model_used == 'lgbm')
-            }
-        } 
+        """처리 메트릭 요약 정보 반환 (누적 집계, O(1))"""
+        return self.metrics_history.summary()
@@ -1,15 +1,17 @@
 import cv2
 import numpy as np
 import logging
-from typing import Dict
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import time
-import json
 from .ev_classifier_0327 import EVClassifier, ProcessingMetrics
+from .result_cache import DetectionCache, plate_signature, reuse_result
+from ..utils.logging_config import log_plate_payload
+from ..utils.json_records import JsonRecord, JsonTemplate, encode_any, encode_bool, encode_float, encode_str
 
-@dataclass
-class DetectionResult:
+@dataclass(slots=True)
+class DetectionResult(JsonRecord):
     """검출 결과 데이터 클래스"""
     plate_number: str   # 번호판 번호
     is_ev: bool         # 전기차 여부
@@ -18,17 +20,30 @@ class DetectionResult:
     processing_time: float  # 처리 시간
     plate_area: Dict    # 번호판 위치 정보
     metrics: ProcessingMetrics  # 처리 메트릭
+    cache_hit: bool = False     # 캐시된 판정 재사용 여부
+
+    # save_results 형식 (cache_hit 제외)
+    _JSON = JsonTemplate((('plate_number', encode_str), ('is_ev', encode_bool), ('confidence', encode_float),
+                          ('processing_time', encode_float), ('timestamp', encode_str), ('plate_area', encode_any),
+                          ('metrics', encode_any)))
+
+    def _json_values(self):
+        return (self.plate_number, self.is_ev, self.confidence, self.processing_time, self.timestamp.isoformat(),
+                self.plate_area, self.metrics)
 
 class EVDetector:
-    def __init__(self, xgb_model_path: str, lgbm_model_path: str, **kwargs):
+    def __init__(self, xgb_model_path: str, lgbm_model_path: str, cache: Optional[DetectionCache] = None,
+                 **kwargs):
         """초기화
         
         Args:
             xgb_model_path (str): XGBoost 모델 경로
             lgbm_model_path (str): LightGBM 모델 경로
+            cache (DetectionCache): 번호판 텍스트 + 크롭 해시 기반 판정 캐시 (None이면 사용 안 함)
             **kwargs: EVClassifier에 전달할 추가 파라미터
         """
         self.logger = logging.getLogger(__name__)
+        self.cache = cache
         try:
             self.classifier = EVClassifier(xgb_model_path, lgbm_model_path, **kwargs)
             self.logger.info("EVDetector 초기화 완료")
@@ -42,7 +57,7 @@ class EVDetector:
             start_time = time.time()
             
             # plate_info 구조 로깅
-            self.logger.info(f"입력된 plate_info 구조: {json.dumps(plate_info, indent=2, ensure_ascii=False)}")
+            log_plate_payload(self.logger, plate_info)
             
             # 번호판 정보 추출
             if isinstance(plate_info, list) :
@@ -55,71 +70,76 @@ class EVDetector:
             if not area:
                 raise ValueError("번호판 영역 정보를 찾을 수 없습니다.")
             
-            # 이미지 처리 및 예측
-            is_ev, metrics = self.classifier.process_frame(frame, plate_info)
+            # 이미지 처리 및 예측 (캐시 적중 시 재사용)
+            result = self._detect(frame, [plate_info])[0]
+            if result.metrics.error_occurred:
+                raise ValueError(result.metrics.error_message)
+            return result
             
-            # 결과 생성
-            return DetectionResult(
+        except Exception as e:
+            self.logger.error(f"프레임 처리 중 오류 발생: {str(e)}")
+            raise
+
+    def process_frames(self, frame: np.ndarray, plate_infos: List[Dict]) -> List[DetectionResult]:
+        """한 프레임의 번호판 여러 개 처리 (plate_infos 순서대로 결과 반환, 모델은 번호판 수와 무관하게 1회씩 호출)
+
+        전처리에 실패한 번호판은 예외 대신 is_ev=None, metrics.error_occurred=True 결과로 반환하고
+        나머지 번호판은 정상 판정한다 (모델 호출 자체가 실패하면 예외).
+        """
+        try:
+            for plate_info in plate_infos:
+                log_plate_payload(self.logger, plate_info)
+                if not plate_info.get('area'):
+                    raise ValueError("번호판 영역 정보를 찾을 수 없습니다.")
+            return self._detect(frame, plate_infos)
+
+        except Exception as e:
+            self.logger.error(f"프레임 처리 중 오류 발생: {str(e)}")
+            raise
+
+    def _detect(self, frame: np.ndarray, plate_infos: List[Dict]) -> List[DetectionResult]:
+        """캐시 조회 후 미스인 번호판만 분류기 1회 호출로 판정 (plate_infos 순서대로 반환)"""
+        results: List[Optional[DetectionResult]] = [None] * len(plate_infos)
+        signatures: List[Optional[bytes]] = [None] * len(plate_infos)
+        pending = list(range(len(plate_infos)))
+        if self.cache is not None:
+            pending = []
+            for index, plate_info in enumerate(plate_infos):
+                lookup_start = time.time()
+                signatures[index] = plate_signature(frame, plate_info['area'])
+                cached = self.cache.get(plate_info.get('text', ''), signatures[index])
+                if cached is None:
+                    pending.append(index)
+                else:
+                    results[index] = reuse_result(cached, plate_info, time.time() - lookup_start)
+        if not pending:
+            return results
+
+        # 행별 전처리 오류는 predict_batch가 해당 행의 오류 메트릭으로 반환 (다른 행은 계속 판정)
+        predictions = self.classifier.predict_batch(frame, [plate_infos[index] for index in pending])
+
+        timestamp = datetime.now()
+        for index, (is_ev, metrics) in zip(pending, predictions):
+            plate_info = plate_infos[index]
+            results[index] = DetectionResult(
                 plate_number=plate_info.get('text', ''),
                 is_ev=is_ev,
                 confidence=metrics.confidence_score,
-                timestamp=datetime.now(),
+                timestamp=timestamp,
                 processing_time=metrics.elapsed_time,
-                plate_area=area,
+                plate_area=plate_info['area'],
                 metrics=metrics
             )
-            
-        except Exception as e:
-            self.logger.error(f"프레임 처리 중 오류 발생: {str(e)}")
-            raise
-
-    def convert_numpy_types(obj):
-        """딕셔너리/리스트 내의 numpy 타입을 파이썬 기본 타입으로 변환"""
-        if isinstance(obj, dict):
-            return {k: convert_numpy_types(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_numpy_types(i) for i in obj]
-        elif isinstance(obj, (np.int_, np.intc, np.intp, np.int8,
-                            np.int16, np.int32, np.int64, np.uint8,
-                            np.uint16, np.uint32, np.uint64)):
-            return int(obj)
-        elif isinstance(obj, (np.float_, np.float16, np.float32, 
-                            np.float64)):
-            return float(obj)
-        elif isinstance(obj, (np.ndarray,)): # ndarray를 리스트로 변환 (필요시)
-            return obj.tolist()
-        elif isinstance(obj, (np.bool_)):
-            return bool(obj)
-        elif isinstance(obj, (np.void)): # void 타입 처리 (필요시)
-            return None
-        return obj
+            if self.cache is not None and not metrics.error_occurred:
+                self.cache.put(results[index].plate_number, signatures[index], results[index])
+        return results
 
     def save_results(self, results: list[DetectionResult], output_path: str):
         """결과 저장"""
         try:
-            # 결과를 딕셔너리 리스트로 변환
-            results_dict = [
-                {
-                    'plate_number': r.plate_number,
-                    'is_ev': r.is_ev,
-                    'confidence': r.confidence,
-                    'processing_time': r.processing_time,
-                    'timestamp': r.timestamp.isoformat(),
-                    'plate_area': r.plate_area,
-                    'metrics': {
-                        'elapsed_time': r.metrics.elapsed_time,
-                        'confidence_score': r.metrics.confidence_score,
-                        'model_used': r.metrics.model_used,
-                        'error_occurred': r.metrics.error_occurred,
-                        'error_message': r.metrics.error_message
-                    }
-                }
-                for r in results
-            ]
-                
-            # JSON 파일로 저장
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(results_dict, f, indent=4, ensure_ascii=False)
+            # JSON 배열로 저장 (결과 1건당 한 줄)
+            with open(output_path, 'wb') as f:
+                f.write(b'[\n' + b',\n'.join(r.to_json_bytes() for r in results) + b'\n]\n')
                 
             self.logger.info(f"결과가 {output_path}에 저장되었습니다.")
                 
@@ -129,4 +149,7 @@ class EVDetector:
 
     def get_metrics_summary(self) -> Dict:
         """처리 메트릭 요약 정보 반환"""
-        return self.classifier.get_metrics_summary() 
\ No newline at end of file
+        summary = self.classifier.get_metrics_summary()
+        if self.cache is not None and summary:
+            summary['result_cache'] = self.cache.stats()
+        return summary
@@ -0,0 +1,107 @@
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 지연 시간 히스토그램 버킷 상한 (초), 마지막 버킷은 상한 초과분
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+
+
+class MetricsRecord:
+    """링 버퍼 한 칸 (슬롯을 미리 만들어 두고 값만 덮어씀)"""
+    __slots__ = ('elapsed_time', 'confidence_score', 'model_used', 'error_occurred', 'error_message')
+
+    def __init__(self):
+        self.elapsed_time = 0.0
+        self.confidence_score = 0.0
+        self.model_used = 'none'
+        self.error_occurred = False
+        self.error_message: Optional[str] = None
+
+
+class MetricsHistory:
+    """고정 용량 메트릭 히스토리 + 누적 집계
+
+    최근 capacity개 레코드만 보관하고 (오래된 것부터 덮어씀), 전체 기간 집계(건수, 평균,
+    오류 수, 모델별 사용 수, 지연 시간 히스토그램)는 추가 시점에 갱신한다.
+    summary()는 보관 레코드 수와 무관하게 O(1)이며 메모리는 가동 기간과 무관하게 일정하다.
+    """
+    __slots__ = ('capacity', '_records', '_next', '_size', 'count', 'error_count',
+                 '_elapsed_sum', '_confidence_sum', 'model_usage', 'latency_histogram')
+
+    def __init__(self, capacity: int = 1024):
+        if capacity <= 0:
+            raise ValueError("capacity는 1 이상이어야 합니다.")
+        self.capacity = capacity
+        self._records: List[MetricsRecord] = [MetricsRecord() for _ in range(capacity)]
+        self._next = 0
+        self._size = 0
+        self.count = 0
+        self.error_count = 0
+        self._elapsed_sum = 0.0
+        self._confidence_sum = 0.0
+        self.model_usage: Dict[str, int] = {'xgb': 0, 'lgbm': 0}
+        self.latency_histogram: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def append(self, metrics):
+        """ProcessingMetrics(또는 같은 필드를 가진 객체) 1건 기록"""
+        record = self._records[self._next]
+        record.elapsed_time = metrics.elapsed_time
+        record.confidence_score = metrics.confidence_score
+        record.model_used = metrics.model_used
+        record.error_occurred = metrics.error_occurred
+        record.error_message = metrics.error_message
+        self._next = (self._next + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+        self.count += 1
+        self._elapsed_sum += metrics.elapsed_time
+        self._confidence_sum += metrics.confidence_score
+        if metrics.error_occurred:
+            self.error_count += 1
+        if metrics.model_used in self.model_usage:
+            self.model_usage[metrics.model_used] += 1
+        self.latency_histogram[bisect_left(LATENCY_BUCKETS, metrics.elapsed_time)] += 1
+
+    def extend(self, metrics_iterable):
+        for metrics in metrics_iterable:
+            self.append(metrics)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[MetricsRecord]:
+        """보관 중인 레코드를 오래된 것부터 순회 (레코드는 재사용되므로 값이 필요하면 복사할 것)"""
+        start = (self._next - self._size) % self.capacity
+        for offset in range(self._size):
+            yield self._records[(start + offset) % self.capacity]
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        """히스토그램 기준 지연 시간 분위수 (해당 버킷 상한, 초과 버킷이면 None)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.latency_histogram):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else None
+        return None
+
+    def summary(self) -> Dict:
+        """누적 집계 요약 (get_metrics_summary 형식 + 지연 시간 히스토그램)"""
+        if not self.count:
+            return {}
+        return {
+            'total_processed': self.count,
+            'avg_processing_time': self._elapsed_sum / self.count,
+            'avg_confidence': self._confidence_sum / self.count,
+            'error_rate': self.error_count / self.count,
+            'model_usage': dict(self.model_usage),
+            'latency_histogram': {
+                'bucket_upper_bounds': list(LATENCY_BUCKETS),
+                'counts': list(self.latency_histogram),
+                'p50_upper_bound': self.latency_quantile(0.5),
+                'p95_upper_bound': self.latency_quantile(0.95),
+            },
+            'history_size': self._size,
+        }
@@ -0,0 +1,139 @@
+from collections.abc import Mapping
+from typing import Dict, Optional
+from .ev_detector_0327 import DetectionResult
+from ..utils.json_records import JsonRecord, JsonTemplate, encode_any, encode_bool, encode_float, encode_str
+
+AREA_KEYS = ('angle', 'height', 'width', 'x', 'y')
+METRICS_KEYS = ('elapsed_time', 'confidence_score', 'model_used', 'error_occurred', 'error_message')
+_KEYS = ('area', 'attrs', 'conf', 'elapsed', 'ev', 'text', 'timestamp', 'metrics')
+
+
+class DetectionRecord(JsonRecord, Mapping):
+    """ev_detect 판정 결과 (원본 plate_info + DetectionResult)
+
+    기존 판정 결과 dict와 같은 키로 읽을 수 있는 읽기 전용 Mapping이며
+    (result['ev'], result['conf']['ev'], result.get('metrics', {}) 등, 하위 dict는 조회할 때마다 새로 만듦),
+    to_json_bytes()는 기존 dict를 json.dumps 한 것과 같은 바이트를 만든다.
+    """
+    __slots__ = ('area', 'ev', 'conf_ocr', 'conf_plate', 'conf_ev', 'elapsed', 'text', 'timestamp',
+                 'elapsed_time', 'confidence_score', 'model_used', 'error_occurred', 'error_message')
+
+    _JSON = JsonTemplate((
+        ('area', tuple((key, encode_float) for key in AREA_KEYS)),
+        ('attrs', (('ev', encode_bool),)),
+        ('conf', (('ocr', encode_float), ('plate', encode_float), ('ev', encode_float))),
+        ('elapsed', encode_float),
+        ('ev', encode_bool),
+        ('text', encode_str),
+        ('timestamp', encode_str),
+        ('metrics', (('elapsed_time', encode_float), ('confidence_score', encode_float), ('model_used', encode_str),
+                     ('error_occurred', encode_bool), ('error_message', encode_str))),
+    ))
+
+    def __init__(self, plate_info: Dict, result: DetectionResult):
+        # 원본 plate_info의 area/conf(ocr, plate)와 detector 결과를 파이썬 기본 타입으로 보관
+        area = plate_info['area']
+        conf = plate_info['conf']
+        metrics = result.metrics
+        self.area = tuple(float(area[key]) for key in AREA_KEYS)
+        self.ev = bool(result.is_ev)
+        self.conf_ocr = float(conf['ocr'])
+        self.conf_plate = float(conf['plate'])
+        self.conf_ev = float(result.confidence)
+        self.elapsed = float(result.processing_time)
+        self.text = str(result.plate_number)
+        self.timestamp = result.timestamp.isoformat()
+        self.elapsed_time = float(metrics.elapsed_time)
+        self.confidence_score = float(metrics.confidence_score)
+        self.model_used = str(metrics.model_used)
+        self.error_occurred = bool(metrics.error_occurred)
+        self.error_message = str(metrics.error_message)
+
+    def _json_values(self):
+        return (*self.area, self.ev, self.conf_ocr, self.conf_plate, self.conf_ev, self.elapsed, self.ev, self.text,
+                self.timestamp, self.elapsed_time, self.confidence_score, self.model_used, self.error_occurred,
+                self.error_message)
+
+    def __getitem__(self, key: str):
+        if key == 'area':
+            return dict(zip(AREA_KEYS, self.area))
+        if key == 'attrs':
+            return {'ev': self.ev}
+        if key == 'conf':
+            return {'ocr': self.conf_ocr, 'plate': self.conf_plate, 'ev': self.conf_ev}
+        if key == 'metrics':
+            return {key: getattr(self, key) for key in METRICS_KEYS}
+        if key in ('elapsed', 'ev', 'text', 'timestamp'):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(_KEYS)
+
+    def __len__(self) -> int:
+        return len(_KEYS)
+
+    def __repr__(self) -> str:
+        return f"DetectionRecord({self.to_json_str()})"
+
+
+class PredictionLogRecord(JsonRecord):
+    """종합 판정 로그(predictions.jsonl) 1줄"""
+    __slots__ = ('timestamp', 'plate_number', 'ts_ev_prediction', 'my_model_ev_prediction', 'my_model_confidence',
+                 'model_used', 'processing_time', 'saved_in_uncertain')
+
+    _JSON = JsonTemplate((('timestamp', encode_str), ('plate_number', encode_str), ('ts_ev_prediction', encode_bool),
+                          ('my_model_ev_prediction', encode_bool), ('my_model_confidence', encode_float),
+                          ('model_used', encode_str), ('processing_time', encode_float),
+                          ('saved_in_uncertain', encode_bool)))
+
+    def __init__(self, timestamp: str, plate_number: str, ts_ev_prediction: Optional[bool],
+                 my_model_ev_prediction: Optional[bool], my_model_confidence: Optional[float],
+                 model_used: Optional[str], processing_time: Optional[float], saved_in_uncertain: bool):
+        self.timestamp = timestamp                          # 기록 시각
+        self.plate_number = plate_number                    # 번호판 번호
+        self.ts_ev_prediction = ts_ev_prediction            # TS 엔진 예측
+        self.my_model_ev_prediction = my_model_ev_prediction    # 사용자 모델 최종 예측
+        self.my_model_confidence = my_model_confidence      # 사용자 모델 신뢰도 점수
+        self.model_used = model_used                        # 사용된 모델 ('xgb' or 'lgbm')
+        self.processing_time = processing_time              # 처리 시간
+        self.saved_in_uncertain = saved_in_uncertain        # uncertain_cases 저장 여부 (참고용)
+
+    def _json_values(self):
+        return (self.timestamp, self.plate_number, self.ts_ev_prediction, self.my_model_ev_prediction,
+                self.my_model_confidence, self.model_used, self.processing_time, self.saved_in_uncertain)
+
+
+class UncertainCaseRecord(JsonRecord):
+    """불확실 판정 케이스 JSON (image_path는 이미지 저장 후 채움)"""
+    __slots__ = ('timestamp', 'input_plate_info', 'detection_result', 'image_path', 'metrics')
+
+    _JSON = JsonTemplate((('timestamp', encode_str), ('input_plate_info', encode_any),
+                          ('detection_result', encode_any), ('image_path', encode_str), ('metrics', encode_any)))
+
+    def __init__(self, timestamp: str, input_plate_info: Dict, detection_result, image_path: Optional[str] = None):
+        self.timestamp = timestamp
+        self.input_plate_info = input_plate_info
+        self.detection_result = detection_result
+        self.image_path = image_path
+        self.metrics = detection_result.get('metrics', {})
+
+    def _json_values(self):
+        return (self.timestamp, self.input_plate_info, self.detection_result, self.image_path, self.metrics)
+
+
+class ErrorCaseRecord(JsonRecord):
+    """에러 케이스 JSON (image_path는 이미지 저장 후 채움)"""
+    __slots__ = ('timestamp', 'plate_info', 'error_message', 'image_path')
+
+    _JSON = JsonTemplate((('timestamp', encode_str), ('plate_info', encode_any), ('error_message', encode_str),
+                          ('image_path', encode_str)))
+
+    def __init__(self, timestamp: str, plate_info: Dict, error_message: str, image_path: Optional[str] = None):
+        self.timestamp = timestamp
+        self.plate_info = plate_info
+        self.error_message = error_message
+        self.image_path = image_path
+
+    def _json_values(self):
+        return (self.timestamp, self.plate_info, self.error_message, self.image_path)
@@ -0,0 +1,151 @@
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from ..utils.image_processing import clamp_crop_box
+
+SIGNATURE_GRID = (4, 2)     # (가로, 세로) 칸 수, 칸별 평균 BGR → 24바이트
+
+
+def plate_signature(frame: np.ndarray, area: Dict) -> Optional[bytes]:
+    """번호판 크롭의 압축 perceptual signature (4x2 격자 칸별 평균 BGR, uint8 24바이트)
+
+    비트 해시(dHash 등)는 번호판의 평평한 바탕에서 센서 노이즈와 박스 흔들림에 비트가 쉽게
+    뒤집히므로, 분류기가 보는 색 분포를 거칠게 요약한 평균 색 격자를 쓴다.
+    회전/HSV 변환 없이 크롭만 축소하므로 전체 전처리보다 훨씬 싸다.
+    영역이 잘못된 경우 None (캐시를 건너뛰고 분류기 쪽에서 오류 처리).
+    """
+    try:
+        x1, y1, x2, y2 = clamp_crop_box(frame, (area['x'], area['y'], area['width'], area['height']))
+        small = cv2.resize(frame[y1:y2, x1:x2], SIGNATURE_GRID, interpolation=cv2.INTER_AREA)
+    except Exception:
+        return None
+    return small.tobytes()
+
+
+def signature_distance(a: bytes, b: bytes) -> int:
+    """두 signature의 칸/채널별 최대 밝기 차이 (0~255)"""
+    if len(a) != len(b):
+        return 255
+    return int(np.abs(np.frombuffer(a, np.uint8).astype(np.int16) - np.frombuffer(b, np.uint8)).max())
+
+
+class _CacheEntry:
+    __slots__ = ('signature', 'result', 'stored_at')
+
+    def __init__(self, signature: bytes, result, stored_at: float):
+        self.signature = signature
+        self.result = result
+        self.stored_at = stored_at
+
+
+class DetectionCache:
+    """번호판 텍스트 + 크롭 perceptual signature 기반 판정 결과 캐시 (LRU + TTL)
+
+    같은 차량이 투표 창 이동이나 재입차로 다시 확정될 때 TTL 안에 거의 같은
+    크롭(signature_distance가 max_distance 이하)이 들어오면 이전 DetectionResult를 재사용한다.
+    이미지는 보관하지 않고 항목 수(max_entries)로 메모리를 제한한다.
+
+    캐시는 프로세스 메모리에만 있다. cc_anpr는 카메라(공유 풀 모드는 worker)마다 별도 프로세스이고
+    부모에서 미리 로드한 캐시도 fork 후에는 각자 사본이므로, 다른 카메라에서 확정된 판정은 재사용되지 않는다.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 300.0, max_distance: int = 48,
+                 max_variants: int = 4):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = max_distance
+        self.max_variants = max_variants        # 텍스트 하나당 보관할 크롭 signature 수
+        self._entries: 'OrderedDict[str, List[_CacheEntry]]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, plate_text: str, signature: Optional[bytes], now: Optional[float] = None):
+        """캐시된 DetectionResult 반환 (없으면 None, 미스로 집계)"""
+        if not plate_text or signature is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            variants = self._entries.get(plate_text)
+            if variants:
+                fresh = [entry for entry in variants if now - entry.stored_at <= self.ttl_seconds]
+                if len(fresh) != len(variants):
+                    self.expirations += len(variants) - len(fresh)
+                    self._size -= len(variants) - len(fresh)
+                    if fresh:
+                        self._entries[plate_text] = fresh
+                    else:
+                        del self._entries[plate_text]
+                for entry in fresh:
+                    if signature_distance(entry.signature, signature) <= self.max_distance:
+                        self._entries.move_to_end(plate_text)
+                        self.hits += 1
+                        return entry.result
+            self.misses += 1
+            return None
+
+    def put(self, plate_text: str, signature: Optional[bytes], result, now: Optional[float] = None):
+        if not plate_text or signature is None:
+            return
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            variants = self._entries.setdefault(plate_text, [])
+            self._entries.move_to_end(plate_text)
+            variants.append(_CacheEntry(signature, result, now))
+            self._size += 1
+            if len(variants) > self.max_variants:
+                del variants[0]
+                self._size -= 1
+                self.evictions += 1
+            # 가장 오래 사용되지 않은 텍스트부터 제거
+            while self._size > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += len(evicted)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': self._size,
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+def reuse_result(cached, plate_info: Dict, lookup_time: float):
+    """캐시된 결과를 현재 번호판 위치/시각으로 갱신한 사본 (metrics는 원래 분류 결과 그대로)"""
+    return replace(cached, timestamp=datetime.now(), processing_time=lookup_time,
+                   plate_area=plate_info['area'], cache_hit=True)
+
+
+def create_detection_cache(config: dict) -> Optional[DetectionCache]:
+    """config의 'result_cache' 항목으로 캐시 생성 (비활성 시 None)"""
+    cache_config = config.get('result_cache', {})
+    if not cache_config.get('enabled', False):
+        return None
+    return DetectionCache(
+        max_entries=cache_config.get('max_entries', 2048),
+        ttl_seconds=cache_config.get('ttl_seconds', 300.0),
+        max_distance=cache_config.get('max_distance', 48),
+        max_variants=cache_config.get('max_variants', 4),
+    )
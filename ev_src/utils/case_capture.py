@@ -0,0 +1,243 @@
+import os
+import cv2
+import json
+import queue
+import random
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import numpy as np
+from .json_records import JsonRecord, to_builtin
+
+logger = logging.getLogger(__name__)
+
+CASE_UNCERTAIN = 'uncertain'
+CASE_ERROR = 'error'
+
+
+class _Case:
+    """저장 대기 중인 진단 케이스 1건 (이미지는 호출 시점에 복사/축소된 배열, hour는 예산 시간대)"""
+    __slots__ = ('kind', 'base_dir', 'timestamp', 'hour', 'image', 'info')
+
+    def __init__(self, kind: str, base_dir: str, timestamp: datetime, image: Optional[np.ndarray],
+                 info: Union[Dict, JsonRecord]):
+        self.kind = kind
+        self.base_dir = base_dir
+        self.timestamp = timestamp
+        self.hour = _hour_of(timestamp)
+        self.image = image
+        self.info = info
+
+
+def _hour_of(timestamp: datetime) -> datetime:
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+class CaseCaptureSink:
+    """불확실/에러 케이스 진단 저장을 인식 경로 밖에서 처리하는 비동기 저장 단계
+
+    호출 스레드는 시간당 예산 판정과 프레임 복사(또는 축소)만 하고, JPEG 인코딩/디렉토리 생성/
+    JSON 쓰기는 writer 스레드가 처리한다. 매 정시마다 예산(hourly_budget)이 새로 시작되며,
+    예산을 넘긴 케이스는 크기 reservoir_size의 reservoir sampling으로 그 시간대의 균등 표본만
+    남겼다가 시간이 바뀔 때 기록한다. 큐가 가득 차면 기다리지 않고 버리고 dropped로 집계한다.
+    """
+
+    def __init__(self, max_queue_size: int = 32, hourly_budget: int = 300, reservoir_size: int = 30,
+                 jpeg_quality: int = 95, clock: Callable[[], datetime] = datetime.now, seed: Optional[int] = None):
+        """
+        Args:
+            max_queue_size (int): 기록 대기 가능한 최대 케이스 수
+            hourly_budget (int): 시간대별로 바로 기록하는 최대 케이스 수
+            reservoir_size (int): 예산 초과 케이스 중 시간대별로 남길 표본 수
+            jpeg_quality (int): JPEG 품질 (cv2.IMWRITE_JPEG_QUALITY, 기본값은 cv2 기본값과 동일)
+            clock: 현재 시각 함수 (시간대 구분 및 파일명용)
+            seed: reservoir sampling 난수 시드
+        """
+        self.hourly_budget = hourly_budget
+        self.reservoir_size = reservoir_size
+        self._clock = clock
+        self._rng = random.Random(seed)
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)]
+        self._created_dirs = set()
+        self._lock = threading.Lock()
+        self._hour: Optional[datetime] = None
+        self._admitted_this_hour = 0
+        self._overflow_this_hour = 0
+        self._reservoir: List[_Case] = []
+        self._closed = False
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.errors = 0
+        self._writer = threading.Thread(target=self._run, name='case-capture', daemon=True)
+        self._writer.start()
+
+    def capture(self, kind: str, base_dir: str, frame: Optional[np.ndarray], info: Union[Dict, JsonRecord],
+                resize_to: Optional[Tuple[int, int]] = None) -> bool:
+        """케이스 저장 요청 (frame이 None이면 JSON만), 기록 대상(바로 또는 표본)이 되면 True
+
+        frame은 호출 이후 재사용되어도 되며, 호출 중에 복사(또는 resize_to로 축소)한다.
+        info(dict 또는 image_path 속성이 있는 JsonRecord)의 image_path는 writer가 실제 저장 경로로 채운다.
+        """
+        now = self._clock()
+        with self._lock:
+            released = self._roll_hour(now)
+            within_budget = self._admitted_this_hour < self.hourly_budget
+            if within_budget:
+                self._admitted_this_hour += 1
+        for case in released:
+            self._enqueue(case)
+
+        image = None
+        if frame is not None:
+            image = cv2.resize(frame, tuple(resize_to)) if resize_to else frame.copy()
+        case = _Case(kind, base_dir, now, image, info)
+        if within_budget:
+            return self._enqueue(case)
+        # 예산 초과: 복사가 끝난 케이스로 표본 자리 선택과 저장을 한 번에 (동시 호출이 같은 자리를 덮어쓰지 않음)
+        with self._lock:
+            return self._sample(case)
+
+    def _sample(self, case: _Case) -> bool:
+        """reservoir sampling (Algorithm R): k번째 초과 케이스를 size/k 확률로 표본에 포함 (lock 보유 상태에서 호출)"""
+        if case.hour != self._hour:
+            # 복사하는 사이 시간대가 바뀜: 그 시간대 표본은 이미 내보냈으므로 새 시간대 표본에 섞지 않음
+            self.sampled_out += 1
+            return False
+        self._overflow_this_hour += 1
+        if len(self._reservoir) < self.reservoir_size:
+            self._reservoir.append(case)
+            return True
+        self.sampled_out += 1
+        index = self._rng.randrange(self._overflow_this_hour)
+        if index >= self.reservoir_size:
+            return False
+        self._reservoir[index] = case
+        return True
+
+    def _roll_hour(self, now: datetime) -> List[_Case]:
+        """시간대가 바뀌었으면 예산을 초기화하고 이전 시간대 표본을 반환 (lock 보유 상태에서 호출)
+
+        다른 스레드가 먼저 다음 시간대로 넘긴 뒤 늦게 도착한 이전 시각으로는 되돌리지 않는다.
+        """
+        hour = _hour_of(now)
+        if self._hour is not None and hour <= self._hour:
+            return []
+        released, self._reservoir = self._reservoir, []
+        if self._overflow_this_hour:
+            logger.info("Case capture budget exceeded (%s): %d over budget, %d sampled",
+                        self._hour, self._overflow_this_hour, len(released))
+        self._hour = hour
+        self._admitted_this_hour = 0
+        self._overflow_this_hour = 0
+        return released
+
+    def _enqueue(self, case: _Case) -> bool:
+        try:
+            self._queue.put_nowait(case)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            logger.warning("Case capture queue full, dropped %s case", case.kind)
+            return False
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def _write(self, case: _Case):
+        directory = os.path.join(case.base_dir, case.timestamp.strftime('%Y%m%d'))
+        if directory not in self._created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._created_dirs.add(directory)
+        name = case.timestamp.strftime('%H%M%S_%f')
+
+        if case.image is not None:
+            ret, buffer = cv2.imencode('.jpg', case.image, self._encode_params)
+            if not ret:
+                raise ValueError("JPEG encoding failed")
+            image_path = os.path.join(directory, f'{name}.jpg')
+            with open(image_path, 'wb') as f:
+                f.write(buffer.tobytes())
+            if isinstance(case.info, JsonRecord):
+                case.info.image_path = image_path
+            else:
+                case.info['image_path'] = image_path
+
+        json_path = os.path.join(directory, f'{name}.json')
+        if isinstance(case.info, JsonRecord):
+            with open(json_path, 'wb') as f:
+                f.write(case.info.to_json_bytes())
+        else:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(case.info, f, indent=2, ensure_ascii=False, default=to_builtin)
+        logger.info("%s case saved: %s", case.kind, json_path)
+
+    def _run(self):
+        while True:
+            try:
+                case = self._queue.get(timeout=60.0)
+            except queue.Empty:
+                # 케이스가 뜸해도 지난 시간대 표본은 기록
+                with self._lock:
+                    released = [] if self._hour is None else self._roll_hour(self._clock())
+                for released_case in released:
+                    self._enqueue(released_case)
+                continue
+            try:
+                if case is None:
+                    return
+                self._write(case)
+                with self._lock:
+                    self.written += 1
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                logger.error("Case capture write failed (%s): %s", case.kind, e)
+            finally:
+                self._queue.task_done()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'depth': self._queue.qsize(),
+                'submitted': self.submitted,
+                'written': self.written,
+                'dropped': self.dropped,
+                'sampled_out': self.sampled_out,
+                'reservoir': len(self._reservoir),
+                'errors': self.errors,
+            }
+
+    def close(self, timeout: Optional[float] = None):
+        """현재 시간대 표본과 대기 중인 케이스를 모두 기록한 뒤 writer 종료"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            released, self._reservoir = self._reservoir, []
+        for case in released:
+            self._queue.put(case)
+            with self._lock:
+                self.submitted += 1
+        self._queue.put(None)
+        self._writer.join(timeout)
+
+
+def create_case_capture(config: dict) -> Optional[CaseCaptureSink]:
+    """EV config의 'case_capture' 항목으로 비동기 케이스 저장 단계 생성 (enabled: false면 None → 동기 저장)"""
+    capture_config = config.get('case_capture', {})
+    if not capture_config.get('enabled', True):
+        return None
+    return CaseCaptureSink(
+        max_queue_size=capture_config.get('max_queue_size', 32),
+        hourly_budget=capture_config.get('hourly_budget', 300),
+        reservoir_size=capture_config.get('reservoir_size', 30),
+        jpeg_quality=capture_config.get('jpeg_quality', 95),
+    )
@@ -1,43 +1,47 @@
 import cv2
 import numpy as np
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Optional, Sequence
 import logging
+import threading
 
 logger = logging.getLogger(__name__) # 모듈 레벨 로거 (필요시 함수 내에서 getLogger)
 
+def clamp_crop_box(image: np.ndarray, crop_box: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    """crop_box를 이미지 경계 안으로 조정해 (x1, y1, x2, y2) 반환 (유효 크기가 0 이하이면 ValueError)"""
+    img_h, img_w = image.shape[:2]
+    x, y, w, h = map(int, crop_box) # 혹시 float으로 올 경우 대비해 int 변환
+
+    # --- 좌표 검증 및 조정 로직 추가 ---
+    x1_c = max(0, x)
+    y1_c = max(0, y)
+    # x2, y2 계산 시 원본 이미지 경계를 넘지 않도록 min 사용
+    x2_c = min(img_w, x + w) 
+    y2_c = min(img_h, y + h)
+
+    # 조정된 좌표로 너비/높이 계산
+    eff_w = x2_c - x1_c
+    eff_h = y2_c - y1_c
+
+    # 조정 후 너비 또는 높이가 0 이하이면 에러 처리
+    if eff_w <= 0 or eff_h <= 0:
+        logger.error(f"Invalid crop dimensions after clamping: Box={crop_box}, Clamped=[{x1_c}:{x2_c}, {y1_c}:{y2_c}], ImgShape=({img_h},{img_w})")
+        # 에러 발생시키면 상위 except에서 잡힘
+        raise ValueError(f"Invalid effective crop size ({eff_w}x{eff_h}) after clamping")
+    # --- 로직 추가 끝 ---
+    return x1_c, y1_c, x2_c, y2_c
+
 def preprocess_image(image: np.ndarray, crop_box: Tuple[int, int, int, int],
                      angle: float, target_size: Tuple[int, int] = (320, 180)) -> np.ndarray:
     """이미지 전처리 (크롭, 리사이즈, 회전, HSV 변환)"""
     try: # 이미지 처리 중 예외 발생 가능성 대비
-        img_h, img_w = image.shape[:2]
-        x, y, w, h = map(int, crop_box) # 혹시 float으로 올 경우 대비해 int 변환
-
-        # --- 좌표 검증 및 조정 로직 추가 ---
-        x1_c = max(0, x)
-        y1_c = max(0, y)
-        # x2, y2 계산 시 원본 이미지 경계를 넘지 않도록 min 사용
-        x2_c = min(img_w, x + w) 
-        y2_c = min(img_h, y + h)
-
-        # 조정된 좌표로 너비/높이 계산
-        eff_w = x2_c - x1_c
-        eff_h = y2_c - y1_c
-
-        # 조정 후 너비 또는 높이가 0 이하이면 에러 처리
-        if eff_w <= 0 or eff_h <= 0:
-            logger.error(f"Invalid crop dimensions after clamping: Box={crop_box}, Clamped=[{x1_c}:{x2_c}, {y1_c}:{y2_c}], ImgShape=({img_h},{img_w})")
-            # 여기서 에러를 발생시키거나, None을 반환하는 등 처리 방식 결정 필요
-            # 에러 발생시키면 상위 except에서 잡힘
-            raise ValueError(f"Invalid effective crop size ({eff_w}x{eff_h}) after clamping")
-            # 또는 return None (호출하는 쪽에서 None 처리 필요)
-        # --- 로직 추가 끝 ---
+        x1_c, y1_c, x2_c, y2_c = clamp_crop_box(image, crop_box)
 
         # 조정된 좌표(clamped coordinates)를 사용하여 이미지 자르기
         cropped = image[y1_c:y2_c, x1_c:x2_c]
 
         # 만약을 위해 crop 결과가 비었는지 한 번 더 확인 (이론상 위에서 걸러져야 함)
         if cropped.size == 0:
-             logger.error(f"Cropped image is unexpectedly empty! Box={crop_box}, Clamped=[{x1_c}:{x2_c}, {y1_c}:{y2_c}], ImgShape=({img_h},{img_w})")
+             logger.error(f"Cropped image is unexpectedly empty! Box={crop_box}, Clamped=[{x1_c}:{x2_c}, {y1_c}:{y2_c}], ImgShape={image.shape[:2]}")
              raise ValueError("Cropped image is empty despite valid clamped dimensions")
 
         # 이미지 리사이즈
@@ -57,6 +61,67 @@ def preprocess_image(image: np.ndarray, crop_box: Tuple[int, int, int, int],
         # 오류를 다시 발생시켜 상위에서 처리하도록 함
         raise
 
+def crop_affine_matrix(crop_size: Tuple[int, int], angle: float,
+                       target_size: Tuple[int, int] = (320, 180)) -> np.ndarray:
+    """크롭 영역 좌표 → 결과 이미지 좌표 affine 행렬 (리사이즈 후 중심 회전을 하나로 합성)
+
+    cv2.resize의 픽셀 중심 정렬(dst = (src + 0.5) * scale - 0.5)과
+    preprocess_image의 회전 중심(target_size // 2)을 그대로 따른다.
+    """
+    crop_w, crop_h = crop_size
+    target_w, target_h = target_size
+    scale_x = target_w / crop_w
+    scale_y = target_h / crop_h
+    resize = np.array([[scale_x, 0.0, 0.5 * scale_x - 0.5],
+                       [0.0, scale_y, 0.5 * scale_y - 0.5],
+                       [0.0, 0.0, 1.0]])
+    if angle == 0:
+        return resize[:2]
+    rotation = cv2.getRotationMatrix2D((target_w // 2, target_h // 2), angle, 1.0)
+    return rotation @ resize
+
+class FusedPreprocessor:
+    """preprocess_image의 단일 패스 버전 (크롭+리사이즈+회전을 affine 1회로, 출력 버퍼 재사용)
+
+    원본 프레임의 크롭 영역 view에서 결과 크기 버퍼로 바로 샘플링하고, 같은 스레드에서
+    재사용하는 두 번째 버퍼에 HSV로 변환한다. 크롭 영역 밖은 기존 구현과 같이 검은색으로 채운다.
+    반환 배열은 다음 호출에서 덮어쓰이므로 바로 사용(특징 추출)하거나 복사해야 한다.
+    회전이 없으면 cv2.resize를 그대로 사용하므로 결과가 preprocess_image와 동일하고,
+    회전이 있으면 보간을 한 번만 하므로 기존 결과(보간 2회)와 픽셀 값이 약간 다르다.
+    """
+
+    def __init__(self, target_size: Tuple[int, int] = (320, 180)):
+        self.target_size = target_size
+        self._local = threading.local()     # 스레드별 (BGR, HSV) 버퍼
+
+    def _buffers(self, channels: int, dtype) -> Tuple[np.ndarray, np.ndarray]:
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None or buffers[0].shape[2] != channels or buffers[0].dtype != dtype:
+            target_w, target_h = self.target_size
+            buffers = (np.empty((target_h, target_w, channels), dtype=dtype),
+                       np.empty((target_h, target_w, 3), dtype=dtype))
+            self._local.buffers = buffers
+        return buffers
+
+    def __call__(self, image: np.ndarray, crop_box: Tuple[int, int, int, int], angle: float) -> np.ndarray:
+        try:
+            x1_c, y1_c, x2_c, y2_c = clamp_crop_box(image, crop_box)
+            cropped = image[y1_c:y2_c, x1_c:x2_c]     # view (복사 없음)
+            bgr, hsv = self._buffers(image.shape[2], image.dtype)
+
+            if angle == 0:
+                cv2.resize(cropped, self.target_size, dst=bgr)
+            else:
+                matrix = crop_affine_matrix((x2_c - x1_c, y2_c - y1_c), angle, self.target_size)
+                # BORDER_CONSTANT(0): 크롭 영역 밖은 프레임 내용이 아닌 검은색
+                cv2.warpAffine(cropped, matrix, self.target_size, dst=bgr,
+                               flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT, borderValue=0)
+            return cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV, dst=hsv)
+
+        except Exception as e:
+            logger.error(f"Error during fused preprocess: {e}. Input crop_box: {crop_box}, Image shape: {image.shape if image is not None else 'None'}")
+            raise
+
 # def preprocess_image(image: np.ndarray, crop_box: Tuple[int, int, int, int], 
 #                     angle: float, target_size: Tuple[int, int] = (320, 180)) -> np.ndarray:
 #     """이미지 전처리 (크롭, 리사이즈, 회전, HSV 변환)"""
@@ -71,14 +136,51 @@ def preprocess_image(image: np.ndarray, crop_box: Tuple[int, int, int, int],
     
 #     return cv2.cvtColor(resized, cv2.COLOR_BGR2HSV)
 
-def extract_features(hsv_image: np.ndarray) -> np.ndarray:
-    """HSV 히스토그램 특징 추출"""
-    h, s, v = cv2.split(hsv_image)
-    hist_h = cv2.calcHist([h], [0], None, [256], [0, 256])
-    hist_s = cv2.calcHist([s], [0], None, [256], [0, 256])
-    hist_v = cv2.calcHist([v], [0], None, [256], [0, 256])
-    
-    return np.r_[hist_h, hist_s, hist_v].squeeze()
+HIST_BINS = 256
+FEATURE_DIM = HIST_BINS * 3     # H, S, V 히스토그램 256 x 3
+
+def _check_feature_out(out: np.ndarray, shape: Tuple[int, ...]):
+    """특징 출력 배열 검사 (모양/dtype이 다르면 일부 구간이 초기화되지 않은 채 모델에 들어가므로 ValueError)"""
+    if not isinstance(out, np.ndarray) or out.shape != shape or out.dtype != np.float32 \
+            or not out.flags.c_contiguous:
+        raise ValueError(f"out은 {shape} 모양의 C-contiguous float32 배열이어야 합니다: "
+                         f"{getattr(out, 'shape', None)} {getattr(out, 'dtype', type(out).__name__)}")
+
+def extract_features(hsv_image: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """HSV 히스토그램 특징 추출 (768차원 float32)
+
+    채널 분리(cv2.split)나 이어 붙이기(np.r_) 없이 채널별 calcHist 결과를
+    출력 배열의 해당 구간에 바로 기록한다.
+
+    Args:
+        hsv_image (np.ndarray): HSV 이미지 (H x W x 3)
+        out (np.ndarray): 결과를 기록할 길이 768의 C-contiguous float32 배열 (None이면 새로 할당)
+    Raises:
+        ValueError: out의 모양/dtype/메모리 배치가 맞지 않는 경우
+    """
+    if out is None:
+        out = np.empty(FEATURE_DIM, dtype=np.float32)
+    else:
+        _check_feature_out(out, (FEATURE_DIM,))
+    for channel in range(3):
+        view = out[channel * HIST_BINS:(channel + 1) * HIST_BINS].reshape(HIST_BINS, 1)
+        hist = cv2.calcHist([hsv_image], [channel], None, [HIST_BINS], [0, 256], hist=view)
+        if hist is not view:    # OpenCV가 새 배열을 만든 경우 (out이 호환되지 않는 레이아웃)
+            view[...] = hist
+    return out
+
+def extract_features_batch(hsv_images: Sequence[np.ndarray], out: Optional[np.ndarray] = None) -> np.ndarray:
+    """여러 번호판 HSV 이미지의 특징을 (N, 768) float32 행렬로 추출 (모델 입력으로 바로 사용)
+
+    out을 넘기면 정확히 (len(hsv_images), 768) float32여야 한다 (행이 남으면 ValueError).
+    """
+    if out is None:
+        out = np.empty((len(hsv_images), FEATURE_DIM), dtype=np.float32)
+    else:
+        _check_feature_out(out, (len(hsv_images), FEATURE_DIM))
+    for row, hsv_image in zip(out, hsv_images):
+        extract_features(hsv_image, row)
+    return out
 
 def validate_plate_info(plate_info: Dict) -> bool:
     """
@@ -0,0 +1,131 @@
+import json
+from json.encoder import encode_basestring
+from typing import Callable, List, Sequence, Tuple, Union
+import numpy as np
+
+_INFINITY = float('inf')
+
+
+def to_builtin(obj):
+    """json.dumps default: numpy 스칼라/배열, JsonRecord를 파이썬 기본 타입으로 (그 외는 str)"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, JsonRecord):
+        return json.loads(obj.to_json_str())
+    return str(obj)
+
+
+def encode_any(value) -> str:
+    """범용 값 (dict/list/numpy 포함) → JSON 문자열, JsonRecord는 자체 템플릿으로"""
+    if isinstance(value, JsonRecord):
+        return value.to_json_str()
+    return json.dumps(value, ensure_ascii=False, default=to_builtin)
+
+
+def encode_float(value) -> str:
+    """float 필드 (json.dumps와 같은 표기, NaN/Infinity 포함), float가 아니면 encode_any"""
+    if type(value) is float:
+        if value != value:
+            return 'NaN'
+        if value == _INFINITY:
+            return 'Infinity'
+        if value == -_INFINITY:
+            return '-Infinity'
+        return float.__repr__(value)
+    if value is None:
+        return 'null'
+    return encode_any(value)
+
+
+def encode_bool(value) -> str:
+    """bool 필드, bool/None이 아니면 encode_any"""
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if value is None:
+        return 'null'
+    return encode_any(value)
+
+
+def encode_str(value) -> str:
+    """문자열 필드 (ensure_ascii=False와 같은 이스케이프), str이 아니면 encode_any"""
+    if type(value) is str:
+        return encode_basestring(value)
+    if value is None:
+        return 'null'
+    return encode_any(value)
+
+
+Encoder = Callable[[object], str]
+Layout = Sequence[Tuple[str, Union[Encoder, 'Layout']]]
+
+
+# 말단 인코더별 인라인 식 (빠른 경로만 인라인, 나머지는 인코더 함수 호출)
+_INLINE = {
+    encode_float: '(_float_repr({v}) if type({v}) is float and {v} - {v} == 0.0 else _encode_float({v}))',
+    encode_bool: "('true' if {v} is True else 'false' if {v} is False else _encode_bool({v}))",
+    encode_str: '(_encode_basestring({v}) if type({v}) is str else _encode_str({v}))',
+}
+
+
+class JsonTemplate:
+    """고정된 키 구조의 JSON 템플릿
+
+    (키, 인코더 또는 하위 layout) 목록으로 키/구분자 부분을 미리 채운 렌더링 함수를 한 번 생성해 두고
+    (float/bool/str 말단은 빠른 경로를 인라인), 렌더링 시에는 말단 값만 순서대로 인코딩한다.
+    출력은 json.dumps(..., ensure_ascii=False)와 같다.
+    """
+    __slots__ = ('encoders', 'render')
+
+    def __init__(self, layout: Layout):
+        self.encoders: Tuple[Encoder, ...] = ()
+        pieces: List[str] = []      # 고정 문자열 조각과 말단 값 인코딩 식 (repr된 조각은 소스에 그대로 들어감)
+        literal = self._compile(layout, pieces, '')
+        if literal:
+            pieces.append(repr(literal))
+        names = [f'v{index}' for index in range(len(self.encoders))]
+        namespace = {'_float_repr': float.__repr__, '_encode_basestring': encode_basestring,
+                     '_encode_float': encode_float, '_encode_bool': encode_bool, '_encode_str': encode_str}
+        namespace.update((f'_e{index}', encode) for index, encode in enumerate(self.encoders))
+        source = (f"def render(values):\n"
+                  f"    {', '.join(names)}{',' if len(names) == 1 else ''} = values\n"
+                  f"    return ''.join(({', '.join(pieces)},))\n")
+        exec(source, namespace)
+        self.render: Callable[[Sequence], str] = namespace['render']
+        self.render.__doc__ = "말단 값(layout 순서) → JSON 문자열"
+
+    def _compile(self, layout: Layout, pieces: List[str], literal: str) -> str:
+        """layout을 pieces에 펼치고 아직 내보내지 않은 고정 문자열 꼬리를 반환"""
+        literal += '{'
+        for position, (key, spec) in enumerate(layout):
+            literal += (', ' if position else '') + encode_basestring(key) + ': '
+            if callable(spec):
+                pieces.append(repr(literal))
+                literal = ''
+                name = f'v{len(self.encoders)}'
+                pieces.append(_INLINE.get(spec, '_e{index}({v})').format(v=name, index=len(self.encoders)))
+                self.encoders += (spec,)
+            else:
+                literal = self._compile(spec, pieces, literal)
+        return literal + '}'
+
+
+class JsonRecord:
+    """JsonTemplate으로 직렬화되는 __slots__ 레코드 기반 클래스
+
+    하위 클래스는 _JSON(JsonTemplate)과 말단 값을 순서대로 돌려주는 _json_values()를 정의한다.
+    """
+    __slots__ = ()
+    _JSON: JsonTemplate
+
+    def _json_values(self) -> Sequence:
+        raise NotImplementedError
+
+    def to_json_str(self) -> str:
+        return self._JSON.render(self._json_values())
+
+    def to_json_bytes(self) -> bytes:
+        return self.to_json_str().encode('utf-8')
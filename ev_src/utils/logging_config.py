@@ -1,32 +1,207 @@
-import logging
-import logging.handlers     # handlers import 추가가
 import os
+import json
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+import threading
+from multiprocessing import util
+from collections import OrderedDict
 from datetime import datetime
+from typing import List, Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """레코드를 포맷하지 않고 그대로 큐에 넣는 QueueHandler
+
+    같은 프로세스 안의 listener 스레드로만 넘기므로 pickle을 위한 사전 포맷이 필요 없고,
+    메시지 % args 및 payload 직렬화는 listener 스레드에서 핸들러가 출력할 때 수행된다.
+    (로깅 호출 이후 args로 넘긴 객체를 수정하면 수정된 값이 기록될 수 있음)
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class PlateRateLimitFilter(logging.Filter):
+    """extra={'plate_key': ...}가 붙은 레코드를 번호판별 interval초에 한 번만 통과"""
+
+    def __init__(self, interval: float = 60.0, max_keys: int = 4096):
+        super().__init__()
+        self.interval = interval
+        self.max_keys = max_keys
+        self._last_emitted: 'OrderedDict[str, float]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, 'plate_key', None)
+        if key is None:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_emitted.get(key)
+            if last is not None and now - last < self.interval:
+                self.suppressed += 1
+                return False
+            self._last_emitted[key] = now
+            self._last_emitted.move_to_end(key)
+            if len(self._last_emitted) > self.max_keys:
+                self._last_emitted.popitem(last=False)
+            return True
+
+
+class JsonPayload:
+    """로그 인자로 넘기면 실제로 출력될 때만 json.dumps 하는 래퍼"""
+    __slots__ = ('obj', 'indent')
+
+    def __init__(self, obj, indent: Optional[int] = 2):
+        self.obj = obj
+        self.indent = indent
+
+    def __str__(self) -> str:
+        return json.dumps(self.obj, indent=self.indent, ensure_ascii=False, default=str)
+
+
+def log_plate_payload(logger: logging.Logger, plate_info, message: str = "입력된 plate_info 구조: %s"):
+    """번호판별 입력 payload DEBUG 로그 (직렬화는 출력될 때만, 같은 번호판은 plate_log_interval마다 한 번)"""
+    if logger.isEnabledFor(logging.DEBUG):
+        plate_key = plate_info.get('text') if isinstance(plate_info, dict) else None
+        logger.debug(message, JsonPayload(plate_info), extra={'plate_key': plate_key})
+
+
+class _Installation:
+    """프로세스에 설치된 큐 로깅 구성"""
+
+    def __init__(self, targets: List[logging.Handler], level: int, plate_log_interval: float):
+        self.targets = targets
+        self.level = level
+        self.rate_limit = PlateRateLimitFilter(plate_log_interval)
+        self.pid = None
+        self.handler = None
+        self.listener = None
+
+    def start(self):
+        """새 큐/listener 스레드로 시작하고 root 로거의 큐 핸들러 교체"""
+        log_queue = queue.SimpleQueue()
+        handler = LazyQueueHandler(log_queue)
+        handler.addFilter(self.rate_limit)
+        for target in self.targets:
+            target.removeFilter(self.rate_limit)
+        root = logging.getLogger()
+        for previous in [self.handler, *self.targets]:
+            root.removeHandler(previous)
+        root.addHandler(handler)
+        root.setLevel(self.level)
+        self.handler = handler
+        self.listener = logging.handlers.QueueListener(log_queue, *self.targets, respect_handler_level=True)
+        self.listener.start()
+        self.pid = os.getpid()
+
+    def stop(self):
+        """큐에 남은 레코드를 모두 출력한 뒤 listener 종료 (이 프로세스에서 시작한 경우만)
+
+        이후의 로그는 유실되지 않도록 출력 대상 핸들러가 root 로거에서 직접(동기) 처리한다.
+        """
+        if self.listener is None or self.pid != os.getpid():
+            return
+        self.listener.stop()
+        self.listener = None
+        root = logging.getLogger()
+        root.removeHandler(self.handler)
+        for target in self.targets:
+            target.flush()
+            target.addFilter(self.rate_limit)
+            root.addHandler(target)
+
+
+_install_lock = threading.Lock()
+_installation: Optional[_Installation] = None
+
+
+def configure_logging(file_path: Optional[str] = None, level: int = logging.INFO, fmt: str = LOG_FORMAT,
+                      console: bool = True, max_bytes: int = 0, backup_count: int = 0,
+                      plate_log_interval: float = 60.0) -> bool:
+    """프로세스 로깅 설정 (프로세스당 한 번만 설치, 이미 설치돼 있으면 아무것도 하지 않고 False)
+
+    root 로거에는 LazyQueueHandler 하나만 붙고, 콘솔/파일 출력은 QueueListener 스레드가 한다.
+    fork된 자식 프로세스에서는 같은 출력 대상으로 새 큐/listener를 자동으로 다시 시작한다.
+
+    Args:
+        file_path (str): 로그 파일 경로 (None이면 파일 출력 없음)
+        level (int): root 로거 레벨
+        fmt (str): 로그 포맷
+        console (bool): 콘솔(stderr) 출력 여부
+        max_bytes (int): 0보다 크면 RotatingFileHandler로 회전
+        backup_count (int): 회전 파일 보관 개수
+        plate_log_interval (float): 번호판별 payload 로그(extra plate_key) 최소 간격 (초)
+    """
+    global _installation
+    with _install_lock:
+        if _installation is not None:
+            return False
+        targets: List[logging.Handler] = []
+        if console:
+            targets.append(logging.StreamHandler())
+        if file_path:
+            directory = os.path.dirname(file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if max_bytes > 0:
+                targets.append(logging.handlers.RotatingFileHandler(
+                    file_path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'))
+            else:
+                targets.append(logging.FileHandler(file_path, encoding='utf-8'))
+        formatter = logging.Formatter(fmt)
+        for target in targets:
+            target.setFormatter(formatter)
+        installation = _Installation(targets, level, plate_log_interval)
+        installation.start()
+        _installation = installation
+        atexit.register(shutdown_logging)
+        util.register_after_fork(installation, _flush_at_process_exit)
+        return True
+
+
+def shutdown_logging():
+    """대기 중인 로그를 모두 출력 (프로세스 종료 전)"""
+    with _install_lock:
+        if _installation is not None:
+            _installation.stop()
+
+
+def _restart_in_child():
+    # listener 스레드는 fork로 복제되지 않으므로 자식에서 큐/listener를 새로 만든다.
+    global _install_lock
+    _install_lock = threading.Lock()
+    if _installation is not None:
+        _installation.start()
+
+
+def _flush_at_process_exit(installation: _Installation):
+    # fork된 multiprocessing 자식은 atexit을 실행하지 않으므로 종료 시 flush는 multiprocessing finalizer로
+    # (자식 시작 시 finalizer 목록이 비워지므로 after-fork 콜백에서 등록)
+    util.Finalize(None, shutdown_logging, exitpriority=-100)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_in_child)
+
 
 def setup_logging(log_dir: str = "logs", config: dict = None):
-    
-    """로깅 설정"""
-    # 로그 디렉토리 생성
-    os.makedirs(log_dir, exist_ok=True)    
-    
-    # 로그 파일명 설정 (날짜 포함)
-    log_file = os.path.join(log_dir, f"ev_prediction_{datetime.now().strftime('%Y%m%d')}.log")
-    
-    # 로그 로테이션 설정 추가
-    file_handler = logging.handlers.RotatingFileHandler(
-        log_file,
-        maxBytes=config['logging']['file_rotation']['max_bytes'] if config else 10485760,
-        backupCount=config['logging']['file_rotation']['backup_count'] if config else 5
-    )
+    """EV 판정 로깅 설정 (로그 디렉토리의 ev_prediction_YYYYMMDD.log + 콘솔)
 
-    # 로깅 설정
-    logging.basicConfig(
-        level=logging.INFO,    # 로깅레벨 INFO이상 기록 - 일반적인 정보, 시스템의 정상적인 동작 기록 이상 동작시 기록
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            file_handler,    # RotatingFileHandler 사용용
-            logging.StreamHandler()
-        ]
+    프로세스에 이미 로깅이 설치돼 있으면 (예: cc_anpr) 핸들러를 추가하지 않는다.
+    """
+    logging_config = config['logging'] if config else {}
+    rotation = logging_config.get('file_rotation', {})
+    configure_logging(
+        file_path=os.path.join(log_dir, f"ev_prediction_{datetime.now().strftime('%Y%m%d')}.log"),
+        max_bytes=rotation.get('max_bytes', 10485760),
+        backup_count=rotation.get('backup_count', 5),
+        plate_log_interval=logging_config.get('plate_log_interval', 60.0),
     )
-    
-    return logging.getLogger(__name__) 
+    return logging.getLogger(__name__)
@@ -0,0 +1,213 @@
+import os
+import gzip
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from itertools import groupby
+from typing import Callable, List, Optional, Tuple, Union
+from .json_records import JsonRecord
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionLogWriter:
+    """종합 판정 로그(일자별 predictions.jsonl) writer
+
+    write()는 줄을 메모리 버퍼에 넣기만 하고, 파일 기록/fsync/자정 rollover는 flusher 스레드가 한다.
+    버퍼가 flush_bytes를 넘으면 flusher를 바로 깨우고, 아니면 flush_interval마다 기록하며,
+    fsync는 fsync_interval 간격으로만 한다. 디스크가 멈춰 버퍼가 max_buffer_bytes까지 쌓이면
+    그때만 호출 스레드가 직접 기록해 메모리가 무한정 늘지 않게 한다 (backpressure).
+    날짜별 파일 핸들은 하나만 열어 두고, 줄마다 기록한 날짜의 디렉토리로 들어간다.
+    compress=True면 기록마다 버퍼를 완결된 gzip member 하나로 압축해 predictions.jsonl.gz에
+    write 한 번으로 이어 쓴다 (여러 카메라 프로세스가 같은 파일에 append해도 member 단위로 섞일 뿐이라
+    zcat/gzip.open으로 그때까지의 줄을 모두 읽을 수 있음).
+    """
+
+    def __init__(self, base_dir: str, file_name: str = 'predictions.jsonl', flush_bytes: int = 65536,
+                 flush_interval: float = 1.0, fsync_interval: Optional[float] = 30.0, compress: bool = False,
+                 max_buffer_bytes: int = 4 * 1024 * 1024, clock: Callable[[], datetime] = datetime.now):
+        """
+        Args:
+            base_dir (str): 일자별 디렉토리(YYYYMMDD)를 만들 상위 디렉토리
+            file_name (str): 일자별 로그 파일명 (compress면 .gz가 붙음)
+            flush_bytes (int): 버퍼가 이 크기 이상이면 flusher를 바로 깨움
+            flush_interval (float): 버퍼가 차지 않아도 이 시간(초)마다 기록
+            fsync_interval (float): fsync 간격 (초, 0이면 기록마다, None이면 하지 않음)
+            compress (bool): 기록 단위 gzip member로 기록
+            max_buffer_bytes (int): 버퍼 상한, 넘으면 write() 호출 스레드가 직접 기록 (backpressure)
+            clock: 현재 시각 함수 (일자 구분용)
+        """
+        self.base_dir = base_dir
+        self.file_name = file_name + ('.gz' if compress else '')
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.compress = compress
+        self.max_buffer_bytes = max(max_buffer_bytes, flush_bytes)
+        self._clock = clock
+        self._lock = threading.Lock()           # 버퍼/카운터 (write() 경로, 파일 I/O 중에는 잡지 않음)
+        self._io_lock = threading.Lock()        # 파일 핸들/날짜 (flusher 또는 backpressure 중인 호출 스레드)
+        self._buffer: List[Tuple[str, bytes]] = []     # (날짜, 줄)
+        self._buffered_bytes = 0
+        self._day: Optional[str] = None
+        self._raw = None
+        self._unsynced = False
+        self._last_fsync = time.monotonic()
+        self._closed = False
+        self.records = 0
+        self.flushes = 0
+        self.fsyncs = 0
+        self.rollovers = 0
+        self.bytes_written = 0
+        self.errors = 0
+        self.backpressure = 0
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._run, name='prediction-log', daemon=True)
+        self._flusher.start()
+
+    @property
+    def path(self) -> Optional[str]:
+        """현재 기록 중인 파일 경로"""
+        return os.path.join(self.base_dir, self._day, self.file_name) if self._day else None
+
+    def write(self, record: Union[dict, JsonRecord]):
+        """판정 로그 1건 추가 (버퍼에만 넣음, 버퍼 상한을 넘은 경우에만 직접 기록)"""
+        if isinstance(record, JsonRecord):
+            line = record.to_json_bytes() + b'\n'
+        else:
+            line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        day = self._clock().strftime('%Y%m%d')
+        with self._lock:
+            if self._closed:
+                return
+            self._buffer.append((day, line))
+            self._buffered_bytes += len(line)
+            self.records += 1
+            buffered = self._buffered_bytes
+            if buffered >= self.max_buffer_bytes:
+                self.backpressure += 1
+        if buffered >= self.max_buffer_bytes:
+            self._drain()
+        elif buffered >= self.flush_bytes:
+            self._wakeup.set()
+
+    def _drain(self, force_fsync: bool = False):
+        """버퍼를 날짜별 파일에 기록 (버퍼는 잠깐만 잠그고 비운 뒤 I/O는 _io_lock으로만 직렬화)"""
+        with self._io_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+                self._buffered_bytes = 0
+            for day, lines in groupby(batch, key=lambda item: item[0]):
+                if day != self._day or self._raw is None:
+                    if self._raw is not None:
+                        self._close_day()
+                    try:
+                        self._open_day(day)
+                    except OSError as e:
+                        self.errors += 1
+                        logger.error("Prediction log open failed (%s): %s", self.path, e)
+                        continue
+                self._write_payload(b''.join(line for _, line in lines))
+            self._sync(force_fsync)
+
+    def _write_payload(self, payload: bytes):
+        """한 날짜분 줄을 write 한 번으로 기록 (_io_lock 보유 상태에서 호출)"""
+        try:
+            self._raw.write(gzip.compress(payload) if self.compress else payload)
+            self.flushes += 1
+            self.bytes_written += len(payload)
+            self._unsynced = True
+        except OSError as e:
+            self.errors += 1
+            logger.error("Prediction log write failed (%s): %s", self.path, e)
+
+    def _sync(self, force: bool = False):
+        """fsync_interval 간격으로 fsync (_io_lock 보유 상태에서 호출)"""
+        if self._raw is None or self.fsync_interval is None or not self._unsynced:
+            return
+        now = time.monotonic()
+        if force or now - self._last_fsync >= self.fsync_interval:
+            try:
+                os.fsync(self._raw.fileno())
+                self.fsyncs += 1
+                self._unsynced = False
+            except OSError as e:
+                self.errors += 1
+                logger.error("Prediction log fsync failed (%s): %s", self.path, e)
+            self._last_fsync = now
+
+    def _close_day(self):
+        """현재 날짜 파일을 fsync 후 닫기 (_io_lock 보유 상태에서 호출)"""
+        self._sync(force=True)
+        self._raw.close()
+        self._raw = None
+        self.rollovers += 1
+
+    def _open_day(self, day: str):
+        self._day = day
+        os.makedirs(os.path.join(self.base_dir, day), exist_ok=True)
+        # 버퍼링 없이 열어 기록 1회 = O_APPEND write 1회 (다른 프로세스 기록과 중간에 섞이지 않음)
+        self._raw = open(self.path, 'ab', buffering=0)
+
+    def flush(self):
+        """버퍼를 지금 기록 (호출 스레드에서)"""
+        self._drain()
+
+    def _run(self):
+        # flush_bytes를 넘으면 바로, 아니면 flush_interval마다 기록하고 자정이 지나면 파일을 닫음
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stop.is_set():
+                return
+            self._drain()
+            with self._io_lock:
+                if self._raw is not None and self._clock().strftime('%Y%m%d') != self._day:
+                    self._close_day()       # 새 날짜 파일은 다음 기록 때 연다
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'path': self.path,
+                'records': self.records,
+                'buffered_bytes': self._buffered_bytes,
+                'flushes': self.flushes,
+                'fsyncs': self.fsyncs,
+                'rollovers': self.rollovers,
+                'bytes_written': self.bytes_written,
+                'errors': self.errors,
+                'backpressure': self.backpressure,
+            }
+
+    def close(self):
+        """flusher를 멈추고 남은 버퍼를 기록해 fsync 후 파일 닫기"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._stop.set()
+        self._wakeup.set()
+        self._flusher.join()
+        self._drain(force_fsync=True)
+        with self._io_lock:
+            if self._raw is not None:
+                self._raw.close()
+                self._raw = None
+
+
+def create_prediction_log(config: dict) -> Optional[PredictionLogWriter]:
+    """EV config의 'prediction_log' 항목으로 종합 판정 로그 writer 생성 (enabled: false면 None → 건별 기록)"""
+    log_config = config.get('prediction_log', {})
+    if not log_config.get('enabled', True):
+        return None
+    return PredictionLogWriter(
+        config['paths']['comprehensive_log_base_dir'],
+        flush_bytes=log_config.get('flush_bytes', 65536),
+        flush_interval=log_config.get('flush_interval', 1.0),
+        fsync_interval=log_config.get('fsync_interval', 30.0),
+        compress=log_config.get('compress', False),
+        max_buffer_bytes=log_config.get('max_buffer_bytes', 4 * 1024 * 1024),
+    )
@@ -0,0 +1,149 @@
+"""녹화 영상/이미지 폴더로 cc_anpr.process_camera 로직을 그대로 실행하는 오프라인 replay 벤치마크
+
+RTSP 없이 ROI, 투표, EV 판정, 저장까지 동일한 경로를 통과시키고
+카메라별 처리 FPS, 인식 지연 백분위, 분당 확정 수, 디스크 기록량을 보고한다.
+
+사용 예:
+    python replay_anpr.py --camera cam1=videos/entrance.mp4 --camera cam2=frames/exit/ \\
+        --backend fake --output replay_output --report replay_report.json
+    python replay_anpr.py --camera cam1=videos/entrance.mp4 --realtime    # 원본 FPS 속도로 공급
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+import multiprocessing
+
+import cc_anpr
+from anpr_src.capture.file_source import FileFrameSource
+from anpr_src.pipeline.pipeline_metrics import PipelineMetrics
+from ev_src.detector.detector_registry import DEFAULT_CONFIG_PATH as EV_CONFIG_PATH
+
+DEFAULT_REPLAY_CONFIG = {
+    'anpr_option': '',
+    'plate_count_deque_size': 10,
+    'plate_count_threshold': 3,
+    'roi': {},
+}
+
+
+def build_config(args) -> dict:
+    """replay용 cc_anpr 설정 생성 (출력 경로는 모두 output 디렉토리 아래로 변경)"""
+    config = dict(DEFAULT_REPLAY_CONFIG)
+    if args.config:
+        config.update(cc_anpr.load_config(args.config))
+
+    config['temp_car_image_save_path'] = os.path.join(args.output, 'TEMP')
+    config['result_json_save_path'] = os.path.join(args.output, 'result_json')
+    if args.backend:
+        config['recognizer'] = dict(config.get('recognizer', {}), backend=args.backend)
+    if args.replay_results:
+        config['recognizer'] = dict(config.get('recognizer', {}), backend='replay', results_path=args.replay_results)
+    if args.latency_ms is not None:
+        config['recognizer'] = dict(config.get('recognizer', {}), latency_ms=args.latency_ms)
+
+    ev_config_path = args.ev_config or config.get('ev_config_path', EV_CONFIG_PATH)
+    if not os.path.exists(ev_config_path):
+        # 실제 EV 모델이 없는 머신: 벤치마크용 stand-in 모델 사용
+        from benchmarks.synthetic_env import make_synthetic_config
+        logging.warning("EV config '%s' not found, using synthetic stand-in models", ev_config_path)
+        ev_config_path = make_synthetic_config(os.path.join(args.output, 'ev_synthetic'))
+    config['ev_config_path'] = ev_config_path
+    return config
+
+
+def run_camera(name, path, realtime, config, result_queue):
+    """카메라 1대분 replay (별도 프로세스에서 실행)"""
+    cc_anpr.config = config
+    if cc_anpr.backend is None:
+        error = cc_anpr.initialize()
+        if error:
+            result_queue.put({'camera': name, 'error': error})
+            return
+    try:
+        source = FileFrameSource(path, realtime=realtime)
+        summary = cc_anpr.process_camera(name, frame_source=source, metrics=PipelineMetrics(name))
+        summary['source'] = dict(source.stats(), path=path)
+        result_queue.put(summary)
+    except Exception as e:
+        logging.error("Replay failed (%s): %s", name, e)
+        result_queue.put({'camera': name, 'error': str(e)})
+
+
+def file_sizes(path: str) -> dict:
+    """디렉토리 아래 파일별 크기"""
+    sizes = {}
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            try:
+                sizes[file_path] = os.path.getsize(file_path)
+            except OSError:
+                continue
+    return sizes
+
+
+def bytes_written_since(before: dict, after: dict) -> int:
+    """스냅샷 이후 새로 생기거나 늘어난 바이트 (replay 전에 만든 stand-in 모델, 이전 실행 결과 제외)"""
+    return sum(max(0, size - before.get(path, 0)) for path, size in after.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='cc_anpr offline replay benchmark')
+    parser.add_argument('--camera', action='append', required=True, metavar='NAME=PATH',
+                        help='카메라 이름과 동영상 파일 또는 이미지 폴더 (여러 번 지정 가능)')
+    parser.add_argument('--config', default=None, help='cc_anpr config.json (roi, 투표 설정 등)')
+    parser.add_argument('--ev-config', default=None, help='EV 판정 설정 yaml')
+    parser.add_argument('--backend', choices=('tsanpr', 'fake', 'replay'), default=None)
+    parser.add_argument('--replay-results', default=None, help='replay 백엔드용 기록 파일 (.jsonl/.json)')
+    parser.add_argument('--latency-ms', type=float, default=None, help='fake/replay 백엔드 인식 지연 (ms)')
+    parser.add_argument('--realtime', action='store_true', help='원본 FPS 속도로 프레임 공급')
+    parser.add_argument('--output', default='replay_output', help='이미지/JSON 출력 디렉토리')
+    parser.add_argument('--report', default=None, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    cameras = []
+    for spec in args.camera:
+        name, sep, path = spec.partition('=')
+        if not sep:
+            name, path = os.path.splitext(os.path.basename(spec.rstrip('/')))[0], spec
+        cameras.append((name, path))
+
+    os.makedirs(args.output, exist_ok=True)
+    config = build_config(args)
+    cc_anpr.config = config
+    error = cc_anpr.initialize()
+    if error:
+        logging.error(error)
+        sys.exit(1)
+
+    # 파이프라인 기록량만 세도록 실행 직전 출력 디렉토리 스냅샷 (ev_synthetic 모델 파일 등 제외)
+    sizes_before = file_sizes(args.output)
+    result_queue = multiprocessing.Queue()
+    processes = []
+    for name, path in cameras:
+        process = multiprocessing.Process(target=run_camera, args=(name, path, args.realtime, config, result_queue))
+        processes.append(process)
+        process.start()
+
+    summaries = [result_queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    report = {
+        'mode': 'realtime' if args.realtime else 'unthrottled',
+        'backend': config.get('recognizer', {}).get('backend', 'tsanpr'),
+        'cameras': sorted(summaries, key=lambda summary: summary['camera']),
+        'total_frames': sum(summary.get('frames', 0) for summary in summaries),
+        'total_confirmations': sum(summary.get('confirmations', 0) for summary in summaries),
+        'output_bytes_written': bytes_written_since(sizes_before, file_sizes(args.output)),
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 저장소 루트의 ev_src/anpr_src 패키지를 import할 수 있도록 경로 추가 (python -m pytest / pytest 모두)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,76 @@
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from ev_src.utils.case_capture import CaseCaptureSink, CASE_UNCERTAIN
+
+
+class GatedFrame(np.ndarray):
+    """copy()가 gate를 통과할 때까지 멈추는 프레임 (capture 중 프레임 복사 구간을 겹치게 만듦)"""
+    gate = None
+
+    def copy(self, *args, **kwargs):
+        self.gate()
+        return np.asarray(self).copy(*args, **kwargs)
+
+
+def gated_frame(gate):
+    frame = np.zeros((4, 4, 3), dtype=np.uint8).view(GatedFrame)
+    frame.gate = gate
+    return frame
+
+
+def make_sink(clock, reservoir_size=4):
+    # 예산 0: 모든 케이스가 reservoir 표본 대상
+    return CaseCaptureSink(hourly_budget=0, reservoir_size=reservoir_size, clock=clock, seed=0)
+
+
+def test_concurrent_overflow_captures_keep_both_cases(tmp_path):
+    clock = [datetime(2025, 4, 18, 10, 0)]
+    sink = make_sink(lambda: clock[0])
+    barrier = threading.Barrier(2)
+    results = []
+    threads = [threading.Thread(target=lambda index=index: results.append(sink.capture(
+        CASE_UNCERTAIN, str(tmp_path), gated_frame(barrier.wait), {'index': index}))) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [True, True]
+    assert sorted(case.info['index'] for case in sink._reservoir) == [0, 1]
+    sink.close()
+
+
+def test_case_copied_across_hour_roll_is_not_sampled_into_new_hour(tmp_path):
+    clock = [datetime(2025, 4, 18, 10, 59, 59)]
+    sink = make_sink(lambda: clock[0])
+    copying, release = threading.Event(), threading.Event()
+
+    def hold():
+        copying.set()
+        release.wait(5)
+
+    result = []
+    old = threading.Thread(target=lambda: result.append(sink.capture(
+        CASE_UNCERTAIN, str(tmp_path), gated_frame(hold), {'hour': 10})))
+    old.start()
+    assert copying.wait(5)
+    clock[0] = datetime(2025, 4, 18, 11, 0, 1)
+    assert sink.capture(CASE_UNCERTAIN, str(tmp_path), None, {'hour': 11})
+    release.set()
+    old.join()
+    assert result == [False]
+    assert [case.info['hour'] for case in sink._reservoir] == [11]
+    assert sink._hour == datetime(2025, 4, 18, 11)
+    sink.close()
+
+
+def test_reservoir_keeps_reservoir_size_cases_per_hour(tmp_path):
+    clock = [datetime(2025, 4, 18, 10, 0)]
+    sink = make_sink(lambda: clock[0], reservoir_size=3)
+    kept = sum(sink.capture(CASE_UNCERTAIN, str(tmp_path), None, {'index': index}) for index in range(50))
+    assert len(sink._reservoir) == 3 and kept >= 3
+    assert sink.stats()['sampled_out'] == 47
+    sink.close()
+    assert sink.stats()['written'] == 3
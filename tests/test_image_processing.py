@@ -0,0 +1,80 @@
+import cv2
+import numpy as np
+import pytest
+
+from ev_src.utils.image_processing import extract_features, extract_features_batch, preprocess_image, FEATURE_DIM
+
+
+def legacy_extract_features(hsv_image):
+    """변경 전 extract_features (split + calcHist x3 + np.r_)"""
+    h, s, v = cv2.split(hsv_image)
+    hist_h = cv2.calcHist([h], [0], None, [256], [0, 256])
+    hist_s = cv2.calcHist([s], [0], None, [256], [0, 256])
+    hist_v = cv2.calcHist([v], [0], None, [256], [0, 256])
+    return np.r_[hist_h, hist_s, hist_v].squeeze()
+
+
+def make_crops(count=16, seed=0):
+    """실제 전처리 경로로 만든 번호판 HSV 이미지 + 전부 0/전부 255/홀수 크기 이미지"""
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, size=(1080, 1920, 3), dtype=np.uint8)
+    crops = [preprocess_image(frame, (int(rng.integers(0, 1700)), int(rng.integers(0, 1000)), 111, 60),
+                              float(rng.uniform(-15, 15)))
+             for _ in range(count)]
+    crops.append(np.zeros((180, 320, 3), dtype=np.uint8))
+    crops.append(np.full((180, 320, 3), 255, dtype=np.uint8))
+    crops.append(rng.integers(0, 256, size=(37, 53, 3), dtype=np.uint8))
+    return crops
+
+
+CROPS = make_crops()
+
+
+@pytest.mark.parametrize('index', range(len(CROPS)))
+def test_extract_features_bit_identical_to_legacy(index):
+    expected = legacy_extract_features(CROPS[index])
+    actual = extract_features(CROPS[index])
+    assert actual.dtype == expected.dtype and actual.shape == expected.shape
+    assert actual.tobytes() == expected.tobytes()
+
+
+def test_extract_features_batch_bit_identical_to_legacy():
+    expected = np.stack([legacy_extract_features(hsv) for hsv in CROPS])
+    actual = extract_features_batch(CROPS)
+    assert actual.dtype == np.float32 and actual.shape == (len(CROPS), FEATURE_DIM)
+    assert actual.tobytes() == expected.tobytes()
+
+
+def test_extract_features_writes_into_out_row():
+    out = np.full((2, FEATURE_DIM), -1.0, dtype=np.float32)
+    result = extract_features(CROPS[0], out[1])
+    assert np.shares_memory(result, out)
+    assert out[1].tobytes() == legacy_extract_features(CROPS[0]).tobytes()
+    assert (out[0] == -1.0).all()
+
+
+@pytest.mark.parametrize('out', [
+    np.empty(FEATURE_DIM + 1, dtype=np.float32),
+    np.empty(FEATURE_DIM, dtype=np.float64),
+    np.empty((1, FEATURE_DIM), dtype=np.float32),
+    np.empty(FEATURE_DIM * 2, dtype=np.float32)[::2],
+])
+def test_extract_features_rejects_mismatched_out(out):
+    with pytest.raises(ValueError):
+        extract_features(CROPS[0], out)
+
+
+@pytest.mark.parametrize('out', [
+    np.empty((len(CROPS) + 1, FEATURE_DIM), dtype=np.float32),
+    np.empty((len(CROPS) - 1, FEATURE_DIM), dtype=np.float32),
+    np.empty((len(CROPS), FEATURE_DIM), dtype=np.float64),
+])
+def test_extract_features_batch_rejects_mismatched_out(out):
+    with pytest.raises(ValueError):
+        extract_features_batch(CROPS, out)
+
+
+def test_extract_features_batch_fills_given_out():
+    out = np.empty((len(CROPS), FEATURE_DIM), dtype=np.float32)
+    assert extract_features_batch(CROPS, out) is out
+    assert out.tobytes() == np.stack([legacy_extract_features(hsv) for hsv in CROPS]).tobytes()
@@ -0,0 +1,82 @@
+import gzip
+import json
+import os
+import threading
+from datetime import datetime
+
+from ev_src.utils.prediction_log import PredictionLogWriter
+
+
+class RecordingWriter(PredictionLogWriter):
+    """파일 기록을 한 스레드 이름을 남기는 writer"""
+
+    def __init__(self, *args, **kwargs):
+        self.write_threads = []
+        super().__init__(*args, **kwargs)
+
+    def _write_payload(self, payload):
+        self.write_threads.append(threading.current_thread().name)
+        super()._write_payload(payload)
+
+
+def read_lines(path, compress=False):
+    opener = gzip.open if compress else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_write_below_cap_leaves_io_to_flusher(tmp_path):
+    # flush_interval=0, flush_bytes=1: 예전에는 write()마다 호출 스레드에서 기록했던 설정
+    writer = RecordingWriter(str(tmp_path), flush_bytes=1, flush_interval=0.0, fsync_interval=0.0,
+                             clock=lambda: datetime(2025, 4, 18, 10, 0))
+    for index in range(200):
+        writer.write({'index': index})
+    writer._stop.set()
+    writer._wakeup.set()
+    writer._flusher.join()
+    assert set(writer.write_threads) <= {'prediction-log'}
+    assert writer.stats()['backpressure'] == 0
+    writer.close()
+    assert [row['index'] for row in read_lines(os.path.join(str(tmp_path), '20250418', 'predictions.jsonl'))] \
+        == list(range(200))
+
+
+def test_write_over_cap_applies_backpressure(tmp_path):
+    writer = RecordingWriter(str(tmp_path), flush_bytes=64, flush_interval=3600.0, max_buffer_bytes=256,
+                             clock=lambda: datetime(2025, 4, 18, 10, 0))
+    writer._stop.set()          # flusher를 멈춰 디스크가 밀린 상황처럼 버퍼가 쌓이게 함
+    writer._wakeup.set()
+    writer._flusher.join()
+    for index in range(50):
+        writer.write({'index': index, 'pad': 'x' * 20})
+    stats = writer.stats()
+    assert stats['backpressure'] > 0
+    assert stats['buffered_bytes'] < 256
+    assert threading.current_thread().name in writer.write_threads
+    writer.close()
+    assert len(read_lines(writer.path)) == 50
+
+
+def test_lines_go_to_the_day_they_were_written(tmp_path):
+    clock = [datetime(2025, 4, 18, 23, 59)]
+    writer = PredictionLogWriter(str(tmp_path), flush_interval=3600.0, compress=True, clock=lambda: clock[0])
+    writer.write({'index': 0})
+    writer.write({'index': 1})
+    clock[0] = datetime(2025, 4, 19, 0, 0)
+    writer.write({'index': 2})
+    writer.close()
+    base = str(tmp_path)
+    assert [row['index'] for row in read_lines(os.path.join(base, '20250418', 'predictions.jsonl.gz'), True)] \
+        == [0, 1]
+    assert [row['index'] for row in read_lines(os.path.join(base, '20250419', 'predictions.jsonl.gz'), True)] \
+        == [2]
+    assert writer.stats()['rollovers'] == 1
+
+
+def test_write_after_close_is_dropped(tmp_path):
+    writer = PredictionLogWriter(str(tmp_path), clock=lambda: datetime(2025, 4, 18, 10, 0))
+    writer.write({'index': 0})
+    writer.close()
+    writer.write({'index': 1})
+    writer.close()
+    assert [row['index'] for row in read_lines(writer.path)] == [0]
@@ -0,0 +1,106 @@
+import math
+
+import pytest
+
+from anpr_src.capture.rate_controller import AdaptiveRateController, create_rate_controller
+
+
+def make_controller(latency=None, active=True, **kwargs):
+    """latency(초)로 인식 1회를 기록한 컨트롤러 (active면 번호판 후보가 보인 상태)"""
+    kwargs.setdefault('idle_fps', 2.0)
+    controller = AdaptiveRateController(**kwargs)
+    if latency is not None:
+        controller.record_recognition(latency, plate_seen=active, frame_time=0.0)
+    return controller
+
+
+def test_idle_lane_uses_idle_fps_regardless_of_latency():
+    assert make_controller(0.3, active=False).current_fps(0.0) == 2.0
+    assert make_controller(0.05, active=False).current_fps(0.0) == 2.0
+
+
+def test_active_unlimited_without_measurement_is_unlimited():
+    controller = make_controller(None)
+    controller.record_recognition(0.0, plate_seen=True, frame_time=0.0)
+    assert controller.current_fps(0.0) is None
+
+
+@pytest.mark.parametrize('active_fps, latency, expected', [
+    (None, 0.300, 1 / 0.300),       # 제한 없음 -> 인식기 처리량
+    (10.0, 0.300, 1 / 0.300),       # 설정값이 처리량보다 크면 처리량
+    (10.0, 0.100, 10.0),            # 처리량 이내면 설정값 그대로
+    (2.5, 0.100, 2.5),
+    (None, 0.600, 2.0),             # 처리량(1.67)이 idle_fps보다 낮아도 idle_fps 아래로는 내리지 않음
+    (10.0, 1.000, 2.0),
+])
+def test_active_rate_is_capped_at_recognizer_throughput(active_fps, latency, expected):
+    controller = make_controller(latency, active_fps=active_fps)
+    assert math.isclose(controller.current_fps(0.0), expected)
+
+
+def test_utilization_scales_throughput_cap():
+    controller = make_controller(0.300, active_fps=None, utilization=0.8)
+    assert math.isclose(controller.current_fps(0.0), 0.8 / 0.300)
+
+
+def test_rate_recovers_when_latency_drops():
+    controller = make_controller(0.300, active_fps=10.0, ewma_alpha=0.5)
+    for _ in range(20):
+        controller.record_recognition(0.050, plate_seen=True, frame_time=0.0)
+    assert math.isclose(controller.current_fps(0.0), 10.0)
+
+
+def test_processed_frames_follow_target_rate():
+    """25fps 스트림, 인식 300ms: 처리량 3.33fps -> 프레임 간격 0.04초 단위로 올림한 0.32초 간격"""
+    controller = make_controller(0.300, active_fps=None, max_lag_ms=0)
+    processed = []
+    for index in range(250):
+        frame_time = index / 25.0
+        if controller.should_process(frame_time):
+            processed.append(frame_time)
+            controller.record_recognition(0.300, plate_seen=True, frame_time=frame_time)
+    gaps = {round(b - a, 6) for a, b in zip(processed[1:], processed[2:])}
+    assert gaps == {0.32}
+
+
+def test_stale_frame_is_dropped_until_idle_interval():
+    controller = make_controller(None, max_lag_ms=150, idle_fps=1.0)
+    assert controller.should_process(0.0, now=0.01)
+    controller.record_recognition(0.01, plate_seen=True, frame_time=0.0)
+    assert not controller.should_process(0.2, now=0.5)      # active, 300ms 지연 -> 버림
+    assert controller.stale == 1 and controller.backlog == 1
+    assert controller.should_process(1.0, now=1.3)          # idle 간격이 지나면 지연돼도 인식
+    assert controller.backlog == 0
+
+
+def test_create_rate_controller_applies_camera_overrides():
+    config = {'rate_controller': {'enabled': True, 'idle_fps': 2, 'max_lag_ms': 200, 'utilization': 0.9,
+                                  'cameras': {'rtsp://cam1': {'idle_fps': 1}}}}
+    controller = create_rate_controller(config, 'rtsp://cam1')
+    assert (controller.idle_fps, controller.max_lag, controller.utilization) == (1, 0.2, 0.9)
+    assert create_rate_controller({}, 'rtsp://cam1') is None
+
+
+def test_gated_frames_are_not_counted_as_processed():
+    """motion gate가 버린 프레임은 processed/인식 간격/backlog 초기화에 반영하지 않음"""
+    controller = make_controller(None, idle_fps=2.0)
+    assert controller.admit(0.0)
+    controller.mark_processed(0.0)
+    assert not controller.admit(0.2)                    # idle 간격(0.5초) 이전
+    assert controller.admit(0.6)
+    controller.record_gated()                           # admit됐지만 motion gate에서 버림
+    assert controller.admit(0.64)                       # 인식 간격 기준은 마지막 실제 인식(0.0)
+    controller.mark_processed(0.64)
+    assert not controller.admit(0.68)
+    assert (controller.processed, controller.gated, controller.skipped) == (2, 1, 2)
+    assert controller.backlog == 1
+
+
+def test_backlog_counts_frames_since_last_recognition():
+    controller = make_controller(None, idle_fps=2.0)
+    assert controller.should_process(0.0)
+    for frame_time in (0.1, 0.2, 0.3):
+        assert not controller.admit(frame_time)
+    assert controller.admit(0.5)
+    controller.record_gated()
+    assert controller.backlog == 4 and controller.stats()['processed'] == 1
@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 from apscheduler.schedulers.background import BackgroundScheduler
 import shutil
 import logging # 로깅 모듈 import
+from anpr_src.pipeline.entry_journal import EntryEvent, create_entry_journal
 
 # 로깅 설정 (verify_entry 스크립트용 로거 설정)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -18,6 +19,7 @@ logger = logging.getLogger(__name__) # 이 모듈의 로거 객체 생성
 
 # 설정 값 (전역 변수 config 사용)
 config = {}
+JOURNAL_CONSUMER = 'verify_entry' # 입차 이벤트 저널에서 이 프로그램의 offset 이름
 
 def load_config(config_path):
     with open(config_path, 'r', encoding='utf-8') as f:
@@ -301,6 +303,55 @@ def entry_cancel(car_filename, config): # config 인자 추가
         logger.warning(f"MISRECOG 이동 대상 파일 '{car_filename}' TEMP 폴더에서 찾을 수 없음.")
 
 
+# 차량 1대 입차 검증 (AMANO 주차 위치 확인 후 입차 확정 또는 시간 초과 시 입차 취소)
+# 반환값: 확정/취소로 결론이 났으면 True, 아직 대기 시간 내라 다음 실행에서 다시 확인해야 하면 False
+def verify_car(db_connection, cursor, car_filename, plate_text, powertrain_from_filename, entry_datetime, config, execution_times):
+    four_digits = plate_text[-4:]
+    # 차량 번호 4자리를 사용하여 AMANO API 조회
+    api_start_time = time.time()
+    car_loc = get_parking_status(four_digits)
+    api_end_time = time.time()
+    execution_time = api_end_time - api_start_time
+    execution_times.append(execution_time)
+
+    car_found_in_amano = False
+    # AMANO API 응답 처리
+    if car_loc and car_loc.get("status") == "200" and car_loc.get("data") and car_loc["data"].get("success"):
+        # AMANO API가 성공적으로 응답하고 데이터가 있는 경우
+        if car_loc["data"].get("carList"): # carList가 비어있지 않은지 확인
+            for amano_car_info in car_loc["data"]["carList"]:
+                # AMANO 응답의 차량 번호와 파일명에서 파싱한 전체 차량 번호 일치 확인
+                if amano_car_info.get("carNo") == plate_text: # .get()으로 안전하게 접근
+                    car_found_in_amano = True
+                    # 입차 확정 처리 (entry_confirm 함수 호출)
+                    entry_confirm(db_connection, cursor, car_filename, plate_text, powertrain_from_filename, entry_datetime, config) # config 전달
+                    break # 차량을 찾았으므로 루프 종료
+        else:
+            logger.info(f"차량 {plate_text} AMANO API 응답에 carList 비어있음.")
+    elif car_loc and car_loc.get("status") != "200":
+        logger.warning(f"차량 {plate_text} AMANO API 응답 상태 오류: {car_loc.get('status')} - {car_loc.get('message')}")
+    elif car_loc is None:
+        logger.error(f"차량 {plate_text} AMANO API 호출 결과 None 반환.")
+    else: # 기타 AMANO API 응답 실패 (e.g., "success": false)
+        logger.warning(f"차량 {plate_text} AMANO API 응답 실패: {car_loc.get('message')}")
+
+
+    # 차량 위치가 AMANO에서 확인되지 않은 경우
+    if not car_found_in_amano:
+        # 입차 시간으로부터 자동 출차 대기 시간 경과 확인
+        auto_exit_minutes = config['auto_exit_minutes']
+        # 파일명 입차 시간과 현재 시간 비교
+        time_since_entry = datetime.now() - entry_datetime
+        if time_since_entry >= timedelta(minutes=auto_exit_minutes):
+            # 입차 취소 (MISRECOG으로 이동)
+            logger.info(f"차량 {plate_text} 주차 미확인 및 시간 초과 ({time_since_entry}). MISRECOG 이동.")
+            entry_cancel(car_filename, config) # config 전달
+            return True
+        # else: 차량이 주차되지 않았지만 아직 대기 시간 내이므로 TEMP에 그대로 둡니다.
+        return False
+    return True
+
+
 # 카메라 영상 처리 (주차 입차 검증 및 파일 분류) - 메인 로직
 def verify_entry(db_connection, cursor, car_list, config): # config 인자 추가
     execution_times = []
@@ -313,49 +364,7 @@ def verify_entry(db_connection, cursor, car_list, config): # config 인자 추
         try:
             # 파일 이름 파싱하여 차량 번호, 파워트레인(파일명 기반), 입차시간 추출
             plate_text, powertrain_from_filename, entry_datetime = parse_filename(car_filename)
-
-            four_digits = plate_text[-4:]
-            # 차량 번호 4자리를 사용하여 AMANO API 조회
-            api_start_time = time.time()
-            car_loc = get_parking_status(four_digits)
-            api_end_time = time.time()
-            execution_time = api_end_time - api_start_time
-            execution_times.append(execution_time)
-
-            car_found_in_amano = False
-            # AMANO API 응답 처리
-            if car_loc and car_loc.get("status") == "200" and car_loc.get("data") and car_loc["data"].get("success"):
-                # AMANO API가 성공적으로 응답하고 데이터가 있는 경우
-                if car_loc["data"].get("carList"): # carList가 비어있지 않은지 확인
-                    for amano_car_info in car_loc["data"]["carList"]:
-                        # AMANO 응답의 차량 번호와 파일명에서 파싱한 전체 차량 번호 일치 확인
-                        if amano_car_info.get("carNo") == plate_text: # .get()으로 안전하게 접근
-                            car_found_in_amano = True
-                            # 입차 확정 처리 (entry_confirm 함수 호출)
-                            entry_confirm(db_connection, cursor, car_filename, plate_text, powertrain_from_filename, entry_datetime, config) # config 전달
-                            break # 차량을 찾았으므로 루프 종료
-                else:
-                    logger.info(f"차량 {plate_text} AMANO API 응답에 carList 비어있음.")
-            elif car_loc and car_loc.get("status") != "200":
-                logger.warning(f"차량 {plate_text} AMANO API 응답 상태 오류: {car_loc.get('status')} - {car_loc.get('message')}")
-            elif car_loc is None:
-                logger.error(f"차량 {plate_text} AMANO API 호출 결과 None 반환.")
-            else: # 기타 AMANO API 응답 실패 (e.g., "success": false)
-                logger.warning(f"차량 {plate_text} AMANO API 응답 실패: {car_loc.get('message')}")
-
-
-            # 차량 위치가 AMANO에서 확인되지 않은 경우
-            if not car_found_in_amano:
-                # 입차 시간으로부터 자동 출차 대기 시간 경과 확인
-                auto_exit_minutes = config['auto_exit_minutes']
-                # 파일명 입차 시간과 현재 시간 비교
-                time_since_entry = datetime.now() - entry_datetime
-                if time_since_entry >= timedelta(minutes=auto_exit_minutes):
-                    # 입차 취소 (MISRECOG으로 이동)
-                    logger.info(f"차량 {plate_text} 주차 미확인 및 시간 초과 ({time_since_entry}). MISRECOG 이동.")
-                    entry_cancel(car_filename, config) # config 전달
-                # else: 차량이 주차되지 않았지만 아직 대기 시간 내이므로 TEMP에 그대로 둡니다.
-
+            verify_car(db_connection, cursor, car_filename, plate_text, powertrain_from_filename, entry_datetime, config, execution_times)
 
         except ValueError as ve:
             # 파일명 파싱 오류 발생 시 에러 로그 남기고 해당 파일 건너뛰기
@@ -380,6 +389,65 @@ def verify_entry(db_connection, cursor, car_list, config): # config 인자 추
         logger.info("처리된 파일 중 AMANO API 호출 대상 없음.")
 
 
+# 입차 이벤트 저널 처리 (파일명 파싱 없이 cc_anpr가 기록한 이벤트 사용)
+# 반환값: 아직 결론이 나지 않아 다음 실행에서 다시 확인할 이벤트 id 목록
+def verify_entry_events(db_connection, cursor, events, config):
+    execution_times = []
+    pending_ids = []
+
+    for processed_count, event in enumerate(events, 1):
+        logger.info(f"처리 중 이벤트 ({processed_count}/{len(events)}): #{event.event_id} '{event.image_filename}'")
+        try:
+            if not verify_car(db_connection, cursor, event.image_filename, event.plate_text, event.powertrain,
+                              event.entry_time, config, execution_times):
+                pending_ids.append(event.event_id)
+        except Exception as e:
+            # 예상치 못한 오류는 다음 실행에서 다시 시도 (TEMP 폴더 방식과 동일)
+            logger.error(f"이벤트 #{event.event_id} '{event.image_filename}' 처리 중 예상치 못한 오류: {e}. 다음 실행에서 재시도.")
+            pending_ids.append(event.event_id)
+
+    if execution_times:
+        average_execution_time = sum(execution_times) / len(execution_times)
+        logger.info(f"AMANO API 호출 평균 소요시간: {average_execution_time:.4f} seconds")
+    else:
+        logger.info("처리된 이벤트 중 AMANO API 호출 대상 없음.")
+    return pending_ids
+
+
+# 저널 최초 사용 시 TEMP 폴더에 남아 있는 기존 파일을 이벤트로 한 번만 등록
+def backfill_journal(journal, temp_car_image_save_path):
+    if not os.path.isdir(temp_car_image_save_path):
+        return 0
+    known = journal.image_filenames()
+    added = 0
+    for car_filename in sorted(get_all_filenames_from_directory(temp_car_image_save_path)):
+        if car_filename in known:
+            continue
+        try:
+            plate_text, powertrain_from_filename, entry_datetime = parse_filename(car_filename)
+        except ValueError as ve:
+            logger.error(f"파일명 파싱 오류: '{car_filename}' - {ve}. 저널 등록 건너뜁니다.")
+            continue
+        journal.append(EntryEvent(plate_text, powertrain_from_filename, entry_datetime, car_filename))
+        added += 1
+    logger.info(f"입차 이벤트 저널 최초 등록: TEMP 폴더 기존 파일 {added}개")
+    return added
+
+
+# 저널 소비: 저장된 offset 이후 새 이벤트 + 대기 중 이벤트만 처리 (TEMP 폴더 전체 목록 조회 없음)
+def verify_entry_from_journal(db_connection, cursor, journal, config):
+    if not journal.has_consumer(JOURNAL_CONSUMER):
+        backfill_journal(journal, config['temp_car_image_save_path'])
+
+    events, offset = journal.fetch(JOURNAL_CONSUMER, limit=config.get('entry_journal', {}).get('batch_size'))
+    logger.info(f"입차 이벤트 저널에서 가져온 이벤트 개수: {len(events)} (offset {offset})")
+
+    pending_ids = verify_entry_events(db_connection, cursor, events, config) if events else []
+    # 파일 이동은 이미 끝났으므로 DB 커밋 결과와 관계없이 소비 위치를 저장
+    journal.commit(JOURNAL_CONSUMER, offset, pending_ids)
+    logger.info(f"입차 이벤트 저널 대기 중 이벤트: {len(pending_ids)}")
+
+
 # 메인 함수 (기존 코드에서 복사하여 필요에 맞게 수정)
 def main():
     logger.info("verify_entry 프로그램 실행 시작")
@@ -406,6 +474,7 @@ def main():
         logger.error("데이터베이스 연결 실패. 프로그램 종료.")
         sys.exit(1)
 
+    journal = None
     try:
         with db_connection.cursor() as cursor: # with 문을 사용하여 커서 자동 관리
             # 임시 폴더에서 차량 리스트 가져오기
@@ -414,17 +483,22 @@ def main():
                 logger.error("설정 파일에 'temp_car_image_save_path'가 지정되지 않았습니다.")
                 sys.exit(1)
 
-            if not os.path.isdir(temp_car_image_save_path):
-                logger.warning(f"임시 폴더 '{temp_car_image_save_path}'를 찾을 수 없거나 디렉토리가 아닙니다.")
-                car_list = [] # 폴더가 없으면 처리할 파일 목록은 비어있음
+            # 입차 이벤트 저널 사용 시 (config 'entry_journal') 새 이벤트만 처리
+            journal = create_entry_journal(config)
+            if journal is not None:
+                verify_entry_from_journal(db_connection, cursor, journal, config)
             else:
-                car_list = get_all_filenames_from_directory(temp_car_image_save_path)
+                if not os.path.isdir(temp_car_image_save_path):
+                    logger.warning(f"임시 폴더 '{temp_car_image_save_path}'를 찾을 수 없거나 디렉토리가 아닙니다.")
+                    car_list = [] # 폴더가 없으면 처리할 파일 목록은 비어있음
+                else:
+                    car_list = get_all_filenames_from_directory(temp_car_image_save_path)
 
-            logger.info(f"TEMP 폴더에서 찾은 파일 개수: {len(car_list)}")
+                logger.info(f"TEMP 폴더에서 찾은 파일 개수: {len(car_list)}")
 
-            # 입차 검증 및 파일 분류 처리
-            if car_list: # 처리할 파일이 있을 경우에만 verify_entry 호출
-                verify_entry(db_connection, cursor, car_list, config) # config 전달
+                # 입차 검증 및 파일 분류 처리
+                if car_list: # 처리할 파일이 있을 경우에만 verify_entry 호출
+                    verify_entry(db_connection, cursor, car_list, config) # config 전달
 
 
         # 데이터베이스 커밋 (오류 발생 시 롤백)
@@ -463,6 +537,8 @@ def main():
             logger.info("데이터베이스 롤백 완료 (오류 발생).")
 
     finally:
+        if journal is not None:
+            journal.close()
         # 데이터베이스 연결 닫기
         if db_connection and db_connection.open: # 연결이 열려있는지 확인 후 닫기
             db_connection.close()